@@ -1,34 +1,145 @@
+import os
+
+import numpy as np
+
+
+class History:
+    """
+    Ring buffer of the last capacity (percept, action) code pairs.
+
+    Older pairs are dropped, or with spill set appended to that file in
+    blocks of capacity pairs (int32 rows) before they are overwritten, so
+    the memory stays constant either way.
+
+    Parameters:
+    - capacity (int): Number of pairs that are kept in memory.
+    - spill (str): Path of a file for the pairs that leave the buffer, None to drop them.
+    - overwrite (bool): Empty spill if it already holds pairs, otherwise that raises FileExistsError.
+    """
+
+    def __init__(self, capacity: int, spill: str = None, overwrite: bool = False) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.buffer = np.zeros((capacity, 2), dtype=np.int32)
+        self.spill = spill
+        # Number of pairs ever added.
+        self.total = 0
+        if spill is not None:
+            if not overwrite and os.path.exists(spill) and os.path.getsize(spill):
+                raise FileExistsError(f"spill file {spill!r} is not empty, pass overwrite=True to replace it")
+            open(spill, "wb").close()
+
+    def __len__(self) -> int:
+        return min(self.total, len(self.buffer))
+
+    def append(self, percept: int, action: int) -> None:
+        position = self.total % len(self.buffer)
+        if position == 0 and self.total and self.spill is not None:
+            with open(self.spill, "ab") as file:
+                self.buffer.tofile(file)
+        self.buffer[position] = percept, action
+        self.total += 1
+
+    def window(self) -> np.ndarray:
+        """
+        Returns:
+        np.ndarray: (len(self), 2) array of the pairs in the buffer, oldest first.
+        """
+        position = self.total % len(self.buffer)
+        if self.total <= len(self.buffer):
+            return self.buffer[:self.total].copy()
+        return np.concatenate((self.buffer[position:], self.buffer[:position]))
+
+    def all(self) -> np.ndarray:
+        """
+        Returns:
+        np.ndarray: (total, 2) array of all pairs, the spilled ones read back from the file (needs spill).
+        """
+        if self.spill is None:
+            raise ValueError("only the pairs in the buffer are kept, create the history with spill")
+        spilled = np.fromfile(self.spill, dtype=np.int32).reshape(-1, 2)
+        position = self.total % len(self.buffer) or min(self.total, len(self.buffer))
+        return np.concatenate((spilled, self.buffer[:position]))
 
 
 class TableDrivenAgent:
-    def __init__(self, table: dict, environment: list[str]) -> None:
+    """
+    Agent that looks up the action of each percept in a table.
+
+    Percepts and actions are interned to small integers, the table is
+    compiled into a NumPy array indexed by percept code and the percept
+    sequence is kept in a History of the last window steps, percepts and
+    actions decode that window.
+
+    Parameters:
+    - table (dict): Action of each percept {percept: action}.
+    - environment (list): The environment.
+    - window (int): Number of (percept, action) pairs that are kept in memory.
+    - spill (str): Path of a file for older pairs, None to drop them.
+    - overwrite (bool): Replace the pairs in an existing spill file instead of raising FileExistsError.
+    """
+
+    def __init__(self, table: dict, environment: list[str], window: int = 1024, spill: str = None,
+                 overwrite: bool = False) -> None:
         self.table = table
         self.environment = environment
-        self.percepts = []
-        self.actions = []
+        self.percept_codes = {percept: code for code, percept in enumerate(table)}
+        self.percept_list = list(table)
+        self.action_list = list(dict.fromkeys(table.values()))
+        action_codes = {action: code for code, action in enumerate(self.action_list)}
+        self.lookup = np.array([action_codes[table[percept]] for percept in self.percept_list], dtype=np.int32)
+        self.history = History(window, spill, overwrite)
+
+    @property
+    def percepts(self) -> tuple:
+        """
+        Percepts in the history window, oldest first.
+        """
+        return tuple(self.percept_list[code] for code in self.history.window()[:, 0])
 
-    def act(self, percept: str) -> str:
-        action = self.table[percept] 
-        self.percepts.append(percept)
-        self.actions.append(action)
+    @property
+    def actions(self) -> tuple:
+        """
+        Actions in the history window, oldest first.
+        """
+        return tuple(self.action_list[code] for code in self.history.window()[:, 1])
+
+    def act(self, percept) -> str:
+        return self.action_list[self.act_code(self.percept_codes[percept])]
+
+    def act_code(self, percept: int) -> int:
+        """
+        Action code of the percept with code percept (the index of the percept in table).
+        """
+        action = int(self.lookup[percept])
+        self.history.append(percept, action)
         return action
 
 class SimpleReflexAgent:
     """
     Simple Reflex Agent to simulate a Vacuum Cleaner.
+
+    The agent cleans its cell if it is dirty and moves on to the next cell,
+    at the ends of the environment it turns around.
     """
     
     def __init__(self, start_location: int, environment: list[str]) -> None:
+        if not 0 <= start_location < len(environment):
+            raise ValueError(f"start location {start_location} outside of the environment")
         self.location = start_location
         self.environment = environment
+        self.direction = 1 if start_location < len(environment) - 1 else -1
 
     def sense(self) -> str:
         return self.environment[self.location]
 
     def act(self) -> str:
+        action = "move"
         if self.sense() == "dirty":
             self.environment[self.location] = 'clean'
-            self.location += 1
-        else:
-            self.location += 1
-
+            action = "clean"
+        if len(self.environment) > 1:
+            if not 0 <= self.location + self.direction < len(self.environment):
+                self.direction = -self.direction
+            self.location += self.direction
+        return action
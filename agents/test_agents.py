@@ -0,0 +1,49 @@
+import pytest
+from agents import History, TableDrivenAgent
+
+TABLE = {('A', 'clean'): 'right',
+         ('A', 'dirty'): 'clean',
+         ('B', 'clean'): 'left',
+         ('B', 'dirty'): 'clean'}
+
+
+def test_table_driven_agent():
+    environment = [('A', 'dirty'), ('B', 'dirty')]
+    agent = TableDrivenAgent(TABLE, environment)
+    assert agent.act(('A', 'dirty')) == 'clean'
+    assert agent.act(('A', 'clean')) == 'right'
+    assert agent.percepts == (('A', 'dirty'), ('A', 'clean'))
+    assert agent.actions == ('clean', 'right')
+    with pytest.raises(AttributeError):
+        agent.percepts = []
+    assert agent.act_code(agent.percept_codes[('B', 'clean')]) == agent.action_list.index('left')
+    with pytest.raises(KeyError):
+        agent.act(('C', 'clean'))
+
+
+def test_window():
+    agent = TableDrivenAgent(TABLE, [], window=3)
+    percepts = list(TABLE) * 5
+    for percept in percepts:
+        agent.act(percept)
+    assert agent.percepts == tuple(percepts[-3:])
+    assert agent.actions == tuple(TABLE[percept] for percept in percepts[-3:])
+    assert agent.history.total == 20 and len(agent.history) == 3
+    with pytest.raises(ValueError):
+        agent.history.all()
+
+
+def test_spill(tmp_path):
+    history = History(4, spill=str(tmp_path / "history.bin"))
+    assert history.all().shape == (0, 2)
+    for n in range(1, 15):
+        history.append(n, -n)
+        assert history.all().tolist() == [[i, -i] for i in range(1, n + 1)]
+        assert history.window().tolist() == [[i, -i] for i in range(max(1, n - 3), n + 1)]
+    # Only the blocks of the buffer that were overwritten are in the file.
+    assert (tmp_path / "history.bin").stat().st_size == 3 * 4 * 2 * 4
+    # An existing spill log is only replaced on request.
+    with pytest.raises(FileExistsError):
+        History(4, spill=str(tmp_path / "history.bin"))
+    assert (tmp_path / "history.bin").stat().st_size == 3 * 4 * 2 * 4
+    assert len(History(4, spill=str(tmp_path / "history.bin"), overwrite=True).all()) == 0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from agents import SimpleReflexAgent
+from vacuum import LEFT, RIGHT, SUCK, ReflexPolicy, VacuumWorld, random_world, simulate, table_policy
+
+
+def test_simple_reflex_agent_stays_in_bounds():
+    environment = ['dirty', 'clean', 'dirty']
+    agent = SimpleReflexAgent(start_location=0, environment=environment)
+    locations = []
+    for _ in range(6):
+        agent.act()
+        locations.append(agent.location)
+    assert locations == [1, 2, 1, 0, 1, 2]
+    assert environment == ['clean'] * 3
+    with pytest.raises(ValueError):
+        SimpleReflexAgent(start_location=3, environment=environment)
+
+
+def test_step():
+    world = VacuumWorld([[True, False, True], [False, True, False]], [0, 2])
+    cleaned, moved = world.step(np.array([SUCK, RIGHT]))
+    assert cleaned.tolist() == [True, False] and moved.tolist() == [False, False]
+    assert world.dirt.tolist() == [[False, False, True], [False, True, False]]
+    cleaned, moved = world.step(np.array([LEFT, LEFT]))
+    assert world.locations.tolist() == [0, 1] and moved.tolist() == [False, True]
+
+
+def test_reflex_policy():
+    world = random_world(1000, 8, seed=0)
+    dirt = world.dirt.sum(axis=1)
+    result = simulate(world, ReflexPolicy(len(world)), max_steps=100)
+    # One pass to the far end and back cleans every cell.
+    assert not world.dirt.any()
+    assert np.array_equal(result.cleaned, dirt) and not result.remaining.any()
+    assert np.all(result.steps == result.cleaned + result.moves)
+    assert np.all(result.steps <= 2 * 7 + 8)
+    assert np.all(result.performance <= 100 * 8)
+
+
+def test_table_policy_and_unfinished_episodes():
+    # Two cell world of the notebook: suck when dirty, otherwise go to the other cell.
+    table = np.array([[RIGHT, SUCK], [LEFT, SUCK]])
+    world = VacuumWorld([[True, True], [False, False]], [0, 1])
+    result = simulate(world, table_policy(table), max_steps=10)
+    assert result.cleaned.tolist() == [2, 0]
+    assert result.steps.tolist() == [3, 0]
+    # Clean cells after each step: 1, 1, 2, then 2 for the 7 remaining steps.
+    assert result.performance.tolist() == [18, 20]
+    world = VacuumWorld([[True, False, True]], [1])
+    result = simulate(world, table_policy(np.full((3, 2), LEFT)), max_steps=5)
+    assert result.remaining.tolist() == [2] and result.steps.tolist() == [5] and result.moves.tolist() == [1]
@@ -0,0 +1,421 @@
+"""
+Backtracking search for graph coloring CSPs like CSP_GRAPH in constraint_satisfaction_problems.ipynb.
+
+A problem is given by a constraint graph {variable: [neighbors]} (adjacent
+variables must get different values) and the list of values (COLORS). The
+graph does not need to be symmetric, every edge is a constraint in both
+directions, and variables that only appear as neighbors are included.
+
+backtracking_search assigns one variable at a time and undoes the last
+assignment when a variable has no value left:
+
+- variable ordering: minimum remaining values (MRV), ties broken by the
+  number of unassigned neighbors (degree heuristic).
+- value ordering: least constraining value (LCV), the value that removes the
+  fewest values from the domains of unassigned neighbors first.
+- inference: forward checking removes the assigned value from the domains of
+  the neighbors, maintaining arc consistency (MAC) also propagates the
+  resulting singleton domains with AC-3.
+
+The problem is converted once to a ColoringProblem: variables are numbered,
+the neighbors are lists of ints and every domain is a bitset (an int with one
+bit per color), so pruning and consistency checks are O(1) bit operations.
+Changed domains are recorded on a trail and restored on backtracking, and the
+search is iterative, so problems with thousands of variables neither copy
+domains nor hit the recursion limit.
+
+Example:
+    stats = CSPStats()
+    backtracking_search(CSP_GRAPH, COLORS, stats=stats)
+    # {'SA': 'red', 'NT': 'blue', 'NSW': 'blue', ...}, stats.nodes, stats.backtracks
+"""
+import copy
+import random
+import time
+from collections import deque
+
+INFERENCES = (None, "forward_checking", "mac")
+VARIABLE_ORDERS = ("mrv", "static")
+VALUE_ORDERS = ("lcv", "static")
+
+
+class CSPStats:
+    """
+    Counters of a solver run.
+
+    - nodes: values assigned to a variable
+    - backtracks: variables whose values were all exhausted
+    - pruned: values removed from domains by inference
+    - elapsed: wall time in seconds
+    """
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.backtracks = 0
+        self.pruned = 0
+        self.elapsed = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        return "CSPStats(" + ", ".join(f"{key}={value!r}" for key, value in vars(self).items()) + ")"
+
+
+def constraint_graph(csp: dict) -> dict:
+    """
+    Symmetric constraint graph {variable: list of neighbors} of csp, self loops and duplicates are dropped.
+
+    Variables and neighbors keep the order of their first appearance, so the
+    solvers do not depend on hash randomization.
+    """
+    neighbors = {v: {} for v in csp}
+    for v, adjacent in csp.items():
+        for w in adjacent:
+            if w != v:
+                neighbors[v][w] = None
+                neighbors.setdefault(w, {})[v] = None
+    return {v: list(adjacent) for v, adjacent in neighbors.items()}
+
+
+def count_conflicts(assignment: dict, csp: dict) -> int:
+    """
+    Number of constraints (edges) whose two variables are assigned the same value.
+    """
+    conflicts = 0
+    for v, adjacent in constraint_graph(csp).items():
+        value = assignment.get(v)
+        if value is not None:
+            conflicts += sum(assignment.get(w) == value for w in adjacent)
+    return conflicts // 2
+
+
+def is_solution(assignment: dict, csp: dict) -> bool:
+    """
+    True if every variable of csp is assigned and no constraint is violated.
+    """
+    return all(assignment.get(v) is not None for v in constraint_graph(csp)) and count_conflicts(assignment, csp) == 0
+
+
+class ColoringProblem:
+    """
+    Graph coloring CSP on an integer-indexed constraint graph with bitset domains.
+
+    Variable i is self.variables[i], color c is self.colors[c]. The domain of
+    a variable is an int whose bit c is set if color c is allowed, so removing
+    values, testing for a value and counting the remaining values
+    (int.bit_count) are O(1) bit operations.
+    """
+
+    def __init__(self, csp: dict, colors: list, domains: dict = None) -> None:
+        graph = constraint_graph(csp)
+        self.variables = list(graph)
+        self.index = {v: i for i, v in enumerate(self.variables)}
+        self.colors = list(colors)
+        self.full = (1 << len(self.colors)) - 1
+        self.neighbors = [[self.index[w] for w in graph[v]] for v in self.variables]
+        self.domains = [self.full] * len(self.variables)
+        for v, values in (domains or {}).items():
+            if v in self.index:
+                self.domains[self.index[v]] = self.mask(values)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def mask(self, values) -> int:
+        """
+        Bitset of the values, values that are not colors are ignored.
+        """
+        mask = 0
+        for c, color in enumerate(self.colors):
+            if color in values:
+                mask |= 1 << c
+        return mask
+
+    def decode(self, values: list) -> dict:
+        """
+        Assignment {variable: color} of a list of color indices, -1 (unassigned) is left out.
+        """
+        return {v: self.colors[c] for v, c in zip(self.variables, values) if c >= 0}
+
+
+def _as_problem(csp, colors: list, domains: dict) -> ColoringProblem:
+    if not isinstance(csp, ColoringProblem):
+        return ColoringProblem(csp, colors, domains)
+    if domains is None:
+        return csp
+    # The new domains restrict the domains of the problem further, the problem itself is not changed.
+    problem = copy.copy(csp)
+    problem.domains = list(csp.domains)
+    for v, values in domains.items():
+        if v in problem.index:
+            problem.domains[problem.index[v]] &= problem.mask(values)
+    return problem
+
+
+def _bits(mask: int) -> list:
+    colors = []
+    while mask:
+        low = mask & -mask
+        colors.append(low.bit_length() - 1)
+        mask ^= low
+    return colors
+
+
+class _Search:
+    """
+    State of one backtracking search on a ColoringProblem.
+
+    Every change of a domain pushes (variable, old domain) on the trail,
+    undoing an assignment pops the trail back to the mark taken before it.
+    """
+
+    def __init__(self, problem: ColoringProblem, stats: CSPStats, rng: random.Random = None) -> None:
+        n, k = len(problem), len(problem.colors)
+        self.rng = rng
+        self.neighbors = problem.neighbors
+        self.k = k
+        self.domains = list(problem.domains)
+        self.values = [-1] * n
+        self.num_unassigned = n
+        # Unassigned variables by domain size and number of unassigned neighbors (open degree), for MRV with
+        # degree tie-breaking: buckets[size] = {open degree: {variable: None}}, counts[size] = number of variables.
+        self.open_degree = [len(adjacent) for adjacent in self.neighbors]
+        self.buckets = [{} for _ in range(k + 1)]
+        self.counts = [0] * (k + 1)
+        order = list(range(n))
+        if rng is not None:
+            # Ties are broken by the order in which variables enter the buckets.
+            rng.shuffle(order)
+        for v in order:
+            self._enter(v)
+        # Number of assigned neighbors of v with color c at usage[v * k + c], for inference=None.
+        self.usage = [0] * (n * k)
+        self.trail = []
+        self.stats = stats
+
+    def remove(self, v: int, mask: int) -> None:
+        old = self.domains[v]
+        new = old & ~mask
+        if new == old:
+            return
+        if self.values[v] < 0:
+            self._leave(v)
+            self.domains[v] = new
+            self._enter(v)
+        else:
+            self.domains[v] = new
+        self.trail.append((v, old))
+
+    def restore(self, mark: int) -> None:
+        trail, domains, values = self.trail, self.domains, self.values
+        while len(trail) > mark:
+            v, old = trail.pop()
+            if values[v] < 0:
+                self._leave(v)
+                domains[v] = old
+                self._enter(v)
+            else:
+                domains[v] = old
+
+    def _enter(self, v: int) -> None:
+        size = self.domains[v].bit_count()
+        self.buckets[size].setdefault(self.open_degree[v], {})[v] = None
+        self.counts[size] += 1
+
+    def _leave(self, v: int) -> None:
+        size, degree = self.domains[v].bit_count(), self.open_degree[v]
+        bucket = self.buckets[size][degree]
+        del bucket[v]
+        if not bucket:
+            del self.buckets[size][degree]
+        self.counts[size] -= 1
+
+    def _change_degree(self, v: int, change: int) -> None:
+        if self.values[v] < 0:
+            self._leave(v)
+            self.open_degree[v] += change
+            self._enter(v)
+        else:
+            self.open_degree[v] += change
+
+    def select_variable(self, variable_order: str) -> int:
+        """
+        Unassigned variable with the fewest remaining values, ties broken by the most unassigned neighbors.
+        """
+        if not self.num_unassigned:
+            return None
+        if variable_order == "static":
+            return self.values.index(-1)
+        size = next(size for size, count in enumerate(self.counts) if count)
+        degrees = self.buckets[size]
+        return next(iter(degrees[max(degrees)]))
+
+    def order_values(self, v: int, value_order: str) -> list:
+        """
+        Colors of the domain of v, least constraining first for value_order="lcv" (ties in random order with rng).
+        """
+        colors = _bits(self.domains[v])
+        if len(colors) > 1 and self.rng is not None:
+            self.rng.shuffle(colors)
+        if value_order == "lcv" and len(colors) > 1:
+            open_domains = [self.domains[w] for w in self.neighbors[v] if self.values[w] < 0]
+            colors.sort(key=lambda c: sum(domain >> c & 1 for domain in open_domains))
+        return colors
+
+    def assign(self, v: int, c: int, inference: str) -> bool:
+        """
+        Assign color c to v and run the inference, False if it leads to an empty domain (or a conflict).
+        """
+        bit = 1 << c
+        self.values[v] = c
+        self._close(v)
+        self.remove(v, ~bit)
+        if inference is None:
+            k, usage = self.k, self.usage
+            for w in self.neighbors[v]:
+                usage[w * k + c] += 1
+            return not usage[v * k + c]
+        if inference == "mac":
+            return self.ac3(deque((w, v) for w in self.neighbors[v]))
+
+        domains = self.domains
+        for w in self.neighbors[v]:
+            if domains[w] & bit:
+                self.remove(w, bit)
+                self.stats.pruned += 1
+                if not domains[w]:
+                    return False
+        return True
+
+    def unassign(self, v: int, mark: int, inference: str) -> None:
+        c = self.values[v]
+        if inference is None:
+            k, usage = self.k, self.usage
+            for w in self.neighbors[v]:
+                usage[w * k + c] -= 1
+        self.restore(mark)
+        self.values[v] = -1
+        self.num_unassigned += 1
+        self._enter(v)
+        for w in self.neighbors[v]:
+            self._change_degree(w, 1)
+
+    def _close(self, v: int) -> None:
+        self.num_unassigned -= 1
+        self._leave(v)
+        for w in self.neighbors[v]:
+            self._change_degree(w, -1)
+
+    def ac3(self, arcs: deque) -> bool:
+        """
+        AC-3 on the arcs (x, y), False if a domain runs empty.
+
+        For x != y the arc is only revised when the domain of y is a single
+        value, which is then removed from the domain of x. If that leaves x with
+        a single value, the arcs (z, x) of the other neighbors z are revised.
+        """
+        domains, neighbors = self.domains, self.neighbors
+        mark = len(self.trail)
+        while arcs:
+            x, y = arcs.popleft()
+            single = domains[y]
+            if single & (single - 1) or not domains[x] & single:
+                continue
+            self.remove(x, single)
+            domain = domains[x]
+            if not domain:
+                self.stats.pruned += len(self.trail) - mark
+                return False
+            if not domain & (domain - 1):
+                arcs.extend((z, x) for z in neighbors[x] if z != y)
+        self.stats.pruned += len(self.trail) - mark
+        return True
+
+
+def backtracking_search(csp, colors: list = None, domains: dict = None, inference: str = "mac",
+                        variable_order: str = "mrv", value_order: str = "lcv", seed: int = None,
+                        stats: CSPStats = None) -> dict:
+    """
+    Solve a graph coloring CSP by backtracking search.
+
+    Parameters:
+    - csp (dict | ColoringProblem): Constraint graph {variable: [neighbors]}, neighbors must get different values.
+    - colors (list): The values (not needed for a ColoringProblem).
+    - domains (dict): Allowed values of some variables {variable: values}, all colors for the others (for a
+      ColoringProblem: restrictions of its own domains).
+    - inference (str): None, "forward_checking" or "mac" (maintaining arc consistency with AC-3).
+    - variable_order (str): "mrv" (minimum remaining values, degree tie-breaking) or "static" (order of csp).
+    - value_order (str): "lcv" (least constraining value) or "static" (order of colors).
+    - seed (int): Break ties between variables and between values at random with this seed.
+    - stats (CSPStats): Counters to update.
+
+    Returns:
+    dict: Assignment {variable: value} of all variables, None if the problem has no solution.
+    """
+    _check_options(inference, variable_order, value_order)
+    stats = stats if stats is not None else CSPStats()
+    begin = time.perf_counter()
+    try:
+        problem = _as_problem(csp, colors, domains)
+        rng = random.Random(seed) if seed is not None else None
+        values = _backtrack(_Search(problem, stats, rng), inference, variable_order, value_order)
+        return None if values is None else problem.decode(values)
+    finally:
+        stats.elapsed += time.perf_counter() - begin
+
+
+def _check_options(inference: str, variable_order: str, value_order: str) -> None:
+    if inference not in INFERENCES:
+        raise ValueError(f"unknown inference {inference!r}, expected one of {INFERENCES}")
+    if variable_order not in VARIABLE_ORDERS:
+        raise ValueError(f"unknown variable_order {variable_order!r}, expected one of {VARIABLE_ORDERS}")
+    if value_order not in VALUE_ORDERS:
+        raise ValueError(f"unknown value_order {value_order!r}, expected one of {VALUE_ORDERS}")
+
+
+# Returned by _backtrack when max_nodes is reached.
+_INTERRUPTED = "interrupted"
+
+
+def _backtrack(search: _Search, inference: str, variable_order: str, value_order: str,
+               max_nodes: int = None) -> list:
+    """
+    Returns:
+    list: Color index per variable, None if there is no solution, _INTERRUPTED if the search was stopped after
+    max_nodes nodes.
+    """
+    stats = search.stats
+    if not all(search.domains):
+        return None
+    if inference == "mac" and not search.ac3(deque((x, y) for x, adjacent in enumerate(search.neighbors)
+                                                   for y in adjacent)):
+        return None
+
+    # Stack of (variable, remaining colors, trail length before the variable was assigned).
+    stack = []
+    v = search.select_variable(variable_order)
+    if v is not None:
+        stack.append((v, iter(search.order_values(v, value_order)), len(search.trail)))
+    nodes = 0
+    while stack:
+        v, colors, mark = stack[-1]
+        if search.values[v] >= 0:
+            search.unassign(v, mark, inference)
+        for c in colors:
+            if max_nodes is not None and nodes >= max_nodes:
+                return _INTERRUPTED
+            nodes += 1
+            stats.nodes += 1
+            if search.assign(v, c, inference):
+                break
+            search.unassign(v, mark, inference)
+        else:
+            stack.pop()
+            stats.backtracks += 1
+            continue
+        v = search.select_variable(variable_order)
+        if v is None:
+            return search.values
+        stack.append((v, iter(search.order_values(v, value_order)), len(search.trail)))
+    return search.values if not search.num_unassigned else None
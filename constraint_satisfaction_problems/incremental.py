@@ -0,0 +1,176 @@
+"""
+Incremental re-solving of a graph coloring CSP whose constraint graph changes.
+
+IncrementalCSP keeps a constraint graph and its current solution. Variables
+and constraints can be added and removed, and solve() repairs the previous
+solution instead of solving from scratch:
+
+1. Removing variables or constraints never breaks a solution, nothing to do.
+2. Every variable touched by an addition (or a new domain) that is now in
+   conflict gets a color that none of its neighbors uses, if there is one.
+3. For the variables that are still in conflict, the neighborhood of radius
+   1, 2, ... around them is solved by backtracking search with the colors of
+   the variables outside fixed, until the neighborhood gets larger than
+   max_repair variables.
+4. Only if that fails the whole problem is solved again.
+
+So the work of an update depends on the size of the change and of the
+neighborhood that has to be recolored, not on the size of the graph.
+
+Example:
+    problem = IncrementalCSP(CSP_GRAPH, COLORS)
+    problem.solve()
+    problem.add_variable('T', ['V'])
+    problem.add_constraint('WA', 'V')
+    problem.solve()             # only the colors around WA, V and T can change
+"""
+from typing import Hashable, Iterable
+
+from csp import CSPStats, backtracking_search, constraint_graph
+
+
+class IncrementalCSP:
+    """
+    Graph coloring CSP with a solution that is repaired locally after changes.
+
+    Parameters:
+    - csp (dict): Constraint graph {variable: [neighbors]}, neighbors must get different values.
+    - colors (list): The values.
+    - domains (dict): Allowed values of some variables {variable: values}, all colors for the others.
+    - max_repair (int): Largest neighborhood (number of variables) that is re-solved before a full solve.
+    """
+
+    def __init__(self, csp: dict, colors: list, domains: dict = None, max_repair: int = 1000) -> None:
+        self.colors = list(colors)
+        self.neighbors = {v: dict.fromkeys(adjacent) for v, adjacent in constraint_graph(csp).items()}
+        self.domains = {v: list(values) for v, values in (domains or {}).items()}
+        self.max_repair = max_repair
+        self.assignment = None
+        self.stats = CSPStats()
+        self.full_solves = 0
+        # Variables whose value changed in the last solve().
+        self.changed = set()
+        self._dirty = {}
+
+    def __len__(self) -> int:
+        return len(self.neighbors)
+
+    def __contains__(self, v: Hashable) -> bool:
+        return v in self.neighbors
+
+    def add_variable(self, v: Hashable, neighbors: Iterable = (), domain: list = None) -> None:
+        """
+        Add variable v (or constraints and a domain to an existing one) with constraints to neighbors.
+        """
+        self.neighbors.setdefault(v, {})
+        if domain is not None:
+            self.domains[v] = list(domain)
+        self._dirty[v] = None
+        for w in neighbors:
+            self.add_constraint(v, w)
+
+    def remove_variable(self, v: Hashable) -> None:
+        for w in self.neighbors.pop(v):
+            del self.neighbors[w][v]
+        self.domains.pop(v, None)
+        self._dirty.pop(v, None)
+        if self.assignment is not None:
+            self.assignment.pop(v, None)
+
+    def add_constraint(self, u: Hashable, v: Hashable) -> None:
+        """
+        Constraint u != v, variables that do not exist yet are added.
+        """
+        if u == v:
+            raise ValueError(f"a variable cannot be constrained to differ from itself: {u!r}")
+        for x, y in ((u, v), (v, u)):
+            self.neighbors.setdefault(x, {})[y] = None
+            self._dirty[x] = None
+
+    def remove_constraint(self, u: Hashable, v: Hashable) -> None:
+        del self.neighbors[u][v]
+        del self.neighbors[v][u]
+
+    def set_domain(self, v: Hashable, values: list) -> None:
+        """
+        Restrict v to values (None allows all colors), a variable that does not exist yet is added.
+        """
+        self.neighbors.setdefault(v, {})
+        if values is None:
+            self.domains.pop(v, None)
+        else:
+            self.domains[v] = list(values)
+        self._dirty[v] = None
+
+    def _allowed(self, v: Hashable) -> list:
+        return self.domains.get(v, self.colors)
+
+    def _conflicted(self, v: Hashable) -> bool:
+        value = self.assignment.get(v)
+        return value is None or value not in self._allowed(v) or \
+            any(self.assignment.get(w) == value for w in self.neighbors[v])
+
+    def solve(self) -> dict:
+        """
+        Repair the solution after the changes since the last call, or solve the problem if there is none.
+
+        Returns:
+        dict: Assignment {variable: value} of all variables (updated in place by later calls), None if the problem
+        has no solution.
+        """
+        dirty, self._dirty = self._dirty, {}
+        self.changed = set()
+        if self.assignment is not None:
+            conflicted = [v for v in dirty if self._conflicted(v)]
+            conflicted = [v for v in conflicted if not self._recolor(v)]
+            if not conflicted or self._repair(conflicted):
+                return self.assignment
+        return self._solve_all()
+
+    def _set(self, v: Hashable, value) -> None:
+        if self.assignment.get(v) != value:
+            self.assignment[v] = value
+            self.changed.add(v)
+
+    def _recolor(self, v: Hashable) -> bool:
+        """
+        Give v a color that none of its neighbors uses, False if there is none (v is left without a color).
+        """
+        used = {self.assignment.get(w) for w in self.neighbors[v]}
+        for value in self._allowed(v):
+            if value not in used:
+                self._set(v, value)
+                return True
+        self.assignment.pop(v, None)
+        return False
+
+    def _repair(self, conflicted: list) -> bool:
+        """
+        Re-solve growing neighborhoods of the conflicted variables with the variables outside fixed.
+        """
+        ball = dict.fromkeys(conflicted)
+        frontier = list(conflicted)
+        while frontier and len(ball) <= self.max_repair:
+            graph = {v: [w for w in self.neighbors[v] if w in ball] for v in ball}
+            domains = {}
+            for v in ball:
+                fixed = {self.assignment.get(w) for w in self.neighbors[v] if w not in ball}
+                domains[v] = [value for value in self._allowed(v) if value not in fixed]
+            solution = backtracking_search(graph, self.colors, domains=domains, stats=self.stats)
+            if solution is not None:
+                for v, value in solution.items():
+                    self._set(v, value)
+                return True
+            # Grow the neighborhood by one step.
+            frontier = [w for v in frontier for w in self.neighbors[v] if w not in ball]
+            ball.update(dict.fromkeys(frontier))
+        return False
+
+    def _solve_all(self) -> dict:
+        self.full_solves += 1
+        previous = self.assignment or {}
+        self.assignment = backtracking_search({v: list(adjacent) for v, adjacent in self.neighbors.items()},
+                                              self.colors, domains=self.domains, stats=self.stats)
+        if self.assignment is not None:
+            self.changed = {v for v, value in self.assignment.items() if previous.get(v) != value}
+        return self.assignment
@@ -0,0 +1,202 @@
+"""
+Min-conflicts local search for large graph coloring CSPs.
+
+Instead of extending a partial assignment, local search starts from a complete
+(greedy) assignment and repeatedly recolors a conflicted variable with the
+color that conflicts with the fewest neighbors (keeping its color if that is
+already the best). It does not prove that a
+problem has no solution, but scales to graphs with tens of thousands of
+variables where backtracking search takes too long.
+
+- The number of neighbors of v with color c is kept in a table and updated in
+  O(degree) per move, so the best color of a variable is found in O(colors)
+  and the conflicted variables are kept in a list for O(1) random choice.
+- Tabu: after a variable leaves a color, moving it back is forbidden for
+  tabu_tenure steps, unless the move gives a new best assignment (aspiration).
+- Random walk: with probability walk_probability the variable gets a random
+  color from its domain instead of the best one.
+- The search stops at a solution or when max_steps or max_seconds is reached
+  and returns the best assignment it has seen.
+
+Example:
+    result = min_conflicts(CSP_GRAPH, COLORS, max_steps=10_000)
+    result.assignment, result.conflicts
+"""
+import random
+import time
+from typing import NamedTuple
+
+from csp import ColoringProblem, _as_problem, _bits
+
+
+class LocalSearchResult(NamedTuple):
+    assignment: dict
+    conflicts: int
+    steps: int
+    seconds: float
+
+
+class _State:
+    """
+    Complete assignment with the color usage table and the list of conflicted variables.
+    """
+
+    def __init__(self, problem: ColoringProblem, values: list) -> None:
+        self.neighbors = problem.neighbors
+        self.k = k = len(problem.colors)
+        self.values = values
+        # usage[v * k + c]: number of neighbors of v with color c.
+        self.usage = [0] * (len(values) * k)
+        for v, adjacent in enumerate(self.neighbors):
+            for w in adjacent:
+                self.usage[v * k + values[w]] += 1
+        self.conflicted = []
+        self.position = [-1] * len(values)
+        conflicts = 0
+        for v in range(len(values)):
+            if self.usage[v * k + values[v]]:
+                conflicts += self.usage[v * k + values[v]]
+                self._mark(v)
+        self.conflicts = conflicts // 2
+
+    def _mark(self, v: int) -> None:
+        self.position[v] = len(self.conflicted)
+        self.conflicted.append(v)
+
+    def _unmark(self, v: int) -> None:
+        i, last = self.position[v], self.conflicted[-1]
+        self.conflicted[i] = last
+        self.position[last] = i
+        self.conflicted.pop()
+        self.position[v] = -1
+
+    def _update(self, v: int) -> None:
+        conflicted = self.usage[v * self.k + self.values[v]] > 0
+        if conflicted and self.position[v] < 0:
+            self._mark(v)
+        elif not conflicted and self.position[v] >= 0:
+            self._unmark(v)
+
+    def move(self, v: int, c: int) -> None:
+        """
+        Recolor v with c.
+        """
+        k, usage, old = self.k, self.usage, self.values[v]
+        self.conflicts += usage[v * k + c] - usage[v * k + old]
+        self.values[v] = c
+        for w in self.neighbors[v]:
+            usage[w * k + old] -= 1
+            usage[w * k + c] += 1
+            self._update(w)
+        self._update(v)
+
+
+def _greedy(problem: ColoringProblem, rng: random.Random, initial: dict) -> list:
+    """
+    Colors of initial where they are allowed, the other variables in random order get their least conflicting color.
+    """
+    n, k = len(problem), len(problem.colors)
+    values = [-1] * n
+    for v, color in (initial or {}).items():
+        i = problem.index.get(v)
+        if i is not None and color in problem.colors and problem.domains[i] >> problem.colors.index(color) & 1:
+            values[i] = problem.colors.index(color)
+    usage = [0] * (n * k)
+    for v, c in enumerate(values):
+        if c >= 0:
+            for w in problem.neighbors[v]:
+                usage[w * k + c] += 1
+    order = [v for v in range(n) if values[v] < 0]
+    rng.shuffle(order)
+    for v in order:
+        colors = _bits(problem.domains[v])
+        if not colors:
+            raise ValueError(f"variable {problem.variables[v]!r} has an empty domain")
+        c = min(colors, key=lambda c: (usage[v * k + c], rng.random()))
+        values[v] = c
+        for w in problem.neighbors[v]:
+            usage[w * k + c] += 1
+    return values
+
+
+def min_conflicts(csp, colors: list = None, domains: dict = None, initial: dict = None, max_steps: int = 100_000,
+                  max_seconds: float = None, tabu_tenure: int = 10, walk_probability: float = 0.02,
+                  seed: int = None) -> LocalSearchResult:
+    """
+    Min-conflicts local search with tabu and random walk moves.
+
+    Parameters:
+    - csp (dict | ColoringProblem): Constraint graph {variable: [neighbors]}, neighbors must get different values.
+    - colors (list): The values (not needed for a ColoringProblem).
+    - domains (dict): Allowed values of some variables {variable: values}, all colors for the others (for a
+      ColoringProblem: restrictions of its own domains).
+    - initial (dict): Start assignment {variable: value}, missing variables are colored greedily.
+    - max_steps (int): Maximum number of moves.
+    - max_seconds (float): Time budget in seconds, no limit by default.
+    - tabu_tenure (int): Number of steps a variable may not return to the color it left.
+    - walk_probability (float): Probability of a random color instead of the best one.
+    - seed (int): Seed of the random choices.
+
+    Returns:
+    LocalSearchResult: Best assignment found, its number of violated constraints (0 for a solution), the number
+    of steps and the elapsed time.
+    """
+    begin = time.perf_counter()
+    rng = random.Random(seed)
+    problem = _as_problem(csp, colors, domains)
+    state = _State(problem, _greedy(problem, rng, initial))
+    k, usage, values, conflicted = state.k, state.usage, state.values, state.conflicted
+    domain_colors = [_bits(domain) for domain in problem.domains]
+    tabu = [0] * (len(problem) * k)
+
+    # The best assignment is snapshot, or if snapshot is None the current values with the moves in changes undone.
+    best_conflicts, snapshot, changes = state.conflicts, None, []
+    step = 0
+    while state.conflicts and step < max_steps:
+        if max_seconds is not None and step % 1024 == 0 and time.perf_counter() - begin > max_seconds:
+            break
+        step += 1
+        v = conflicted[rng.randrange(len(conflicted))]
+        old = values[v]
+        if rng.random() < walk_probability:
+            candidates = [c for c in domain_colors[v] if c != old]
+            if not candidates:
+                continue
+            c = rng.choice(candidates)
+        else:
+            current = usage[v * k + old]
+            best, moves = None, []
+            for c in domain_colors[v]:
+                cost = usage[v * k + c]
+                # Tabu moves are only allowed if they lead to a new best assignment.
+                if c != old and tabu[v * k + c] > step and state.conflicts + cost - current >= best_conflicts:
+                    continue
+                if best is None or cost < best:
+                    best, moves = cost, [c]
+                elif cost == best:
+                    moves.append(c)
+            c = moves[0] if len(moves) == 1 else rng.choice(moves)
+            if c == old:
+                continue
+        tabu[v * k + old] = step + tabu_tenure
+        state.move(v, c)
+        if state.conflicts < best_conflicts:
+            best_conflicts, snapshot, changes = state.conflicts, None, []
+        elif snapshot is None:
+            changes.append((v, old))
+            if len(changes) > len(values):
+                # Copying is cheaper than a log longer than the assignment.
+                snapshot, changes = _undo(values, changes), []
+
+    best = snapshot if snapshot is not None else _undo(values, changes)
+    return LocalSearchResult(problem.decode(best), best_conflicts, step, time.perf_counter() - begin)
+
+
+def _undo(values: list, changes: list) -> list:
+    """
+    Copy of values with the (variable, old color) changes undone.
+    """
+    values = list(values)
+    for v, old in reversed(changes):
+        values[v] = old
+    return values
@@ -0,0 +1,166 @@
+"""
+Parallel restart portfolio for graph coloring CSPs.
+
+The running time of backtracking search on hard instances depends heavily on
+early decisions (which variable and value are tried first), so several
+differently configured and randomized solver runs are started in a process
+pool. The first run that finds a solution (or proves that there is none)
+wins, and the pool is terminated, which stops the other runs.
+
+Every backtracking run restarts with a new random tie-breaking after a node
+limit that follows the Luby sequence (1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...) times
+restart_nodes. Short runs escape bad early decisions, and since the limit
+keeps growing, a run eventually completes, so an unsatisfiable problem is
+still detected. min_conflicts runs restart the same way with a step budget,
+but local search cannot prove that there is no solution, so a portfolio of
+only min_conflicts runs needs max_seconds.
+
+The problem is converted to a ColoringProblem once and sent to every worker
+process when it starts.
+
+Example:
+    result = portfolio(graph, COLORS, max_seconds=60)
+    result.status, result.assignment, result.configuration
+"""
+import multiprocessing
+import os
+import random
+import time
+from typing import NamedTuple
+
+from csp import CSPStats, ColoringProblem, _INTERRUPTED, _Search, _as_problem, _backtrack, _check_options
+from min_conflicts import min_conflicts
+
+CONFIGURATIONS = (
+    {"solver": "backtracking", "inference": "mac", "value_order": "lcv"},
+    {"solver": "min_conflicts"},
+    {"solver": "backtracking", "inference": "forward_checking", "value_order": "lcv"},
+    {"solver": "backtracking", "inference": "mac", "value_order": "static"},
+)
+SOLVERS = ("backtracking", "min_conflicts")
+
+
+class PortfolioResult(NamedTuple):
+    assignment: dict
+    status: str
+    configuration: dict
+    restarts: int
+    nodes: int
+    seconds: float
+
+
+def luby(i: int) -> int:
+    """
+    i-th element (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+    """
+    k = 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        if 1 << (k - 1) <= i < (1 << k) - 1:
+            i -= (1 << (k - 1)) - 1
+            k = 1
+        else:
+            k += 1
+
+
+def restarting_search(problem: ColoringProblem, configuration: dict, seed: int, restart_nodes: int) -> tuple:
+    """
+    Run one configuration with Luby restarts until it finds a solution or proves that there is none.
+
+    Returns:
+    tuple: (color index per variable or None, status, restarts, nodes or steps)
+    """
+    if not all(problem.domains):
+        # A variable without values, no solver run can succeed (and min_conflicts cannot even start).
+        return None, "unsatisfiable", 0, 0
+    rng = random.Random(seed)
+    restart, nodes = 0, 0
+    while True:
+        restart += 1
+        limit = restart_nodes * luby(restart)
+        if configuration["solver"] == "min_conflicts":
+            result = min_conflicts(problem, max_steps=limit, seed=rng.randrange(2 ** 32),
+                                   tabu_tenure=configuration.get("tabu_tenure", 10),
+                                   walk_probability=configuration.get("walk_probability", 0.02))
+            nodes += result.steps
+            if result.conflicts == 0:
+                values = [problem.colors.index(result.assignment[v]) for v in problem.variables]
+                return values, "solved", restart, nodes
+            continue
+        stats = CSPStats()
+        values = _backtrack(_Search(problem, stats, rng), configuration.get("inference", "mac"),
+                            configuration.get("variable_order", "mrv"), configuration.get("value_order", "lcv"),
+                            max_nodes=limit)
+        nodes += stats.nodes
+        if values is not _INTERRUPTED:
+            return values, "solved" if values is not None else "unsatisfiable", restart, nodes
+
+
+# Problem of a worker process, set by _initialize.
+_worker = {}
+
+
+def _initialize(problem: ColoringProblem) -> None:
+    _worker["problem"] = problem
+
+
+def _run(task: tuple) -> tuple:
+    index, configuration, seed, restart_nodes = task
+    return (index,) + restarting_search(_worker["problem"], configuration, seed, restart_nodes)
+
+
+def portfolio(csp, colors: list = None, domains: dict = None, configurations: list = None, processes: int = None,
+              restart_nodes: int = None, max_seconds: float = None, seed: int = None) -> PortfolioResult:
+    """
+    Solve a graph coloring CSP with a portfolio of restarting solver runs in parallel processes.
+
+    Parameters:
+    - csp (dict | ColoringProblem): Constraint graph {variable: [neighbors]}, neighbors must get different values.
+    - colors (list): The values (not needed for a ColoringProblem).
+    - domains (dict): Allowed values of some variables {variable: values}, all colors for the others (for a
+      ColoringProblem: restrictions of its own domains).
+    - configurations (list): One dict per run with "solver" ("backtracking" or "min_conflicts") and the options
+      of the solver (inference, variable_order, value_order or tabu_tenure, walk_probability), CONFIGURATIONS
+      by default.
+    - processes (int): Number of worker processes, by default one per configuration up to os.cpu_count().
+    - restart_nodes (int): Unit of the Luby restart schedule in nodes (steps for min_conflicts), the number of
+      variables by default.
+    - max_seconds (float): Time budget in seconds, no limit by default (required if all runs are min_conflicts).
+    - seed (int): Seed of the random seeds of the runs.
+
+    Returns:
+    PortfolioResult: Assignment (None unless solved), status ("solved", "unsatisfiable" or "timeout"), the
+    configuration of the winning run, its restarts and nodes, and the elapsed time.
+    """
+    begin = time.perf_counter()
+    configurations = [dict(configuration) for configuration in configurations or CONFIGURATIONS]
+    for configuration in configurations:
+        configuration.setdefault("solver", "backtracking")
+        if configuration["solver"] not in SOLVERS:
+            raise ValueError(f"unknown solver {configuration['solver']!r}, expected one of {SOLVERS}")
+        if configuration["solver"] == "backtracking":
+            _check_options(configuration.get("inference", "mac"), configuration.get("variable_order", "mrv"),
+                           configuration.get("value_order", "lcv"))
+    if max_seconds is None and all(configuration["solver"] == "min_conflicts" for configuration in configurations):
+        raise ValueError("min_conflicts cannot prove that there is no solution, give max_seconds or a backtracking run")
+    problem = _as_problem(csp, colors, domains)
+    rng = random.Random(seed)
+    restart_nodes = restart_nodes or max(len(problem), 1)
+    tasks = [(i, configuration, rng.randrange(2 ** 32), restart_nodes) for i, configuration in enumerate(configurations)]
+    processes = processes or min(len(tasks), os.cpu_count() or 1)
+
+    pool = multiprocessing.Pool(processes, initializer=_initialize, initargs=(problem,))
+    try:
+        results = pool.imap_unordered(_run, tasks)
+        timeout = None if max_seconds is None else max(max_seconds - (time.perf_counter() - begin), 0.0)
+        try:
+            index, values, status, restarts, nodes = results.next(timeout)
+        except multiprocessing.TimeoutError:
+            return PortfolioResult(None, "timeout", None, 0, 0, time.perf_counter() - begin)
+    finally:
+        # Stops the runs that are still searching.
+        pool.terminate()
+        pool.join()
+    assignment = problem.decode(values) if values is not None else None
+    return PortfolioResult(assignment, status, configurations[index], restarts, nodes, time.perf_counter() - begin)
@@ -0,0 +1,139 @@
+import itertools
+import random
+
+import pytest
+from csp import (CSPStats, ColoringProblem, INFERENCES, _Search, backtracking_search, constraint_graph, count_conflicts,
+                 is_solution)
+
+CSP_GRAPH = {'WA': ['NT', 'SA'],
+             'NT': ['WA', 'SA', 'Q'],
+             'SA': ['WA', 'NT', 'Q', 'NSW', 'V'],
+             'Q': ['NT', 'SA', 'NSW'],
+             'NSW': ['Q', 'SA', 'V'],
+             'V': ['SA', 'NSW']}
+COLORS = ['red', 'blue', 'green']
+
+
+def planted_graph(n: int, degree: float, k: int, seed: int = 0) -> dict:
+    """
+    Random graph with n * degree / 2 edges that has a proper coloring with k colors.
+    """
+    rng = random.Random(seed)
+    colors = [rng.randrange(k) for _ in range(n)]
+    graph, edges = {v: [] for v in range(n)}, 0
+    while edges < n * degree / 2:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if colors[u] != colors[v]:
+            graph[u].append(v)
+            edges += 1
+    return graph
+
+
+def test_constraint_graph_is_symmetric():
+    neighbors = constraint_graph({'a': ['b', 'a'], 'b': [], 'c': ['d']})
+    assert neighbors == {'a': ['b'], 'b': ['a'], 'c': ['d'], 'd': ['c']}
+    assert count_conflicts({'a': 1, 'b': 1, 'c': 2, 'd': 3}, {'a': ['b'], 'b': ['a'], 'c': ['d']}) == 1
+
+
+def test_coloring_problem():
+    problem = ColoringProblem(CSP_GRAPH, COLORS, domains={'WA': ['green', 'yellow']})
+    assert problem.variables == list(CSP_GRAPH)
+    assert problem.neighbors[problem.index['WA']] == [problem.index['NT'], problem.index['SA']]
+    assert problem.full == 0b111
+    assert problem.domains[problem.index['WA']] == 0b100
+    assert problem.decode([0, 1, -1, 2, -1, -1]) == {'WA': 'red', 'NT': 'blue', 'Q': 'green'}
+    # The problem is not modified by a search and can be solved again.
+    first = backtracking_search(problem)
+    assert first['WA'] == 'green' and is_solution(first, CSP_GRAPH)
+    assert backtracking_search(problem) == first
+    assert problem.domains[problem.index['WA']] == 0b100
+
+
+def test_trail_restores_domains():
+    problem = ColoringProblem(CSP_GRAPH, COLORS)
+    search = _Search(problem, CSPStats())
+    domains, counts = list(search.domains), list(search.counts)
+    sa = problem.index['SA']
+    mark = len(search.trail)
+    assert search.assign(sa, 0, "mac")
+    assert all(not search.domains[w] & 1 for w in problem.neighbors[sa])
+    search.unassign(sa, mark, "mac")
+    assert search.domains == domains and search.counts == counts and search.trail == []
+
+
+def test_australia():
+    for inference in INFERENCES:
+        stats = CSPStats()
+        assignment = backtracking_search(CSP_GRAPH, COLORS, inference=inference, stats=stats)
+        assert is_solution(assignment, CSP_GRAPH)
+        assert stats.backtracks == 0
+    # MRV with degree tie-breaking starts with SA, which has the most neighbors, and gives it the first color.
+    assert backtracking_search(CSP_GRAPH, COLORS)['SA'] == 'red'
+    assert backtracking_search(CSP_GRAPH, COLORS, variable_order="static")['WA'] == 'red'
+
+
+def test_unsatisfiable():
+    k4 = {v: [w for w in range(4) if w != v] for v in range(4)}
+    for inference in INFERENCES:
+        stats = CSPStats()
+        assert backtracking_search(k4, COLORS, inference=inference, stats=stats) is None
+        assert stats.backtracks > 0
+    assert backtracking_search({'a': ['b']}, COLORS, domains={'a': ['red'], 'b': ['red']}) is None
+
+
+def test_domains():
+    assignment = backtracking_search(CSP_GRAPH, COLORS, domains={'SA': ['green'], 'WA': ['blue', 'yellow']})
+    assert is_solution(assignment, CSP_GRAPH)
+    assert assignment['SA'] == 'green' and assignment['WA'] == 'blue'
+    # Domains given with a ColoringProblem restrict its own domains further.
+    problem = ColoringProblem(CSP_GRAPH, COLORS, domains={'SA': ['green', 'red']})
+    assignment = backtracking_search(problem, domains={'SA': ['green', 'blue'], 'WA': ['blue']})
+    assert is_solution(assignment, CSP_GRAPH)
+    assert assignment['SA'] == 'green' and assignment['WA'] == 'blue'
+    assert problem.domains[problem.index['SA']] == problem.mask(['green', 'red'])
+    assert backtracking_search(problem, domains={'SA': ['blue']}) is None
+
+
+@pytest.mark.parametrize("inference", INFERENCES)
+def test_matches_brute_force(inference):
+    for seed in range(50):
+        rng = random.Random(seed)
+        graph = {v: [w for w in range(v + 1, 7) if rng.random() < 0.5] for v in range(7)}
+        satisfiable = any(count_conflicts(dict(enumerate(colors)), graph) == 0
+                          for colors in itertools.product(range(3), repeat=7))
+        for variable_order, value_order in (("mrv", "lcv"), ("static", "static")):
+            assignment = backtracking_search(graph, range(3), inference=inference, variable_order=variable_order,
+                                             value_order=value_order)
+            assert (assignment is not None) == satisfiable
+            assert assignment is None or is_solution(assignment, graph)
+
+
+def test_seed():
+    graph = planted_graph(300, 4, 3)
+    solutions = [backtracking_search(graph, range(3), seed=seed) for seed in range(3)]
+    assert all(is_solution(solution, graph) for solution in solutions)
+    assert solutions[0] == backtracking_search(graph, range(3), seed=0)
+    assert solutions[0] != solutions[1]
+
+
+def test_mac_explores_fewer_nodes_than_forward_checking():
+    graph = planted_graph(200, 4.4, 3, seed=1)
+    forward_checking, mac = CSPStats(), CSPStats()
+    assert is_solution(backtracking_search(graph, range(3), inference="forward_checking", stats=forward_checking),
+                       graph)
+    assert is_solution(backtracking_search(graph, range(3), inference="mac", stats=mac), graph)
+    assert mac.nodes < forward_checking.nodes
+
+
+def test_thousands_of_variables():
+    graph = planted_graph(5000, 5, 4)
+    stats = CSPStats()
+    assert is_solution(backtracking_search(graph, range(4), stats=stats), graph)
+    assert stats.nodes < 10_000
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        backtracking_search(CSP_GRAPH, COLORS, inference="ac4")
+    with pytest.raises(ValueError):
+        backtracking_search(CSP_GRAPH, COLORS, variable_order="random")
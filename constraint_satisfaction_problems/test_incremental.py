@@ -0,0 +1,84 @@
+import random
+
+import pytest
+from csp import is_solution
+from incremental import IncrementalCSP
+from test_csp import COLORS, CSP_GRAPH, planted_graph
+
+
+def graph_of(problem: IncrementalCSP) -> dict:
+    return {v: list(adjacent) for v, adjacent in problem.neighbors.items()}
+
+
+def test_australia():
+    problem = IncrementalCSP(CSP_GRAPH, COLORS)
+    assignment = problem.solve()
+    assert is_solution(assignment, CSP_GRAPH)
+    before = dict(assignment)
+    problem.add_variable('T', ['V'])
+    problem.add_constraint('T', 'NSW')
+    assignment = problem.solve()
+    assert is_solution(assignment, graph_of(problem))
+    assert problem.full_solves == 1
+    assert {v for v in before if assignment[v] != before[v]} <= {'V', 'NSW'}
+    assert 'T' in problem.changed
+    # WA and V get the same color in every solution, so this constraint makes the problem unsatisfiable.
+    problem.add_constraint('WA', 'V')
+    assert problem.solve() is None
+
+
+def test_neighborhood_repair():
+    problem = IncrementalCSP({'u': ['a', 'b']}, [0, 1, 2])
+    problem.assignment = {'u': 2, 'a': 0, 'b': 1}
+    # v conflicts with every color, u, a and b are recolored with v.
+    problem.add_variable('v', ['u', 'a', 'b'])
+    assignment = problem.solve()
+    assert is_solution(assignment, graph_of(problem))
+    assert assignment['a'] == assignment['b']
+    assert problem.full_solves == 0
+
+
+def test_unsatisfiable_and_removals():
+    problem = IncrementalCSP({'a': ['b'], 'b': ['c'], 'c': ['d']}, [0, 1])
+    assert is_solution(problem.solve(), graph_of(problem))
+    problem.add_constraint('a', 'c')
+    assert problem.solve() is None
+    assert problem.full_solves == 2
+    problem.remove_constraint('a', 'c')
+    assert is_solution(problem.solve(), graph_of(problem))
+    problem.remove_variable('b')
+    assert 'b' not in problem and 'b' not in problem.solve()
+    assert is_solution(problem.assignment, graph_of(problem))
+
+
+def test_domains():
+    problem = IncrementalCSP(CSP_GRAPH, COLORS)
+    problem.solve()
+    problem.set_domain('SA', ['green'])
+    assignment = problem.solve()
+    assert assignment['SA'] == 'green' and is_solution(assignment, CSP_GRAPH)
+    problem.add_variable('T', domain=['red'])
+    assert problem.solve()['T'] == 'red'
+    problem.set_domain('Z', ['blue'])
+    assert problem.solve()['Z'] == 'blue'
+    with pytest.raises(ValueError):
+        problem.add_constraint('T', 'T')
+
+
+def test_random_updates():
+    rng = random.Random(0)
+    n = 3000
+    problem = IncrementalCSP(planted_graph(n, 3, 3), range(3))
+    problem.solve()
+    for step in range(50):
+        for _ in range(5):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if u != v and u in problem and v in problem:
+                problem.add_constraint(u, v)
+        problem.add_variable(('new', step), [rng.randrange(n) for _ in range(2)])
+        problem.remove_variable(rng.randrange(n)) if rng.random() < 0.5 else None
+        assignment = problem.solve()
+        if assignment is None:
+            break
+        assert is_solution(assignment, graph_of(problem))
+        assert len(problem.changed) < n // 10 or problem.full_solves > 1
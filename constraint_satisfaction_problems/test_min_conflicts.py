@@ -0,0 +1,59 @@
+import time
+
+from csp import ColoringProblem, count_conflicts, is_solution
+from min_conflicts import min_conflicts
+from test_csp import COLORS, CSP_GRAPH, planted_graph
+
+
+def test_australia():
+    result = min_conflicts(CSP_GRAPH, COLORS, seed=0)
+    assert result.conflicts == 0
+    assert is_solution(result.assignment, CSP_GRAPH)
+
+
+def test_large_graph():
+    graph = planted_graph(10_000, 5, 4)
+    result = min_conflicts(graph, range(4), seed=0)
+    assert result.conflicts == 0
+    assert is_solution(result.assignment, graph)
+
+
+def test_best_assignment_of_unsatisfiable_problem():
+    k5 = {v: [w for w in range(5) if w != v] for v in range(5)}
+    for seed in range(10):
+        result = min_conflicts(k5, COLORS, max_steps=500, seed=seed)
+        # Two pairs of variables share a color in the best colorings of K5 with 3 colors.
+        assert result.conflicts == 2
+        assert count_conflicts(result.assignment, k5) == result.conflicts
+        assert result.steps == 500
+
+
+def test_best_assignment_is_returned():
+    graph = planted_graph(2000, 8.8, 4, seed=1)
+    for seed in range(3):
+        result = min_conflicts(graph, range(4), max_steps=20_000, walk_probability=0.2, seed=seed)
+        assert len(result.assignment) == len(graph)
+        assert count_conflicts(result.assignment, graph) == result.conflicts
+
+
+def test_time_budget():
+    graph = planted_graph(2000, 8.8, 4, seed=1)
+    begin = time.perf_counter()
+    result = min_conflicts(graph, range(4), max_steps=10 ** 9, max_seconds=0.2, seed=0)
+    assert time.perf_counter() - begin < 2
+    assert result.seconds >= 0.2 or result.conflicts == 0
+
+
+def test_domains_and_initial():
+    problem = ColoringProblem(CSP_GRAPH, COLORS, domains={'SA': ['green']})
+    result = min_conflicts(problem, seed=0)
+    assert result.conflicts == 0 and result.assignment['SA'] == 'green'
+    solution = {'WA': 'red', 'NT': 'green', 'SA': 'blue', 'Q': 'red', 'NSW': 'green', 'V': 'red'}
+    result = min_conflicts(CSP_GRAPH, COLORS, initial=solution)
+    assert result.assignment == solution and result.steps == 0
+
+
+def test_seed_is_reproducible():
+    graph = planted_graph(500, 8, 4)
+    assert min_conflicts(graph, range(4), max_steps=2000, seed=3)[:3] == \
+        min_conflicts(graph, range(4), max_steps=2000, seed=3)[:3]
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+from csp import ColoringProblem, is_solution
+from portfolio import luby, portfolio, restarting_search
+from test_csp import COLORS, CSP_GRAPH, planted_graph
+
+
+def test_luby():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+def test_restarting_search():
+    k4 = ColoringProblem({v: [w for w in range(4) if w != v] for v in range(4)}, COLORS)
+    values, status, restarts, nodes = restarting_search(k4, {"solver": "backtracking"}, seed=0, restart_nodes=2)
+    assert values is None and status == "unsatisfiable"
+    # The node limit grows with the restarts until the search is complete.
+    assert restarts > 1
+    for degree, configuration in ((4.4, {"solver": "backtracking", "inference": "forward_checking"}),
+                                  (3, {"solver": "min_conflicts"})):
+        graph = planted_graph(300, degree, 3, seed=1)
+        problem = ColoringProblem(graph, range(3))
+        values, status, _, _ = restarting_search(problem, configuration, seed=0, restart_nodes=300)
+        assert status == "solved" and is_solution(problem.decode(values), graph)
+
+
+def test_portfolio():
+    result = portfolio(CSP_GRAPH, COLORS, seed=0)
+    assert result.status == "solved"
+    assert is_solution(result.assignment, CSP_GRAPH)
+    graph = planted_graph(300, 4.4, 3, seed=1)
+    result = portfolio(graph, range(3), processes=2, seed=0)
+    assert result.status == "solved" and is_solution(result.assignment, graph)
+
+
+def test_unsatisfiable_and_timeout():
+    k4 = {v: [w for w in range(4) if w != v] for v in range(4)}
+    result = portfolio(k4, COLORS, configurations=[{"inference": "mac"}])
+    assert result.status == "unsatisfiable" and result.assignment is None
+    # Coloring K12 with 11 colors takes backtracking about 11! nodes, the running workers are stopped.
+    k12 = {v: [w for w in range(12) if w != v] for v in range(12)}
+    begin = time.perf_counter()
+    result = portfolio(k12, range(11), max_seconds=0.5)
+    assert result.status == "timeout" and result.assignment is None
+    assert time.perf_counter() - begin < 5
+
+
+def test_empty_domain():
+    for configuration in ({"solver": "min_conflicts"}, {"solver": "backtracking"}):
+        result = portfolio(CSP_GRAPH, COLORS, domains={'SA': []}, configurations=[configuration], max_seconds=10)
+        assert result.status == "unsatisfiable" and result.assignment is None
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        portfolio(CSP_GRAPH, COLORS, configurations=[{"solver": "simulated_annealing"}])
+    with pytest.raises(ValueError):
+        portfolio(CSP_GRAPH, COLORS, configurations=[{"inference": "ac4"}])
+    # Local search alone cannot show that there is no solution, it needs a time budget.
+    with pytest.raises(ValueError):
+        portfolio(CSP_GRAPH, COLORS, configurations=[{"solver": "min_conflicts"}])
+    k4 = {v: [w for w in range(4) if w != v] for v in range(4)}
+    result = portfolio(k4, COLORS, configurations=[{"solver": "min_conflicts"}], max_seconds=0.5)
+    assert result.status == "timeout"
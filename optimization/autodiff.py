@@ -0,0 +1,351 @@
+"""
+Automatic derivatives for the optimizers.
+
+Gradients are computed with forward-mode dual numbers over NumPy arrays. A Dual
+carries its value and the derivatives with respect to all k input variables in
+an extra trailing axis, so one evaluation of f gives the full gradient instead
+of k finite-difference evaluations.
+
+Second derivatives combine dual numbers with the complex step: evaluating the
+dual-number gradient at x + i*h*v gives Im(grad f(x + i*h*v)) / h = H(x) v,
+exact up to rounding for tiny h. All directions are stacked into one array, so
+the full Hessian also costs only one (vectorized) evaluation of f.
+
+Two calling conventions are supported, matching the modules in this directory:
+
+- Scalar-per-element arguments, like f(x, y) in gradient-descent/xy_squared.py
+  or f(x, a, b) in gauss-newton-least-squares. gradient(f) returns a function
+  with the same signature that returns one partial derivative per argument,
+  i.e. a drop-in f_grad.
+- Vector arguments, f(x) with the coordinates in the last axis of x, like the
+  (N, d) points of gradient-descent/multi_start.py or the (B, n) points of
+  newtons-method/equality_constrained.py. vector_gradient(f) returns the
+  (..., d) gradient.
+
+f may use +, -, *, /, **, @ with constant arrays, indexing, .sum() / np.sum and
+the NumPy ufuncs in UNARY_UFUNCS. For the Hessian functions f must also be
+analytic (no abs, no comparisons) and index coordinates as x[..., j].
+
+Example:
+    f_grad = gradient(f)             # f(x, y) = x**2 + y**2, f_grad(x, y) == (2x, 2y)
+    hess_f = vector_hessian(lambda x: np.sum(x ** 4, axis=-1))
+"""
+import numpy as np
+
+COMPLEX_STEP = 1e-20
+
+
+class Dual:
+    """
+    Dual number over NumPy arrays: value with shape S and tangent with shape S + (k,).
+    """
+
+    __array_priority__ = 1000
+
+    def __init__(self, value, tangent) -> None:
+        self.value = np.asarray(value)
+        self.tangent = np.asarray(tangent)
+
+    @property
+    def shape(self) -> tuple:
+        return self.value.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.value.ndim
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value!r}, {self.tangent!r})"
+
+    def __getitem__(self, key) -> "Dual":
+        key = key if isinstance(key, tuple) else (key,)
+        return Dual(self.value[key], self.tangent[key + (slice(None),)])
+
+    def __neg__(self) -> "Dual":
+        return Dual(-self.value, -self.tangent)
+
+    def __pos__(self) -> "Dual":
+        return self
+
+    def __add__(self, other) -> "Dual":
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.tangent + other.tangent)
+        value = self.value + other
+        return Dual(value, np.broadcast_to(self.tangent, value.shape + self.tangent.shape[-1:]))
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Dual":
+        return self + (-other)
+
+    def __rsub__(self, other) -> "Dual":
+        return (-self) + other
+
+    def __mul__(self, other) -> "Dual":
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value,
+                        self.tangent * other.value[..., None] + other.tangent * self.value[..., None])
+        other = np.asarray(other)
+        return Dual(self.value * other, self.tangent * other[..., None])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other) -> "Dual":
+        if isinstance(other, Dual):
+            return self * other.reciprocal()
+        return self * (1 / np.asarray(other))
+
+    def __rtruediv__(self, other) -> "Dual":
+        return self.reciprocal() * other
+
+    def reciprocal(self) -> "Dual":
+        inverse = 1 / self.value
+        return Dual(inverse, -self.tangent * (inverse * inverse)[..., None])
+
+    def __pow__(self, exponent) -> "Dual":
+        if isinstance(exponent, Dual):
+            return (self.log() * exponent).exp()
+        exponent = np.asarray(exponent)
+        if exponent.ndim == 0 and exponent == 2:
+            return self * self
+        return Dual(self.value ** exponent, self.tangent * (exponent * self.value ** (exponent - 1))[..., None])
+
+    def __rpow__(self, base) -> "Dual":
+        value = np.asarray(base) ** self.value
+        return Dual(value, self.tangent * (value * np.log(base))[..., None])
+
+    def __matmul__(self, other) -> "Dual":
+        other = np.asarray(other)
+        matrix = other if other.ndim == 1 else np.swapaxes(other, -1, -2)
+        return Dual(self.value @ other, np.matmul(matrix, self.tangent))
+
+    def __rmatmul__(self, other) -> "Dual":
+        other = np.asarray(other)
+        return Dual(other @ self.value, np.matmul(other, self.tangent))
+
+    def sum(self, axis=None, keepdims: bool = False) -> "Dual":
+        if axis is None:
+            axis = tuple(range(self.ndim))
+        axes = tuple(a % self.ndim for a in np.atleast_1d(axis))
+        return Dual(self.value.sum(axis=axes, keepdims=keepdims), self.tangent.sum(axis=axes, keepdims=keepdims))
+
+    def exp(self) -> "Dual":
+        value = np.exp(self.value)
+        return Dual(value, self.tangent * value[..., None])
+
+    def log(self) -> "Dual":
+        return Dual(np.log(self.value), self.tangent / self.value[..., None])
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in BINARY_UFUNCS:
+            return BINARY_UFUNCS[ufunc](*inputs)
+        if ufunc in UNARY_UFUNCS:
+            function, derivative = UNARY_UFUNCS[ufunc]
+            (x,) = inputs
+            return Dual(function(x.value), x.tangent * derivative(x.value)[..., None])
+        return NotImplemented
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func is np.sum:
+            return args[0].sum(*args[1:], **kwargs)
+        return NotImplemented
+
+
+BINARY_UFUNCS = {
+    np.add: lambda a, b: a + b if isinstance(a, Dual) else b + a,
+    np.subtract: lambda a, b: a - b if isinstance(a, Dual) else b.__rsub__(a),
+    np.multiply: lambda a, b: a * b if isinstance(a, Dual) else b * a,
+    np.true_divide: lambda a, b: a / b if isinstance(a, Dual) else b.__rtruediv__(a),
+    np.power: lambda a, b: a ** b if isinstance(a, Dual) else b.__rpow__(a),
+    np.matmul: lambda a, b: a @ b if isinstance(a, Dual) else b.__rmatmul__(a),
+}
+
+# ufunc: (function, derivative)
+UNARY_UFUNCS = {
+    np.negative: (np.negative, lambda x: -np.ones_like(x)),
+    np.square: (np.square, lambda x: 2 * x),
+    np.sqrt: (np.sqrt, lambda x: 0.5 / np.sqrt(x)),
+    np.exp: (np.exp, np.exp),
+    np.log: (np.log, lambda x: 1 / x),
+    np.sin: (np.sin, np.cos),
+    np.cos: (np.cos, lambda x: -np.sin(x)),
+    np.tanh: (np.tanh, lambda x: 1 - np.tanh(x) ** 2),
+    np.arctan: (np.arctan, lambda x: 1 / (1 + x * x)),
+    np.absolute: (np.absolute, np.sign),
+}
+
+
+def _tangent(derivatives) -> np.ndarray:
+    """
+    Tangent of an output of f, None if f did not depend on the inputs.
+    """
+    return derivatives.tangent if isinstance(derivatives, Dual) else None
+
+
+def _seed(args: tuple, argnums: tuple) -> list:
+    """
+    Replace the arguments in argnums by duals, argument argnums[j] gets the unit tangent e_j.
+    """
+    k = len(argnums)
+    args = list(args)
+    for j, i in enumerate(argnums):
+        value = np.asarray(args[i])
+        tangent = np.zeros(value.shape + (k,), dtype=value.dtype if value.dtype.kind == "c" else float)
+        tangent[..., j] = 1
+        args[i] = Dual(value, tangent)
+    return args
+
+
+def _argnums(argnums, n_args: int) -> tuple:
+    if argnums is None:
+        return tuple(range(n_args))
+    return (argnums,) if isinstance(argnums, int) else tuple(argnums)
+
+
+def gradient(f, argnums=None):
+    """
+    Partial derivatives of f(*args) with respect to the arguments in argnums.
+
+    The arguments are scalars or arrays that are combined elementwise, like
+    f(x, y) = x**2 + y**2. The result is a drop-in f_grad for f.
+
+    Parameters:
+    - f (callable): The function.
+    - argnums (int | tuple): Arguments to differentiate, all by default.
+
+    Returns:
+    callable: f_grad(*args) returning one partial derivative per argument in
+    argnums (a tuple, or a single array if argnums is an int).
+    """
+    def f_grad(*args):
+        nums = _argnums(argnums, len(args))
+        out = f(*_seed(args, nums))
+        tangent = _tangent(out)
+        shape = np.shape(out.value if isinstance(out, Dual) else out)
+        partials = tuple(np.zeros(shape) if tangent is None else tangent[..., j] for j in range(len(nums)))
+        return partials[0] if isinstance(argnums, int) else partials
+    return f_grad
+
+
+def jacobian(f, argnums=None):
+    """
+    Jacobian of f(*args) with one column per argument in argnums.
+
+    For f(x, a, b) of a least-squares model and argnums=(1, 2) this is the
+    (n, 2) Jacobian Gauss-Newton needs.
+
+    Parameters:
+    - f (callable): The function.
+    - argnums (int | tuple): Arguments to differentiate, all by default.
+
+    Returns:
+    callable: jac(*args) returning an array with shape f(*args).shape + (len(argnums),).
+    """
+    f_grad = gradient(f, argnums if argnums is None else _argnums(argnums, 0))
+
+    def jac(*args):
+        return np.stack(np.broadcast_arrays(*f_grad(*args)), axis=-1)
+    return jac
+
+
+def _vector_tangent(f, x: np.ndarray) -> np.ndarray:
+    """
+    Dual-number gradient of f with respect to the last axis of x, x may be complex.
+    """
+    d = x.shape[-1]
+    out = f(Dual(x, np.broadcast_to(np.eye(d), x.shape + (d,))))
+    return out.tangent if isinstance(out, Dual) else np.zeros(x.shape)
+
+
+def vector_gradient(f):
+    """
+    Gradient of f(x) with respect to the coordinates in the last axis of x.
+
+    Parameters:
+    - f (callable): Maps x with shape (..., d) to values with shape (...).
+
+    Returns:
+    callable: grad(x) with shape (..., d).
+    """
+    def grad(x):
+        return _vector_tangent(f, np.asarray(x, dtype=float))
+    return grad
+
+
+def vector_hessian_vector_product(f, h: float = COMPLEX_STEP):
+    """
+    Hessian-vector product of f(x) with respect to the last axis of x.
+
+    Parameters:
+    - f (callable): Maps x with shape (..., d) to values with shape (...), analytic.
+    - h (float): Complex step.
+
+    Returns:
+    callable: hvp(x, v) = H(x) v with shape (..., d).
+    """
+    def hvp(x, v):
+        return np.imag(_vector_tangent(f, np.asarray(x, dtype=float) + 1j * h * np.asarray(v))) / h
+    return hvp
+
+
+def vector_hessian(f, h: float = COMPLEX_STEP):
+    """
+    Hessian of f(x) with respect to the last axis of x, from one vectorized evaluation.
+
+    The d complex-step directions are stacked in a new leading axis, so f has
+    to index coordinates as x[..., j] and reduce over axis=-1.
+
+    Parameters:
+    - f (callable): Maps x with shape (..., d) to values with shape (...), analytic.
+    - h (float): Complex step.
+
+    Returns:
+    callable: hess(x) with shape (..., d, d).
+    """
+    def hess(x):
+        x = np.asarray(x, dtype=float)
+        d = x.shape[-1]
+        directions = np.eye(d).reshape((d,) + (1,) * (x.ndim - 1) + (d,))
+        rows = np.imag(_vector_tangent(f, x + 1j * h * directions)) / h
+        return np.moveaxis(rows, 0, -2)
+    return hess
+
+
+def hessian(f, argnums=None, h: float = COMPLEX_STEP):
+    """
+    Second derivatives of f(*args) with respect to the arguments in argnums.
+
+    Parameters:
+    - f (callable): The function, analytic in the arguments in argnums.
+    - argnums (int | tuple): Arguments to differentiate, all by default.
+    - h (float): Complex step.
+
+    Returns:
+    callable: hess(*args). For an int argnum the elementwise second derivative,
+    otherwise an array with shape f(*args).shape + (k, k).
+    """
+    def hess(*args):
+        nums = _argnums(argnums, len(args))
+        k = len(nums)
+        ndim = max(np.ndim(arg) for arg in args)
+        args = list(args)
+        for j, i in enumerate(nums):
+            value = np.asarray(args[i], dtype=float)
+            value = value.reshape((1,) * (ndim - value.ndim) + value.shape)
+            step = np.zeros((k,) + (1,) * ndim)
+            step[j] = h
+            args[i] = value + 1j * step
+        # Row j of the result is the complex-step derivative of the gradient in direction e_j.
+        out = f(*_seed(tuple(args), nums))
+        tangent = _tangent(out)
+        if tangent is None:
+            shape = np.shape(out)[1:] + (k, k)
+            return np.zeros(shape[:-2]) if isinstance(argnums, int) else np.zeros(shape)
+        rows = np.moveaxis(np.imag(tangent) / h, 0, -2)
+        return rows[..., 0, 0] if isinstance(argnums, int) else rows
+    return hess
@@ -0,0 +1,277 @@
+"""
+Benchmarks for the optimization algorithms.
+
+Runs gradient descent (fixed step and backtracking), Newton's method,
+conjugate gradient and Gauss-Newton on problem families of increasing
+dimension and condition number and reports for every run:
+
+- wall time (best of `repeat` runs)
+- iterations
+- function, gradient and mat-vec evaluations
+- peak memory allocated during the run (tracemalloc, separate run)
+
+Problem families:
+- quadratic: f(x) = 1/2 x^T A x - b^T x with a random SPD matrix A of given
+  dimension and condition number (gradient descent, Newton, conjugate gradient).
+- least_squares: linear least squares with a design matrix of given number of
+  columns and condition number (Gauss-Newton).
+
+The results are saved as JSON and can be compared with the results of another
+commit; the comparison exits with status 1 if a run got slower than the
+threshold or needs more evaluations.
+
+Usage:
+    python benchmark.py --output results.json
+    python benchmark.py --output new.json --compare results.json --threshold 1.2
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+if __name__ == "__main__":
+    # Run as a script: the solvers are in the subdirectories (pytest.ini sets the same path for the tests).
+    for name in ("gradient-descent", "newtons-method", "conjugate-gradient", "gauss-newton-least-squares"):
+        sys.path.append(os.path.join(DIRECTORY, name))
+
+import multi_start
+from conjugate_gradient import conjugate_gradient
+from equality_constrained import solve_kkt
+from line_search import ArmijoLineSearch, Objective, minimize
+from normal_equations import gauss_newton_streaming
+
+DIMENSIONS = (10, 100, 500)
+CONDITIONS = (10.0, 1e3)
+TOL = 1e-6
+
+
+class Counter:
+    """
+    Callable wrapper that counts how often the wrapped function is called.
+    """
+
+    def __init__(self, function) -> None:
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.function(*args)
+
+
+def spd_matrix(dim: int, condition: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Random symmetric positive definite matrix with eigenvalues between 1 and condition.
+    """
+    Q, _ = np.linalg.qr(rng.normal(size=(dim, dim)))
+    return (Q * np.logspace(0, np.log10(condition), dim)) @ Q.T
+
+
+def quadratic_problem(dim: int, condition: float, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {"A": spd_matrix(dim, condition, rng), "b": rng.normal(size=dim), "x0": np.zeros(dim)}
+
+
+def least_squares_problem(dim: int, condition: float, seed: int = 0, n: int = 20_000) -> dict:
+    rng = np.random.default_rng(seed)
+    U, _ = np.linalg.qr(rng.normal(size=(n, dim)))
+    V, _ = np.linalg.qr(rng.normal(size=(dim, dim)))
+    design = (U * np.logspace(0, np.log10(condition), dim)) @ V.T
+    return {"design": design, "y": design @ rng.normal(size=dim) + 0.01 * rng.normal(size=n),
+            "x": np.arange(n), "params0": np.zeros(dim)}
+
+
+def run_gradient_descent_fixed(problem: dict, max_iterations: int = 20_000) -> dict:
+    A, b = problem["A"], problem["b"]
+    f_grad = Counter(lambda x: x @ A - b)
+    tau = 1.0 / np.linalg.eigvalsh(A)[-1]
+    _, iterations, _ = multi_start.optimize_without_backtracking(f_grad, problem["x0"][None], tau, max_iterations, TOL)
+    return {"iterations": int(iterations[0]), "f_evaluations": 0, "grad_evaluations": f_grad.calls, "matvecs": None}
+
+
+def run_gradient_descent_backtracking(problem: dict, max_iterations: int = 20_000) -> dict:
+    A, b = problem["A"], problem["b"]
+    objective = Objective(lambda x: 0.5 * x @ A @ x - b @ x, lambda x: A @ x - b)
+    _, _, _, iterations = minimize(objective, problem["x0"], ArmijoLineSearch(1e-4, 0.5), max_iterations, TOL)
+    return {"iterations": iterations, "f_evaluations": objective.n_f, "grad_evaluations": objective.n_grad,
+            "matvecs": None}
+
+
+def run_newton(problem: dict, max_iterations: int = 100) -> dict:
+    A, b = problem["A"], problem["b"]
+    n = len(b)
+    grad_f = Counter(lambda x: x @ A - b)
+    # Unconstrained problem: no constraints, the KKT system is the Newton system.
+    _, _, iterations, _ = solve_kkt(grad_f, lambda x: np.zeros((len(x), 0)), lambda x: np.zeros((len(x), 0, n)),
+                                    problem["x0"], hess_L=lambda x, lam: A[None], tol=TOL,
+                                    max_iterations=max_iterations)
+    return {"iterations": iterations, "f_evaluations": 0, "grad_evaluations": grad_f.calls, "matvecs": None}
+
+
+def run_conjugate_gradient(problem: dict) -> dict:
+    A, b = problem["A"], problem["b"]
+    matvec = Counter(A.__matmul__)
+    _, iterations = conjugate_gradient(matvec, b, tol=TOL)
+    return {"iterations": iterations, "f_evaluations": 0, "grad_evaluations": 0, "matvecs": matvec.calls}
+
+
+def run_gauss_newton(problem: dict, max_iterations: int = 20) -> dict:
+    design = problem["design"]
+
+    # x holds row indices into the design matrix, the chunks arrive as float arrays.
+    def model_jacobian(x, *params):
+        return design[x.astype(int)]
+
+    def model_loss(x, *args):
+        *params, y = args
+        return y - design[x.astype(int)] @ np.array(params)
+
+    chunk_size = 4096
+    jacobian, f_loss = Counter(model_jacobian), Counter(model_loss)
+    gauss_newton_streaming(jacobian, f_loss, problem["x"], problem["y"], problem["params0"], TOL, max_iterations,
+                           chunk_size)
+    chunks = -(-len(problem["x"]) // chunk_size)
+    return {"iterations": jacobian.calls // chunks, "f_evaluations": f_loss.calls, "grad_evaluations": jacobian.calls,
+            "matvecs": None}
+
+
+SOLVERS = {
+    "gradient_descent_fixed": (run_gradient_descent_fixed, quadratic_problem),
+    "gradient_descent_backtracking": (run_gradient_descent_backtracking, quadratic_problem),
+    "newton": (run_newton, quadratic_problem),
+    "conjugate_gradient": (run_conjugate_gradient, quadratic_problem),
+    "gauss_newton": (run_gauss_newton, least_squares_problem),
+}
+
+
+def measure(run, problem: dict, repeat: int) -> dict:
+    """
+    Run a benchmark, measure the best wall time of `repeat` runs and the peak memory of one more run.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(problem)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run(problem)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result["time"] = min(times)
+    result["peak_memory"] = peak
+    return result
+
+
+def run_benchmarks(solvers: list = None, dimensions: tuple = DIMENSIONS, conditions: tuple = CONDITIONS,
+                   repeat: int = 3) -> list:
+    """
+    Run every solver on every problem size and condition number.
+
+    Parameters:
+    - solvers (list): Names of the solvers, all by default.
+    - dimensions (tuple): Problem dimensions.
+    - conditions (tuple): Condition numbers.
+    - repeat (int): Number of timed runs per benchmark.
+
+    Returns:
+    list: One result dict per (solver, dimension, condition).
+    """
+    results = []
+    for name in solvers or SOLVERS:
+        run, make_problem = SOLVERS[name]
+        for dim in dimensions:
+            for condition in conditions:
+                result = measure(run, make_problem(dim, condition), repeat)
+                family = make_problem.__name__.removesuffix("_problem")
+                results.append({"solver": name, "family": family, "dim": dim,
+                                "condition": condition, **result})
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=DIRECTORY, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "date": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(baseline: list, current: list, threshold: float = 1.2, min_time: float = 1e-3) -> list:
+    """
+    Find runs that got slower or need more evaluations than in the baseline.
+
+    Parameters:
+    - baseline (list): Results of the baseline commit.
+    - current (list): Results of the current commit.
+    - threshold (float): Allowed ratio of current to baseline wall time.
+    - min_time (float): Slowdowns below this many seconds are timer noise and ignored.
+
+    Returns:
+    list: One message per regression.
+    """
+    key = lambda result: (result["solver"], result["dim"], result["condition"])
+    previous = {key(result): result for result in baseline}
+    regressions = []
+    for result in current:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        name = "{} dim={} condition={:g}".format(*key(result))
+        if result["time"] > threshold * old["time"] and result["time"] - old["time"] > min_time:
+            regressions.append(f"{name}: time {old['time']:.4g}s -> {result['time']:.4g}s")
+        for counter in ("iterations", "f_evaluations", "grad_evaluations", "matvecs"):
+            if old.get(counter) is not None and result.get(counter) is not None and result[counter] > old[counter]:
+                regressions.append(f"{name}: {counter} {old[counter]} -> {result[counter]}")
+    return regressions
+
+
+def print_table(results: list) -> None:
+    header = f"{'solver':<30} {'dim':>5} {'cond':>8} {'time [s]':>10} {'iter':>7} {'f':>7} {'grad':>7} " \
+             f"{'matvec':>7} {'peak [KiB]':>11}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        matvecs = "-" if r["matvecs"] is None else r["matvecs"]
+        print(f"{r['solver']:<30} {r['dim']:>5} {r['condition']:>8.0e} {r['time']:>10.4f} {r['iterations']:>7} "
+              f"{r['f_evaluations']:>7} {r['grad_evaluations']:>7} {matvecs:>7} {r['peak_memory'] / 1024:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the optimization algorithms.")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), help="Solvers to run, all by default.")
+    parser.add_argument("--dimensions", nargs="+", type=int, default=list(DIMENSIONS))
+    parser.add_argument("--conditions", nargs="+", type=float, default=list(CONDITIONS))
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per benchmark.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Allowed slowdown factor.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.solvers, tuple(args.dimensions), tuple(args.conditions), args.repeat)
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"metadata": metadata(), "results": results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
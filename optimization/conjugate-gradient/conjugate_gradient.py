@@ -3,14 +3,14 @@ Conjugate Gradient Method for Solving Linear Systems
 
 Consider the linear system Ax = b given by:
 
-    A x = [ 4 1 ] [ x1 ] = [ 1 ] 
-          [ 1 3 ] [ x2 ]   [ 2 ] 
+    A x = [ 4 1 ] [ x1 ] = [ 1 ]
+          [ 1 3 ] [ x2 ]   [ 2 ]
 
 where A is a 2x2 matrix, x is the solution vector, and b is the right-hand side vector.
 
 We will perform the Conjugate Gradient Method, starting with an initial guess:
 
-    x_0 = [ 2 ] 
+    x_0 = [ 2 ]
           [ 1 ]
 
 to find an approximate solution to the system.
@@ -24,8 +24,22 @@ Example:
     b = np.array([1, 2])
     x_0 = np.array([2, 1])
     print(conjugate_gradient_method(x_0, b, max_iterations=10))
+
+For large symmetric positive definite systems use conjugate_gradient. A can be
+a dense array, a SciPy sparse matrix or any callable computing A @ x, b can be
+a vector or an (n, k) block of right-hand sides, and the iteration is
+preconditioned (Jacobi or incomplete Cholesky) and stops on the relative
+residual |b - Ax| / |b| <= tol. Every iteration uses exactly one mat-vec.
+
+Example:
+    A = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(1000, 1000), format="csr")
+    x, iterations = conjugate_gradient(A, np.ones(1000), tol=1e-10, preconditioner="ichol")
 """
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve_triangular
+
+A_MATRIX = np.array([[4, 1], [1, 3]])
 
 
 def A(x: np.ndarray) -> np.ndarray:
@@ -38,7 +52,185 @@ def A(x: np.ndarray) -> np.ndarray:
     Returns:
         - np.ndarray: Result of the matrix-vector multiplication.
     """
-    return np.array([[4, 1], [1, 3]]) @ x
+    return A_MATRIX @ x
+
+
+def as_matvec(A) -> callable:
+    """
+    Turn a dense array, a SciPy sparse matrix or a callable into a mat-vec function.
+
+    Parameters:
+        - A (np.ndarray | scipy.sparse matrix | callable): The matrix.
+
+    Returns:
+        - callable: Function computing A @ x.
+    """
+    if callable(A):
+        return A
+    if sp.issparse(A) or isinstance(A, np.ndarray):
+        return A.__matmul__
+    raise TypeError(f"A must be an array, a sparse matrix or a callable, got {type(A).__name__}")
+
+
+def jacobi_preconditioner(A) -> callable:
+    """
+    Jacobi (diagonal) preconditioner M = diag(A).
+
+    Parameters:
+        - A (np.ndarray | scipy.sparse matrix): The matrix.
+
+    Returns:
+        - callable: Function computing M^(-1) r for a vector or an (n, k) block r.
+    """
+    if callable(A):
+        raise TypeError("The Jacobi preconditioner needs the diagonal of A, pass an array or a sparse matrix")
+    inv_diagonal = 1.0 / np.asarray(A.diagonal(), dtype=float)
+
+    def apply(r: np.ndarray) -> np.ndarray:
+        return r * inv_diagonal if r.ndim == 1 else r * inv_diagonal[:, None]
+    return apply
+
+
+def incomplete_cholesky(A) -> sp.csr_matrix:
+    """
+    Zero fill-in incomplete Cholesky factorization IC(0).
+
+    Computes a lower triangular L with the sparsity pattern of the lower triangle
+    of A such that L @ L.T approximates A.
+
+    Parameters:
+        - A (np.ndarray | scipy.sparse matrix): Symmetric positive definite matrix.
+
+    Returns:
+        - scipy.sparse.csr_matrix: The factor L.
+    """
+    lower = sp.tril(sp.csr_matrix(A, dtype=float), format="csr")
+    lower.sort_indices()
+    n = lower.shape[0]
+    indptr, indices, data = lower.indptr, lower.indices, lower.data.copy()
+
+    # rows[i] maps column -> position in data for the already factorized row i.
+    rows = []
+    for i in range(n):
+        start, end = indptr[i], indptr[i + 1]
+        row = dict(zip(indices[start:end], range(start, end)))
+        for position in range(start, end):
+            k = indices[position]
+            # Sum of L[i, j] * L[k, j] over the common pattern with j < k.
+            if k < i:
+                row_k = rows[k]
+                total = sum(data[row[j]] * data[row_k[j]] for j in row if j < k and j in row_k)
+                data[position] = (data[position] - total) / data[row_k[k]]
+            else:
+                total = sum(data[row[j]] ** 2 for j in row if j < i)
+                pivot = data[position] - total
+                if pivot <= 0:
+                    raise np.linalg.LinAlgError(f"Incomplete Cholesky broke down at row {i}")
+                data[position] = np.sqrt(pivot)
+        if i not in row:
+            raise np.linalg.LinAlgError(f"Incomplete Cholesky needs a nonzero diagonal, row {i} has none")
+        rows.append(row)
+    return sp.csr_matrix((data, indices, indptr), shape=lower.shape)
+
+
+def incomplete_cholesky_preconditioner(A) -> callable:
+    """
+    Incomplete Cholesky preconditioner M = L @ L.T with L = incomplete_cholesky(A).
+
+    Parameters:
+        - A (np.ndarray | scipy.sparse matrix): Symmetric positive definite matrix.
+
+    Returns:
+        - callable: Function computing M^(-1) r for a vector or an (n, k) block r.
+    """
+    L = incomplete_cholesky(A)
+    L_T = L.T.tocsr()
+
+    def apply(r: np.ndarray) -> np.ndarray:
+        y = spsolve_triangular(L, r, lower=True)
+        return spsolve_triangular(L_T, y, lower=False)
+    return apply
+
+
+PRECONDITIONERS = {"jacobi": jacobi_preconditioner, "ichol": incomplete_cholesky_preconditioner}
+
+
+def conjugate_gradient(A, b: np.ndarray, x_0: np.ndarray = None, tol: float = 1e-8, max_iterations: int = None,
+                       preconditioner=None) -> tuple:
+    """
+    Preconditioned Conjugate Gradient Method to solve Ax = b for a symmetric positive definite A.
+
+    A block of k right-hand sides is solved as k independent CG iterations that
+    share one mat-vec call per iteration. Columns that reached the tolerance are
+    dropped from the block.
+
+    Parameters:
+        - A (np.ndarray | scipy.sparse matrix | callable): The matrix. A callable must accept
+          an (n, k) block when b is a block.
+        - b (np.ndarray): Right-hand side, a vector of length n or an (n, k) block.
+        - x_0 (np.ndarray): Initial guess with the shape of b, zero by default.
+        - tol (float): Stop once |b - Ax| <= tol * |b| (per column).
+        - max_iterations (int): Maximum number of iterations, 10 * n by default.
+        - preconditioner (str | callable): None, "jacobi", "ichol" or a callable computing M^(-1) r, r has
+          the shape of b (a vector of length n or an (n, j) block of the columns that did not converge yet).
+
+    Returns:
+        - tuple: (x, iterations), the approximate solution with the shape of b and the
+          number of iterations (an array with one entry per column for a block).
+    """
+    single = np.ndim(b) == 1
+    B = np.asarray(b, dtype=float).reshape(len(b), -1)
+    n, k = B.shape
+
+    matvec = as_matvec(A)
+    if single:
+        vector_matvec = matvec
+        matvec = lambda X: vector_matvec(X[:, 0])[:, None]
+    if isinstance(preconditioner, str):
+        preconditioner = PRECONDITIONERS[preconditioner](A)
+    elif single and preconditioner is not None:
+        # A callable gets vectors like b, the empty block of a converged column is passed through.
+        vector_preconditioner = preconditioner
+        preconditioner = lambda R: vector_preconditioner(R[:, 0])[:, None] if R.shape[1] else R
+    if max_iterations is None:
+        max_iterations = 10 * n
+
+    if x_0 is None:
+        X = np.zeros((n, k))
+        R = B.copy()
+    else:
+        X = np.array(x_0, dtype=float).reshape(n, k)
+        R = B - matvec(X)
+    Z = R if preconditioner is None else preconditioner(R)
+    P = Z.copy()
+    rz = np.einsum("ij,ij->j", R, Z)
+
+    b_norms = np.linalg.norm(B, axis=0)
+    b_norms[b_norms == 0] = 1.0
+    iterations = np.zeros(k, dtype=int)
+    active = np.flatnonzero(np.linalg.norm(R, axis=0) > tol * b_norms)
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+        P_active = P[:, active]
+        AP = matvec(P_active)
+        alpha = rz[active] / np.einsum("ij,ij->j", P_active, AP)
+        X[:, active] += alpha * P_active
+        R_active = R[:, active] - alpha * AP
+        R[:, active] = R_active
+        iterations[active] += 1
+
+        # Drop converged columns before preparing the next search direction.
+        moving = np.linalg.norm(R_active, axis=0) > tol * b_norms[active]
+        active, P_active, R_active = active[moving], P_active[:, moving], R_active[:, moving]
+        Z_active = R_active if preconditioner is None else preconditioner(R_active)
+        rz_new = np.einsum("ij,ij->j", R_active, Z_active)
+        P[:, active] = Z_active + (rz_new / rz[active]) * P_active
+        rz[active] = rz_new
+
+    if single:
+        return X[:, 0], int(iterations[0])
+    return X, iterations
 
 
 def conjugate_gradient_method(x_0: np.array, b: np.array, max_iterations: int) -> np.ndarray:
@@ -52,17 +244,8 @@ def conjugate_gradient_method(x_0: np.array, b: np.array, max_iterations: int) -
 
     Returns:
         - np.ndarray: Approximate solution to the linear system.
-    """ 
-    x = x_0
-    r = b - A(x)
-    p = r
-    for _ in range(max_iterations):
-        alpha = np.dot(r, r) / np.dot(p, A(p))
-        x = x + alpha * p
-        r_new = r - alpha * A(p)
-        beta = np.dot(r_new, r_new) / np.dot(r, r)
-        p = r_new + beta * p
-        r = r_new
+    """
+    x, _ = conjugate_gradient(A, b, x_0, tol=0.0, max_iterations=max_iterations)
     return x
 
 
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from conjugate_gradient import conjugate_gradient, conjugate_gradient_method, incomplete_cholesky
+
+
+def poisson_2d(m):
+    # 5-point Laplacian on an m x m grid, SPD with n = m².
+    T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    I = sp.identity(m)
+    return (sp.kron(I, T) + sp.kron(T, I)).tocsr()
+
+
+def test_method_2x2():
+    x = conjugate_gradient_method(np.array([2, 1]), np.array([1, 2]), 10)
+    assert np.allclose(np.array([[4, 1], [1, 3]]) @ x, [1, 2])
+
+
+@pytest.mark.parametrize("preconditioner", [None, "jacobi", "ichol"])
+def test_sparse(preconditioner):
+    A = poisson_2d(20)
+    b = np.ones(A.shape[0])
+    x, iterations = conjugate_gradient(A, b, tol=1e-10, preconditioner=preconditioner)
+    assert np.linalg.norm(b - A @ x) <= 1e-10 * np.linalg.norm(b)
+    assert iterations < A.shape[0]
+
+
+def test_callable_preconditioner_on_vector():
+    d = np.linspace(1, 1000, 200)
+    A = sp.diags([d], [0]) + sp.diags([0.1 * np.ones(199)] * 2, [-1, 1])
+    b = np.ones(200)
+    shapes = []
+
+    def jacobi(r):
+        shapes.append(r.shape)
+        return r / d
+
+    x, iterations = conjugate_gradient(A, b, tol=1e-10, preconditioner=jacobi)
+    assert np.linalg.norm(b - A @ x) <= 1e-10 * np.linalg.norm(b)
+    assert set(shapes) == {(200,)}
+    assert iterations < conjugate_gradient(A, b, tol=1e-10)[1]
+
+
+def test_ichol_reduces_iterations():
+    A = poisson_2d(30)
+    b = np.ones(A.shape[0])
+    _, plain = conjugate_gradient(A, b, tol=1e-8)
+    _, preconditioned = conjugate_gradient(A, b, tol=1e-8, preconditioner="ichol")
+    assert preconditioned < plain
+
+
+def test_ichol_is_exact_for_tridiagonal():
+    A = sp.diags([-1.0, 4.0, -1.0], [-1, 0, 1], shape=(50, 50), format="csr")
+    L = incomplete_cholesky(A)
+    assert np.allclose((L @ L.T).toarray(), A.toarray())
+
+
+def test_one_matvec_per_iteration():
+    A = poisson_2d(10).toarray()
+    calls = []
+
+    def matvec(x):
+        calls.append(1)
+        return A @ x
+    _, iterations = conjugate_gradient(matvec, np.ones(100), tol=1e-10)
+    assert len(calls) == iterations
+
+
+def test_block_of_right_hand_sides():
+    A = poisson_2d(15)
+    B = np.random.default_rng(0).normal(size=(A.shape[0], 4))
+    B[:, 2] = 0
+    X, iterations = conjugate_gradient(A, B, tol=1e-10, preconditioner="jacobi")
+    assert X.shape == B.shape
+    assert iterations[2] == 0
+    for j in range(4):
+        x, _ = conjugate_gradient(A, B[:, j], tol=1e-10, preconditioner="jacobi")
+        assert np.allclose(X[:, j], x)
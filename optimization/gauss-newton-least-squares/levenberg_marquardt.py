@@ -0,0 +1,152 @@
+"""
+Batched Levenberg-Marquardt for many independent least-squares problems.
+
+M series y[i] are fitted at once. The parameters are stored as an (M, p) array,
+the normal matrices as an (M, p, p) array and every series has its own damping
+factor and convergence flag, so one NumPy step per iteration advances all fits.
+
+A model is a pair of batched functions:
+- f(x, params) maps x (n,) or (M, n) and params (M, p) to predictions (M, n).
+- jacobian(x, params) returns the Jacobian with respect to the parameters (M, n, p).
+
+model_from_functions builds such a model from the f(x, a, b) and f_grad(x, a, b)
+functions the least-squares modules define.
+
+Missing observations can be marked with NaN in y, they are ignored.
+
+Example:
+    model = model_from_functions(f, f_grad)
+    params, converged, iterations = levenberg_marquardt(model, x, Y, np.tile([5.0, 1.0], (len(Y), 1)), 1e-8, 100)
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Model(NamedTuple):
+    f: callable
+    jacobian: callable
+
+
+def model_from_functions(f, f_grad) -> Model:
+    """
+    Build a batched model from scalar-parameter functions f(x, *params) and f_grad(x, *params).
+
+    The parameter columns are passed as (M, 1) arrays, so f and f_grad only need
+    to broadcast like NumPy expressions.
+
+    Parameters:
+    - f (callable): f(x, *params) -> predictions.
+    - f_grad (callable): f_grad(x, *params) -> tuple with one partial derivative per parameter.
+
+    Returns:
+    Model: The batched model.
+    """
+    def columns(params: np.ndarray) -> list:
+        return [params[:, j, None] for j in range(params.shape[1])]
+
+    def batched_f(x: np.ndarray, params: np.ndarray) -> np.ndarray:
+        return np.broadcast_to(f(x, *columns(params)), (len(params), np.shape(x)[-1]))
+
+    def batched_jacobian(x: np.ndarray, params: np.ndarray) -> np.ndarray:
+        shape = (len(params), np.shape(x)[-1])
+        return np.stack([np.broadcast_to(grad, shape) for grad in f_grad(x, *columns(params))], axis=-1)
+
+    return Model(batched_f, batched_jacobian)
+
+
+def levenberg_marquardt(model: Model, x: np.ndarray, y: np.ndarray, params0: np.ndarray, tol: float, max_iter: int,
+                        damping: float = 1e-3, increase: float = 2.0, decrease: float = 3.0,
+                        max_damping: float = 1e16) -> tuple:
+    """
+    Fit M independent series with Levenberg-Marquardt.
+
+    The step solves (J^T J + damping * diag(J^T J)) delta = J^T r. A step that
+    reduces the sum of squared residuals is accepted and the damping is divided
+    by `decrease`, otherwise the step is rejected and the damping is multiplied
+    by `increase`. The normal equations of a series are only rebuilt after an
+    accepted step.
+
+    Parameters:
+    - model (Model): Batched model function and Jacobian.
+    - x (np.ndarray): Independent variable, shared (n,) or per series (M, n).
+    - y (np.ndarray): Observed values (M, n), NaN marks a missing value.
+    - params0 (np.ndarray): Initial parameters (M, p) or (p,) for all series.
+    - tol (float): A series converged once an accepted step has |delta| < tol * (|params| + tol).
+    - max_iter (int): Maximum number of iterations.
+    - damping (float): Initial damping factor.
+    - increase (float): Damping factor after a rejected step is multiplied by this.
+    - decrease (float): Damping factor after an accepted step is divided by this.
+    - max_damping (float): A series whose damping exceeds this is stopped (not converged).
+
+    Returns:
+    tuple: (params, converged, iterations) with shapes (M, p), (M,) and (M,).
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    M = y.shape[0]
+    params = np.array(np.broadcast_to(params0, (M, np.shape(params0)[-1])), dtype=float)
+    p = params.shape[1]
+    x = np.asarray(x, dtype=float)
+    shared_x = x.ndim == 1
+
+    valid = ~np.isnan(y)
+    observed = valid.any(axis=1)
+    y = np.where(valid, y, 0.0)
+
+    def rows(idx: np.ndarray) -> np.ndarray:
+        return x if shared_x else x[idx]
+
+    def residuals(idx: np.ndarray, trial: np.ndarray) -> np.ndarray:
+        return np.where(valid[idx], y[idx] - model.f(rows(idx), trial), 0.0)
+
+    everything = np.arange(M)
+    r = residuals(everything, params)
+    cost = np.einsum("mn,mn->m", r, r)
+    lam = np.full(M, damping)
+    JtJ = np.zeros((M, p, p))
+    Jtr = np.zeros((M, p))
+    stale = np.ones(M, dtype=bool)
+    converged = np.zeros(M, dtype=bool)
+    active = np.ones(M, dtype=bool)
+    iterations = np.zeros(M, dtype=int)
+
+    for _ in range(max_iter):
+        # Rebuild the normal equations only where the parameters changed.
+        rebuild = np.flatnonzero(active & stale)
+        if rebuild.size:
+            jac = model.jacobian(rows(rebuild), params[rebuild]) * valid[rebuild, :, None]
+            JtJ[rebuild] = np.einsum("mni,mnj->mij", jac, jac)
+            Jtr[rebuild] = np.einsum("mni,mn->mi", jac, r[rebuild])
+            stale[rebuild] = False
+
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        diagonal = np.maximum(np.diagonal(JtJ[idx], axis1=1, axis2=2), 1e-12)
+        A = JtJ[idx] + (lam[idx, None] * diagonal)[:, :, None] * np.eye(p)
+        delta = np.linalg.solve(A, Jtr[idx, :, None])[:, :, 0]
+        trial = params[idx] + delta
+        r_trial = residuals(idx, trial)
+        cost_trial = np.einsum("mn,mn->m", r_trial, r_trial)
+        iterations[idx] += 1
+
+        accept = cost_trial < cost[idx]
+        accepted, rejected = idx[accept], idx[~accept]
+        params[accepted] = trial[accept]
+        r[accepted] = r_trial[accept]
+        cost[accepted] = cost_trial[accept]
+        stale[accepted] = True
+        lam[accepted] /= decrease
+        lam[rejected] *= increase
+
+        # A series converged once an accepted step is small relative to its parameters, or when it fits its
+        # observations exactly (no step can reduce the cost any more). Small rejected steps only mean that the
+        # damping grew, those series stop at max_damping without converging.
+        small = np.linalg.norm(delta, axis=1) < tol * (np.linalg.norm(params[idx], axis=1) + tol)
+        exact = (cost[idx] == 0) & observed[idx]
+        done = idx[(small & accept & np.isfinite(cost_trial)) | exact]
+        converged[done] = True
+        active[done] = False
+        active[rejected[lam[rejected] > max_damping]] = False
+
+    return params, converged, iterations
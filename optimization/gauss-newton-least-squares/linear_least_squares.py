@@ -1,6 +1,8 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from levenberg_marquardt import levenberg_marquardt, model_from_functions
+from normal_equations import gauss_newton_streaming, solve_normal_equations
+
 
 def f(x: np.ndarray, m: float, b: float) -> float:
     """
@@ -66,6 +68,10 @@ def jacobian(x: np.ndarray, m: float, b: float):
     return np.column_stack([grad[0], grad[1]])
 
 
+# Batched model for levenberg_marquardt, parameters are the columns of an (M, 2) array.
+MODEL = model_from_functions(f, f_grad)
+
+
 def gauss_newton(x: np.ndarray, y: np.ndarray, m0: float, b0: float, tol: float, max_iter: int):
     """
     Gauss-Newton optimization for linear regression.
@@ -85,13 +91,57 @@ def gauss_newton(x: np.ndarray, y: np.ndarray, m0: float, b0: float, tol: float,
     for _ in range(max_iter):
         jac = jacobian(x, old[0], old[1])
         loss = f_loss(x, old[0], old[1], y)
-        new = old + np.linalg.inv(jac.T@jac)@jac.T@loss
+        new = old + solve_normal_equations(jac.T@jac, jac.T@loss)
         if np.linalg.norm(old-new) < tol:
             break
     return new
 
 
+def gauss_newton_chunked(x, y, m0: float, b0: float, tol: float, max_iter: int, chunk_size: int = 1_000_000,
+                         method: str = "cholesky"):
+    """
+    Gauss-Newton optimization for linear regression on data that does not fit into memory.
+
+    Parameters:
+    - x (array-like | str): Independent variable, array or path to a .npy file.
+    - y (array-like | str): Observed values, array or path to a .npy file.
+    - m0 (float): Initial guess for the slope.
+    - b0 (float): Initial guess for the y-intercept.
+    - tol (float): Tolerance for convergence.
+    - max_iter (int): Maximum number of iterations.
+    - chunk_size (int): Number of observations read at once.
+    - method (str): "cholesky" (normal equations) or "qr" (streaming QR).
+
+    Returns:
+    array-like: Optimized parameters (slope, y-intercept).
+    """
+    return gauss_newton_streaming(jacobian, f_loss, x, y, [m0, b0], tol, max_iter, chunk_size, method)
+
+
+def levenberg_marquardt_batch(x, y, m0, b0, tol: float, max_iter: int):
+    """
+    Levenberg-Marquardt optimization for many independent linear regressions at once.
+
+    Parameters:
+    - x (array-like): Independent variable, shared (n,) or per series (M, n).
+    - y (array-like): Observed values (M, n), NaN marks a missing value.
+    - m0 (float | array-like): Initial guess for the slope, scalar or one per series.
+    - b0 (float | array-like): Initial guess for the y-intercept, scalar or one per series.
+    - tol (float): Tolerance for convergence.
+    - max_iter (int): Maximum number of iterations.
+
+    Returns:
+    tuple: Optimized parameters (slope, y-intercept) per series (M, 2), converged flags (M,) and iterations (M,).
+    """
+    y = np.atleast_2d(y)
+    params0 = np.column_stack(np.broadcast_arrays(np.ravel(m0), np.ravel(b0)))
+    params0 = np.broadcast_to(params0, (len(y), 2))
+    return levenberg_marquardt(MODEL, x, y, params0, tol, max_iter)
+
+
 def main():
+    import matplotlib.pyplot as plt
+
     # Generate data
     x = np.linspace(0, 5, 50)
     y = f(x, 1, 3) + np.random.normal(0, 0.5, size=50)
@@ -1,6 +1,8 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from levenberg_marquardt import levenberg_marquardt, model_from_functions
+from normal_equations import gauss_newton_streaming, solve_normal_equations
+
 
 def f(x: np.ndarray, a: float, b: float):
     """
@@ -76,6 +78,9 @@ def jacobian(x: np.ndarray, a: float, b: float):
     grad = f_grad(x, a, b)
     return np.column_stack([grad[0], grad[1]]) 
 
+# Batched model for levenberg_marquardt, parameters are the columns of an (M, 2) array.
+MODEL = model_from_functions(f, f_grad)
+
 def gauss_newton(x: np.ndarray, y: float, a0: float, b0: float, tol: float, max_iter: int):
     """
     Perform Gauss-Newton optimization for the given function.
@@ -96,17 +101,62 @@ def gauss_newton(x: np.ndarray, y: float, a0: float, b0: float, tol: float, max_
     >>> gauss_newton(x, y, 1, 1, 1e-5, 100)
     array([2., 1.])
     """ 
-    old = new = np.array([a0, b0])
+    old = new = np.array([a0, b0], dtype=float)
     for _ in range(max_iter):
         old = new
         jac = jacobian(x, old[0], old[1])
         loss = f_loss(x, old[0], old[1], y)
-        new = old + np.linalg.inv(jac.T@jac)@jac.T@loss
+        new = old + solve_normal_equations(jac.T@jac, jac.T@loss)
         if np.linalg.norm(old-new) < tol:
             break
     return new
 
+def gauss_newton_chunked(x, y, a0: float, b0: float, tol: float, max_iter: int, chunk_size: int = 1_000_000,
+                         method: str = "cholesky"):
+    """
+    Perform Gauss-Newton optimization on data that does not fit into memory.
+
+    The observations are read chunk by chunk, x and y can be paths to .npy files
+    which are memory-mapped.
+
+    Parameters:
+    - x (np.ndarray | str): Independent variable, array or path to a .npy file.
+    - y (np.ndarray | str): Observed values, array or path to a .npy file.
+    - a0 (float): Initial guess for parameter 'a'.
+    - b0 (float): Initial guess for parameter 'b'.
+    - tol (float): Tolerance for convergence.
+    - max_iter (int): Maximum number of iterations.
+    - chunk_size (int): Number of observations read at once.
+    - method (str): "cholesky" (normal equations) or "qr" (streaming QR).
+
+    Returns:
+    np.ndarray: Optimized parameters 'a' and 'b'.
+    """
+    return gauss_newton_streaming(jacobian, f_loss, x, y, [a0, b0], tol, max_iter, chunk_size, method)
+
+def levenberg_marquardt_batch(x, y, a0, b0, tol: float, max_iter: int):
+    """
+    Fit many independent series at once with damped Gauss-Newton (Levenberg-Marquardt).
+
+    Parameters:
+    - x (np.ndarray): Independent variable, shared (n,) or per series (M, n).
+    - y (np.ndarray): Observed values (M, n), NaN marks a missing value.
+    - a0 (float | np.ndarray): Initial guess for parameter 'a', scalar or one per series.
+    - b0 (float | np.ndarray): Initial guess for parameter 'b', scalar or one per series.
+    - tol (float): Tolerance for convergence.
+    - max_iter (int): Maximum number of iterations.
+
+    Returns:
+    tuple: Optimized parameters 'a' and 'b' per series (M, 2), converged flags (M,) and iterations (M,).
+    """
+    y = np.atleast_2d(y)
+    params0 = np.column_stack(np.broadcast_arrays(np.ravel(a0), np.ravel(b0)))
+    params0 = np.broadcast_to(params0, (len(y), 2))
+    return levenberg_marquardt(MODEL, x, y, params0, tol, max_iter)
+
 def main():
+    import matplotlib.pyplot as plt
+
     # Generate data
     x = np.linspace(0, 5, 50)
     y = f(x, 2, 3) + np.random.normal(0, 0.1, size=50)
@@ -0,0 +1,190 @@
+"""
+Out-of-core Gauss-Newton.
+
+The observations x, y are read in chunks, so they can be memory-mapped .npy
+files that do not fit into memory. Per iteration only the small p x p system is
+kept in memory:
+
+- method="cholesky" accumulates J^T J and J^T r chunk by chunk and solves
+  J^T J delta = J^T r with a Cholesky factorization.
+- method="qr" keeps the triangular factor R of J and Q^T r, updated chunk by
+  chunk with a QR factorization of the stacked [R; J_chunk] (TSQR). It avoids
+  squaring the condition number of J.
+
+The model is given by the same functions the least-squares modules define:
+- jacobian(x, *params) returns the (n, p) Jacobian of the model for the chunk x.
+- f_loss(x, *params, y) returns the residuals y - f(x, *params) for the chunk.
+
+Example:
+    np.save("x.npy", x)
+    np.save("y.npy", y)
+    a, b = gauss_newton_streaming(jacobian, f_loss, "x.npy", "y.npy", [5, 1], 1e-5, 10)
+"""
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+
+
+def load_observations(data) -> np.ndarray:
+    """
+    Open observations without reading them into memory.
+
+    Parameters:
+    - data (np.ndarray | str): Array or path to a .npy file.
+
+    Returns:
+    np.ndarray: The array itself or a read-only memory map of the file.
+    """
+    if isinstance(data, (str, bytes)) or hasattr(data, "__fspath__"):
+        return np.load(data, mmap_mode="r")
+    return data
+
+
+def iter_chunks(x: np.ndarray, y: np.ndarray, chunk_size: int):
+    """
+    Iterate over matching chunks of x and y.
+
+    Parameters:
+    - x (np.ndarray): Independent variable (array or memory map).
+    - y (np.ndarray): Observed values (array or memory map).
+    - chunk_size (int): Number of observations per chunk.
+
+    Yields:
+    tuple: (x_chunk, y_chunk) as float arrays in memory.
+    """
+    if len(x) != len(y):
+        raise ValueError(f"x and y must have the same length, got {len(x)} and {len(y)}")
+    for start in range(0, len(x), chunk_size):
+        stop = start + chunk_size
+        yield np.asarray(x[start:stop], dtype=float), np.asarray(y[start:stop], dtype=float)
+
+
+def accumulate_normal_equations(jacobian, f_loss, x: np.ndarray, y: np.ndarray, params: np.ndarray,
+                                chunk_size: int) -> tuple:
+    """
+    Accumulate J^T J and J^T r over all chunks.
+
+    Parameters:
+    - jacobian (callable): jacobian(x, *params) -> (n, p) array.
+    - f_loss (callable): f_loss(x, *params, y) -> residuals.
+    - x (np.ndarray): Independent variable (array or memory map).
+    - y (np.ndarray): Observed values (array or memory map).
+    - params (np.ndarray): Current parameters.
+    - chunk_size (int): Number of observations per chunk.
+
+    Returns:
+    tuple: (JtJ, Jtr, sum of squared residuals).
+    """
+    p = len(params)
+    JtJ = np.zeros((p, p))
+    Jtr = np.zeros(p)
+    ssr = 0.0
+    for x_chunk, y_chunk in iter_chunks(x, y, chunk_size):
+        jac = jacobian(x_chunk, *params)
+        loss = f_loss(x_chunk, *params, y_chunk)
+        JtJ += jac.T @ jac
+        Jtr += jac.T @ loss
+        ssr += loss @ loss
+    return JtJ, Jtr, ssr
+
+
+def accumulate_qr(jacobian, f_loss, x: np.ndarray, y: np.ndarray, params: np.ndarray, chunk_size: int) -> tuple:
+    """
+    Accumulate the triangular factor R of J and Q^T r over all chunks.
+
+    Parameters:
+    - jacobian (callable): jacobian(x, *params) -> (n, p) array.
+    - f_loss (callable): f_loss(x, *params, y) -> residuals.
+    - x (np.ndarray): Independent variable (array or memory map).
+    - y (np.ndarray): Observed values (array or memory map).
+    - params (np.ndarray): Current parameters.
+    - chunk_size (int): Number of observations per chunk.
+
+    Returns:
+    tuple: (R, Qtr, sum of squared residuals) with J = QR.
+    """
+    p = len(params)
+    R = np.zeros((0, p))
+    Qtr = np.zeros(0)
+    ssr = 0.0
+    for x_chunk, y_chunk in iter_chunks(x, y, chunk_size):
+        jac = jacobian(x_chunk, *params)
+        loss = f_loss(x_chunk, *params, y_chunk)
+        Q, R = np.linalg.qr(np.vstack([R, jac]))
+        Qtr = Q.T @ np.concatenate([Qtr, loss])
+        ssr += loss @ loss
+    return R, Qtr, ssr
+
+
+def solve_normal_equations(JtJ: np.ndarray, Jtr: np.ndarray) -> np.ndarray:
+    """
+    Solve J^T J delta = J^T r with a Cholesky factorization instead of an explicit inverse.
+
+    Falls back to a least-squares solve if J^T J is singular.
+
+    Parameters:
+    - JtJ (np.ndarray): Normal matrix (p, p).
+    - Jtr (np.ndarray): Right-hand side (p,).
+
+    Returns:
+    np.ndarray: The Gauss-Newton step delta.
+    """
+    try:
+        return cho_solve(cho_factor(JtJ), Jtr)
+    except np.linalg.LinAlgError:
+        return np.linalg.lstsq(JtJ, Jtr, rcond=None)[0]
+
+
+def solve_triangular_system(R: np.ndarray, Qtr: np.ndarray) -> np.ndarray:
+    """
+    Solve R delta = Q^T r for the upper triangular factor R of J.
+
+    Falls back to a least-squares solve if R is singular.
+
+    Parameters:
+    - R (np.ndarray): Upper triangular factor (p, p).
+    - Qtr (np.ndarray): Right-hand side (p,).
+
+    Returns:
+    np.ndarray: The Gauss-Newton step delta.
+    """
+    if R.shape[0] < R.shape[1] or np.any(np.diag(R) == 0):
+        return np.linalg.lstsq(R, Qtr, rcond=None)[0]
+    return solve_triangular(R, Qtr)
+
+
+def gauss_newton_streaming(jacobian, f_loss, x, y, params0, tol: float, max_iter: int,
+                           chunk_size: int = 1_000_000, method: str = "cholesky") -> np.ndarray:
+    """
+    Gauss-Newton optimization that reads the observations chunk by chunk.
+
+    Peak memory is bounded by the chunk size and does not depend on len(x).
+
+    Parameters:
+    - jacobian (callable): jacobian(x, *params) -> (n, p) array.
+    - f_loss (callable): f_loss(x, *params, y) -> residuals.
+    - x (np.ndarray | str): Independent variable, array or path to a .npy file.
+    - y (np.ndarray | str): Observed values, array or path to a .npy file.
+    - params0 (array-like): Initial parameters.
+    - tol (float): Tolerance for convergence.
+    - max_iter (int): Maximum number of iterations.
+    - chunk_size (int): Number of observations per chunk.
+    - method (str): "cholesky" (normal equations) or "qr" (streaming QR).
+
+    Returns:
+    np.ndarray: Optimized parameters.
+    """
+    if method not in ("cholesky", "qr"):
+        raise ValueError(f"method must be 'cholesky' or 'qr', got {method!r}")
+    x, y = load_observations(x), load_observations(y)
+    new = np.asarray(params0, dtype=float)
+    for _ in range(max_iter):
+        old = new
+        if method == "cholesky":
+            JtJ, Jtr, _ = accumulate_normal_equations(jacobian, f_loss, x, y, old, chunk_size)
+            new = old + solve_normal_equations(JtJ, Jtr)
+        else:
+            R, Qtr, _ = accumulate_qr(jacobian, f_loss, x, y, old, chunk_size)
+            new = old + solve_triangular_system(R, Qtr)
+        if np.linalg.norm(old - new) < tol:
+            break
+    return new
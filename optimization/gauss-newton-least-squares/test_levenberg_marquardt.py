@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import linear_least_squares
+import non_linear_least_squares
+from levenberg_marquardt import levenberg_marquardt, model_from_functions
+
+
+def test_non_linear_batch():
+    # Grid of starts, undamped Gauss-Newton diverges from some of them.
+    x = np.linspace(0.1, 5, 50)
+    a0, b0 = np.meshgrid(np.linspace(1, 10, 10), np.linspace(0.5, 8, 10))
+    y = np.tile(non_linear_least_squares.f(x, 2, 3), (100, 1))
+    params, converged, iterations = non_linear_least_squares.levenberg_marquardt_batch(x, y, a0.ravel(), b0.ravel(),
+                                                                                       1e-10, 200)
+    assert params.shape == (100, 2)
+    assert converged.all()
+    assert np.allclose(params, [2, 3])
+
+
+def test_per_series_x():
+    rng = np.random.default_rng(0)
+    true = np.column_stack([rng.uniform(1, 5, 30), rng.uniform(1, 4, 30)])
+    x = rng.uniform(0.1, 10, size=(30, 40))
+    y = non_linear_least_squares.f(x, true[:, 0, None], true[:, 1, None])
+    params, converged, _ = non_linear_least_squares.levenberg_marquardt_batch(x, y, true[:, 0] * 1.5, 2, 1e-10, 200)
+    assert converged.all()
+    assert np.allclose(params, true)
+
+
+def test_matches_single_gauss_newton():
+    x = np.linspace(0.1, 5, 50)
+    y = non_linear_least_squares.f(x, 2, 3) + np.random.default_rng(1).normal(0, 0.1, size=50)
+    expected = non_linear_least_squares.gauss_newton(x, y, 2.5, 2.5, 1e-12, 100)
+    params, converged, _ = non_linear_least_squares.levenberg_marquardt_batch(x, y, 2.5, 2.5, 1e-12, 100)
+    assert converged[0]
+    assert np.allclose(params[0], expected, rtol=1e-6)
+
+
+def test_linear_with_missing_values():
+    x = np.linspace(0, 5, 20)
+    y = np.vstack([linear_least_squares.f(x, 1, 3), linear_least_squares.f(x, -2, 0.5)])
+    y[0, ::3] = np.nan
+    params, converged, _ = linear_least_squares.levenberg_marquardt_batch(x, y, 0, 0, 1e-10, 100)
+    assert converged.all()
+    assert np.allclose(params, [[1, 3], [-2, 0.5]])
+
+
+def test_stalled_and_empty_series_do_not_converge():
+    # With the wrong sign of the Jacobian every step is rejected until the damping exceeds max_damping.
+    wrong = model_from_functions(linear_least_squares.f, lambda x, m, b: (-x, -np.ones_like(x)))
+    x = np.linspace(0, 5, 20)
+    y = linear_least_squares.f(x, 1, 3)[None]
+    params, converged, iterations = levenberg_marquardt(wrong, x, y, [0.0, 0.0], 1e-10, 500)
+    assert not converged[0] and iterations[0] < 500
+    assert np.array_equal(params[0], [0, 0])
+    y = np.vstack([linear_least_squares.f(x, 1, 3), np.full(20, np.nan)])
+    params, converged, _ = linear_least_squares.levenberg_marquardt_batch(x, y, 0, 0, 1e-10, 500)
+    assert converged.tolist() == [True, False]
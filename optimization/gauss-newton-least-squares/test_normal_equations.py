@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+import linear_least_squares
+import non_linear_least_squares
+
+
+@pytest.mark.parametrize("method", ["cholesky", "qr"])
+def test_chunked_matches_in_memory(tmp_path, method):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0.1, 5, 10_001)
+    y = non_linear_least_squares.f(x, 2, 3) + rng.normal(0, 0.1, size=x.size)
+    np.save(tmp_path / "x.npy", x)
+    np.save(tmp_path / "y.npy", y)
+
+    expected = non_linear_least_squares.gauss_newton(x, y, 5, 1, 1e-10, 50)
+    result = non_linear_least_squares.gauss_newton_chunked(tmp_path / "x.npy", tmp_path / "y.npy", 5, 1, 1e-10, 50,
+                                                           chunk_size=999, method=method)
+    assert np.allclose(result, expected)
+    assert np.allclose(result, [2, 3], atol=0.1)
+
+
+@pytest.mark.parametrize("method", ["cholesky", "qr"])
+def test_linear_chunked(method):
+    x = np.linspace(0, 5, 1000)
+    y = linear_least_squares.f(x, 1.5, 3)
+    m, b = linear_least_squares.gauss_newton_chunked(x, y, 1, 1, 1e-10, 10, chunk_size=7, method=method)
+    assert np.isclose(m, 1.5)
+    assert np.isclose(b, 3)
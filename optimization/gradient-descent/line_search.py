@@ -0,0 +1,242 @@
+"""
+Line search for descent methods on vectors of arbitrary dimension.
+
+An Objective wraps f and its gradient and counts how often each one is
+evaluated. The line searches evaluate f (and for Wolfe the gradient) at most
+once per trial point and return the value and gradient of the accepted point,
+so the next outer iteration can reuse them instead of evaluating again.
+
+Both line searches remember the last accepted step size and use it to
+warm-start the next search instead of resetting tau = 1.
+
+Example:
+    objective = Objective(f, f_grad)
+    x, fx, gx, iterations = minimize(objective, np.array([1.0, 1.0]), ArmijoLineSearch(), 100)
+    print(objective.n_f, objective.n_grad)
+"""
+import numpy as np
+
+from stopping import Monitor
+
+
+class Objective:
+    """
+    Function f: R^d -> R together with its gradient, with evaluation counters.
+    """
+
+    def __init__(self, f, f_grad) -> None:
+        self.f = f
+        self.f_grad = f_grad
+        self.n_f = 0
+        self.n_grad = 0
+
+    def value(self, x: np.ndarray) -> float:
+        self.n_f += 1
+        return self.f(x)
+
+    def gradient(self, x: np.ndarray) -> np.ndarray:
+        self.n_grad += 1
+        return np.asarray(self.f_grad(x), dtype=float)
+
+    def reset_counters(self) -> None:
+        self.n_f = 0
+        self.n_grad = 0
+
+
+class ArmijoLineSearch:
+    """
+    Backtracking line search with the Armijo condition
+
+        f(x + tau * d) - f(x) <= eps * tau * grad f(x)^T d
+
+    The first trial step is the last accepted step divided by beta (capped at
+    tau_max), so the step size can grow back after a short step.
+    """
+
+    def __init__(self, eps: float = 1e-4, beta: float = 0.5, tau_max: float = 1.0, min_tau: float = 1e-20,
+                 warm_start: bool = True) -> None:
+        self.eps = eps
+        self.beta = beta
+        self.tau_max = tau_max
+        self.min_tau = min_tau
+        self.warm_start = warm_start
+        self.tau = None
+
+    def initial_step(self) -> float:
+        if self.warm_start and self.tau:
+            return min(self.tau_max, self.tau / self.beta)
+        return self.tau_max
+
+    def search(self, objective: Objective, x: np.ndarray, fx: float, gx: np.ndarray, d: np.ndarray) -> tuple:
+        """
+        Find a step size along the descent direction d.
+
+        Parameters:
+        - objective (Objective): Function and gradient.
+        - x (np.ndarray): Current point.
+        - fx (float): f(x), already known by the caller.
+        - gx (np.ndarray): grad f(x), already known by the caller.
+        - d (np.ndarray): Descent direction.
+
+        Returns:
+        tuple: (tau, x_new, f_new, g_new). If no step satisfies the condition,
+        tau is 0 and the current point is returned.
+        """
+        slope = np.dot(gx, d)
+        tau = self.initial_step()
+        while tau >= self.min_tau:
+            x_new = x + tau * d
+            f_new = objective.value(x_new)
+            if f_new - fx <= self.eps * tau * slope:
+                self.tau = tau
+                return tau, x_new, f_new, objective.gradient(x_new)
+            tau = self.beta * tau
+        return 0.0, x, fx, gx
+
+
+class WolfeLineSearch:
+    """
+    Line search for the strong Wolfe conditions
+
+        f(x + tau * d) <= f(x) + c1 * tau * grad f(x)^T d
+        |grad f(x + tau * d)^T d| <= c2 * |grad f(x)^T d|
+
+    Uses the bracketing and zoom phases from Nocedal & Wright (Algorithms 3.5
+    and 3.6) with safeguarded quadratic interpolation. The first trial step is
+    the last accepted step.
+    """
+
+    def __init__(self, c1: float = 1e-4, c2: float = 0.9, tau_init: float = 1.0, tau_max: float = 1e10,
+                 max_iterations: int = 50, warm_start: bool = True) -> None:
+        self.c1 = c1
+        self.c2 = c2
+        self.tau_init = tau_init
+        self.tau_max = tau_max
+        self.max_iterations = max_iterations
+        self.warm_start = warm_start
+        self.tau = None
+
+    def initial_step(self) -> float:
+        if self.warm_start and self.tau:
+            return self.tau
+        return self.tau_init
+
+    def search(self, objective: Objective, x: np.ndarray, fx: float, gx: np.ndarray, d: np.ndarray) -> tuple:
+        """
+        Find a step size along the descent direction d.
+
+        Parameters:
+        - objective (Objective): Function and gradient.
+        - x (np.ndarray): Current point.
+        - fx (float): f(x), already known by the caller.
+        - gx (np.ndarray): grad f(x), already known by the caller.
+        - d (np.ndarray): Descent direction.
+
+        Returns:
+        tuple: (tau, x_new, f_new, g_new). If the search fails, tau is 0 and
+        the current point is returned.
+        """
+        slope0 = np.dot(gx, d)
+        # Bracket end points are (tau, f, grad, slope), grad is None if not evaluated.
+        prev = (0.0, fx, gx, slope0)
+        tau = self.initial_step()
+        for i in range(self.max_iterations):
+            x_new = x + tau * d
+            f_new = objective.value(x_new)
+            if f_new > fx + self.c1 * tau * slope0 or (i > 0 and f_new >= prev[1]):
+                return self._zoom(objective, x, fx, slope0, d, prev, (tau, f_new, None, None))
+
+            g_new = objective.gradient(x_new)
+            slope = np.dot(g_new, d)
+            if abs(slope) <= -self.c2 * slope0:
+                return self._accept(tau, x_new, f_new, g_new)
+            if slope >= 0:
+                return self._zoom(objective, x, fx, slope0, d, (tau, f_new, g_new, slope), prev)
+
+            prev = (tau, f_new, g_new, slope)
+            tau = min(2 * tau, self.tau_max)
+        return 0.0, x, fx, gx
+
+    def _zoom(self, objective: Objective, x: np.ndarray, fx: float, slope0: float, d: np.ndarray,
+              lo: tuple, hi: tuple) -> tuple:
+        """
+        Shrink the bracket [lo, hi] until a step satisfies the strong Wolfe conditions.
+
+        The lower end point always has a known gradient, the upper one only its
+        function value is needed.
+        """
+        for _ in range(self.max_iterations):
+            tau = self._interpolate(lo, hi)
+            x_new = x + tau * d
+            f_new = objective.value(x_new)
+            if f_new > fx + self.c1 * tau * slope0 or f_new >= lo[1]:
+                hi = (tau, f_new, None, None)
+                continue
+
+            g_new = objective.gradient(x_new)
+            slope = np.dot(g_new, d)
+            if abs(slope) <= -self.c2 * slope0:
+                return self._accept(tau, x_new, f_new, g_new)
+            if slope * (hi[0] - lo[0]) >= 0:
+                hi = lo
+            lo = (tau, f_new, g_new, slope)
+
+        # No Wolfe point found, fall back to the best point with sufficient decrease.
+        if lo[0] > 0:
+            return self._accept(lo[0], x + lo[0] * d, lo[1], lo[2])
+        return 0.0, x, fx, lo[2]
+
+    @staticmethod
+    def _interpolate(lo: tuple, hi: tuple) -> float:
+        """
+        Minimizer of the quadratic through f(lo), f'(lo) and f(hi), kept away from the bracket ends.
+        """
+        tau_lo, f_lo, _, slope_lo = lo
+        tau_hi, f_hi = hi[0], hi[1]
+        delta = tau_hi - tau_lo
+        denominator = 2 * (f_hi - f_lo - slope_lo * delta)
+        tau = tau_lo - slope_lo * delta ** 2 / denominator if denominator != 0 else np.nan
+        low, high = sorted((tau_lo + 0.1 * delta, tau_hi - 0.1 * delta))
+        if not low <= tau <= high:
+            tau = tau_lo + 0.5 * delta
+        return tau
+
+    def _accept(self, tau: float, x_new: np.ndarray, f_new: float, g_new: np.ndarray) -> tuple:
+        self.tau = tau
+        return tau, x_new, f_new, g_new
+
+
+def minimize(objective: Objective, x0: np.ndarray, line_search, max_iterations: int, tol: float = 0.0, stop=None,
+             callback=None) -> tuple:
+    """
+    Gradient descent where every step size comes from a line search.
+
+    f and grad f are evaluated once at the start point, afterwards only the
+    line search evaluates them and its accepted point is reused.
+
+    Parameters:
+    - objective (Objective): Function and gradient.
+    - x0 (np.ndarray): Start point.
+    - line_search (ArmijoLineSearch | WolfeLineSearch): Step size rule.
+    - max_iterations (int): Number of maximal iterations.
+    - tol (float): Stop once the gradient norm is <= tol.
+    - stop (Criterion): Additional stopping criterion, by default only an exactly zero gradient or step (see
+      stopping.DEFAULT).
+    - callback (callable): Called with the IterationState after every iteration.
+
+    Returns:
+    tuple: (x, f(x), grad f(x), iterations).
+    """
+    x = np.asarray(x0, dtype=float)
+    fx = objective.value(x)
+    gx = objective.gradient(x)
+    iterations = 0
+    monitor = Monitor(stop, callback)
+    monitor.start()
+    while iterations < max_iterations and np.linalg.norm(gx) > tol:
+        x_old, fx_old = x, fx
+        tau, x, fx, gx = line_search.search(objective, x, fx, gx, -gx)
+        iterations += 1
+        if tau == 0 or monitor.update(iterations, x, fx, gx, x_old, fx_old, objective.n_f, objective.n_grad):
+            break
+    return x, fx, gx, iterations
@@ -0,0 +1,138 @@
+"""
+Multi-start gradient descent.
+
+Runs gradient descent from N start points at once. The start points are stored
+as the rows of an (N, d) array and every iteration advances all of them with a
+single NumPy step. Starts whose gradient norm drops below `tol` are masked out,
+so converged starts stop costing function and gradient evaluations.
+
+The objective callables work on rows:
+- f(points) maps an (k, d) array to an array of k function values.
+- f_grad(points) maps an (k, d) array to an (k, d) array of gradients.
+
+Example:
+    starts = np.random.uniform(-10, 10, size=(1000, 2))
+    optima, iterations, grad_norms = optimize_with_backtracking(f, f_grad, starts, 1e-4, 0.5, 100)
+"""
+import numpy as np
+
+
+def _as_points(starts: np.ndarray) -> np.ndarray:
+    """
+    Copy the start points into a float (N, d) array.
+
+    Parameters:
+    - starts (np.ndarray): Start points with shape (N, d) or (N,) for d = 1.
+
+    Returns:
+    np.ndarray: Float array with shape (N, d).
+    """
+    points = np.array(starts, dtype=float)
+    if points.ndim == 1:
+        points = points[:, None]
+    if points.ndim != 2:
+        raise ValueError(f"starts must have shape (N, d) or (N,), got {points.shape}")
+    return points
+
+
+def optimize_without_backtracking(f_grad, starts: np.ndarray, tau: float, max_iterations: int,
+                                  tol: float = 1e-8) -> tuple:
+    """
+    Perform gradient descent with a fixed step size from many start points.
+
+    Parameters:
+    - f_grad (callable): Gradient, maps (k, d) points to (k, d) gradients.
+    - starts (np.ndarray): Start points with shape (N, d).
+    - tau (float): Learning rate.
+    - max_iterations (int): Number of maximal iterations.
+    - tol (float): A start converged once its gradient norm is <= tol.
+
+    Returns:
+    tuple: (optima, iterations, grad_norms) with shapes (N, d), (N,) and (N,).
+    """
+    x = _as_points(starts)
+    n = x.shape[0]
+    iterations = np.zeros(n, dtype=int)
+    grad_norms = np.empty(n)
+
+    active = np.arange(n)
+    grad = f_grad(x)
+    for _ in range(max_iterations):
+        norms = np.linalg.norm(grad, axis=1)
+        grad_norms[active] = norms
+
+        # Drop converged starts from the working set.
+        moving = norms > tol
+        active, grad = active[moving], grad[moving]
+        if active.size == 0:
+            break
+
+        x[active] -= tau * grad
+        iterations[active] += 1
+        grad = f_grad(x[active])
+
+    grad_norms[active] = np.linalg.norm(grad, axis=1)
+    return x, iterations, grad_norms
+
+
+def optimize_with_backtracking(f, f_grad, starts: np.ndarray, eps: float, beta: float, max_iterations: int,
+                               tol: float = 1e-8) -> tuple:
+    """
+    Perform gradient descent with backtracking line search from many start points.
+
+    Every start has its own step size. The Armijo condition
+    f(x - tau * grad) - f(x) <= -eps * tau * |grad|² is tested for all starts at
+    once and only the starts that violate it are shrunk and re-evaluated.
+
+    Parameters:
+    - f (callable): Function, maps (k, d) points to k values.
+    - f_grad (callable): Gradient, maps (k, d) points to (k, d) gradients.
+    - starts (np.ndarray): Start points with shape (N, d).
+    - eps (float): Epsilon for armijo condition.
+    - beta (float): Backtracking parameter.
+    - max_iterations (int): Number of maximal iterations.
+    - tol (float): A start converged once its gradient norm is <= tol.
+
+    Returns:
+    tuple: (optima, iterations, grad_norms) with shapes (N, d), (N,) and (N,).
+    """
+    x = _as_points(starts)
+    n = x.shape[0]
+    iterations = np.zeros(n, dtype=int)
+    grad_norms = np.empty(n)
+
+    active = np.arange(n)
+    fx = f(x)
+    grad = f_grad(x)
+    for _ in range(max_iterations):
+        norms = np.linalg.norm(grad, axis=1)
+        grad_norms[active] = norms
+
+        # Drop converged starts from the working set.
+        moving = norms > tol
+        active, fx, grad, norms = active[moving], fx[moving], grad[moving], norms[moving]
+        if active.size == 0:
+            break
+
+        # Backtracking line search, only failing starts are shrunk and re-evaluated.
+        x_active = x[active]
+        decrease = eps * norms ** 2
+        tau = np.ones(active.size)
+        trial = x_active - grad
+        f_trial = f(trial)
+        # Written as a negated <= so that NaN values count as a failure.
+        fail = ~(f_trial - fx <= -tau * decrease)
+        while fail.any():
+            idx = np.flatnonzero(fail)
+            tau[idx] *= beta
+            trial[idx] = x_active[idx] - tau[idx, None] * grad[idx]
+            f_trial[idx] = f(trial[idx])
+            fail[idx] = ~(f_trial[idx] - fx[idx] <= -tau[idx] * decrease[idx]) & (tau[idx] > 0)
+
+        x[active] = trial
+        fx = f_trial
+        grad = f_grad(trial)
+        iterations[active] += 1
+
+    grad_norms[active] = np.linalg.norm(grad, axis=1)
+    return x, iterations, grad_norms
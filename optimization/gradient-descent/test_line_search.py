@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from line_search import ArmijoLineSearch, Objective, WolfeLineSearch, minimize
+
+
+def quadratic():
+    # f(x) = 1/2 x^T A x with condition number 100.
+    A = np.diag(np.linspace(1, 100, 10))
+    return Objective(lambda x: 0.5 * x @ A @ x, lambda x: A @ x)
+
+
+def test_armijo_converges():
+    objective = quadratic()
+    x, fx, gx, _ = minimize(objective, np.ones(10), ArmijoLineSearch(1e-4, 0.5), 5000, 1e-8)
+    assert np.linalg.norm(gx) <= 1e-8
+    assert np.allclose(x, 0, atol=1e-7)
+
+
+def test_wolfe_converges():
+    objective = quadratic()
+    x, fx, gx, _ = minimize(objective, np.ones(10), WolfeLineSearch(), 5000, 1e-8)
+    assert np.linalg.norm(gx) <= 1e-8
+
+
+def test_wolfe_conditions_hold():
+    objective = quadratic()
+    x = np.ones(10)
+    fx, gx = objective.value(x), objective.gradient(x)
+    line_search = WolfeLineSearch(c1=1e-4, c2=0.1)
+    tau, x_new, f_new, g_new = line_search.search(objective, x, fx, gx, -gx)
+    assert tau > 0
+    assert f_new <= fx - 1e-4 * tau * gx @ gx
+    assert abs(g_new @ gx) <= 0.1 * gx @ gx
+    assert f_new == objective.f(x_new)
+
+
+def test_one_gradient_per_iteration():
+    objective = quadratic()
+    _, _, _, iterations = minimize(objective, np.ones(10), ArmijoLineSearch(), 50)
+    assert objective.n_grad == iterations + 1
+
+
+def test_warm_start_saves_evaluations():
+    cold, warm = quadratic(), quadratic()
+    minimize(cold, np.ones(10), ArmijoLineSearch(beta=0.5, warm_start=False), 200)
+    minimize(warm, np.ones(10), ArmijoLineSearch(beta=0.5, warm_start=True), 200)
+    assert warm.n_f < cold.n_f
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from multi_start import optimize_without_backtracking, optimize_with_backtracking
+
+
+def f(points):
+    # Ill-conditioned quadratic f(x, y) = x² + 10y².
+    return points[:, 0] ** 2 + 10 * points[:, 1] ** 2
+
+
+def f_grad(points):
+    return np.column_stack([2 * points[:, 0], 20 * points[:, 1]])
+
+
+def test_without_backtracking():
+    starts = np.random.default_rng(0).uniform(-5, 5, size=(50, 2))
+    optima, iterations, grad_norms = optimize_without_backtracking(f_grad, starts, 0.04, 1000, 1e-8)
+    assert optima.shape == (50, 2)
+    assert np.all(np.abs(optima) < 1e-8)
+    assert np.all(grad_norms <= 1e-8)
+    assert np.all(iterations < 1000)
+
+
+def test_with_backtracking():
+    starts = np.random.default_rng(1).uniform(-5, 5, size=(50, 2))
+    optima, iterations, grad_norms = optimize_with_backtracking(f, f_grad, starts, 1e-4, 0.5, 1000, 1e-8)
+    assert np.all(np.abs(optima) < 1e-8)
+    assert np.all(grad_norms <= 1e-8)
+
+
+def test_converged_starts_stop():
+    starts = np.array([[0.0, 0.0], [1.0, 1.0]])
+    optima, iterations, _ = optimize_with_backtracking(f, f_grad, starts, 1e-4, 0.5, 100, 1e-8)
+    assert iterations[0] == 0
+    assert iterations[1] > 0
+    assert np.allclose(optima[0], 0.0)
@@ -1,5 +1,6 @@
+import numpy as np
 import pytest
-from x_squared import optimize_without_backtracking, optimize_with_backtracking
+from x_squared import optimize_without_backtracking, optimize_with_backtracking, optimize_batch_with_backtracking
 
 
 def test_without_backtracking():
@@ -8,3 +9,10 @@ def test_without_backtracking():
 
 def test_with_backtracking():
     assert optimize_with_backtracking(8, 1e-4, 0.9, 100, False) < 1e-8
+
+
+def test_batch_with_backtracking():
+    optima, iterations, grad_norms = optimize_batch_with_backtracking(np.linspace(-8, 8, 17), 1e-4, 0.9, 100)
+    assert optima.shape == (17, 1)
+    assert np.all(np.abs(optima) < 1e-8)
+    assert iterations[8] == 0
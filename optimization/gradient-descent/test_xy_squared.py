@@ -1,5 +1,10 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
 import pytest
-from xy_squared import optimize_without_backtracking, optimize_with_backtracking
+from xy_squared import Trajectory, optimize_without_backtracking, optimize_with_backtracking, optimize_batch_without_backtracking
 
 
 def test_without_backtracking():
@@ -11,3 +16,29 @@ def test_with_backtracking():
     optimum = optimize_with_backtracking(1, 1, 1e-4, 0.8, 100, False)
     assert optimum[0] < 1e-22
     assert optimum[1] < 1e-22
+
+
+def test_batch_without_backtracking():
+    starts = np.array([[1.0, 1.0], [-2.0, 0.5], [0.0, 0.0]])
+    optima, iterations, grad_norms = optimize_batch_without_backtracking(starts, 0.1, 100)
+    assert np.all(np.abs(optima) < 1e-8)
+    assert np.all(grad_norms <= 1e-8)
+    assert iterations[2] == 0
+
+
+def test_recorder():
+    trajectory = Trajectory.for_iterations(100, dim=2, every=10)
+    optimum = optimize_with_backtracking(1, 1, 1e-4, 0.8, 100, False, recorder=trajectory)
+    assert len(trajectory) == 11
+    assert list(trajectory.iterations) == list(range(0, 101, 10))
+    assert np.allclose(trajectory.points[0], [1, 1])
+    assert trajectory.values[0] == 2
+    assert np.allclose(trajectory.points[-1], optimum)
+
+
+def test_no_plotting_imports_without_plot():
+    code = "import sys, xy_squared; xy_squared.optimize_without_backtracking(1, 1, 0.1, 10, False); " \
+           "assert 'matplotlib' not in sys.modules"
+    directory = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(directory), os.environ.get("PYTHONPATH", "")]))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=directory, env=env)
@@ -1,5 +1,16 @@
+import os
+import sys
+
+if __name__ == "__main__":
+    # Run as a script: the shared modules (stopping.py, trajectory.py) are in the parent directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import numpy as np
-from matplotlib import pyplot as plt
+
+import multi_start
+from line_search import ArmijoLineSearch, Objective
+from stopping import GradientNorm, Monitor
+from trajectory import Trajectory, render_curve
 
 
 def f(x: np.ndarray) -> float:
@@ -28,7 +39,8 @@ def f_grad(x: np.ndarray) -> float:
     return 2 * x
 
 
-def optimize_without_backtracking(x0: float, tau: float, max_iterations: int, plot: bool) -> float:
+def optimize_without_backtracking(x0: float, tau: float, max_iterations: int, plot: bool, recorder=None,
+                                  stop=None, callback=None) -> float:
     """
     Performs gradient descent optimization without backtracking line search for the function f(x) = x².
 
@@ -36,41 +48,44 @@ def optimize_without_backtracking(x0: float, tau: float, max_iterations: int, pl
     x0 (float): Initial guess for the optimization.
     tau (float): Learning rate.
     max_iterations (int): Number of maximal iterations.
-    plot (bool): Plot flag.
+    plot (bool): Plot flag, renders the trajectory after the optimization.
+    recorder (Trajectory): Optional recorder, receives the start point and every iterate.
+    stop (Criterion): Stopping criterion, by default only an exactly zero gradient or step (see stopping.DEFAULT).
+    callback (callable): Called with the IterationState after every iteration.
 
     Returns:
     float: Optimal value of x that minimizes the function f(x) = x².
     """
-    # Data for plotting f(x)
-    x = np.linspace(-10, 10, 1000)
-    y = f(x)
-
-    if plot: 
-        # Plotting setup
-        plt.figure(num="f(x) = x²")
-        plt.xlabel("x")
-        plt.ylabel("y")
+    if plot and recorder is None:
+        recorder = Trajectory.for_iterations(max_iterations, dim=1)
 
     # Start gradient descent
-    current_pos = (x0, f(x0))
-    for _ in range(max_iterations):
+    monitor = Monitor(stop, callback)
+    monitor.start()
+    need_f = recorder is not None or monitor.needs_f
+    fx = f(x0) if need_f else None
+    if recorder is not None:
+        recorder.record(x0, fx)
+    gx = f_grad(x0)
+    for iteration in range(1, max_iterations + 1):
         # Update x using gradient descent: x_new = x_old - tau * f_grad(x_old)
-        x0 = x0 - tau * f_grad(x0)
-
-        # Update current position
-        current_pos = (x0, f(x0))
-
-        if plot: 
-            # Plotting
-            plt.plot(x, y)
-            plt.scatter(current_pos[0], current_pos[1], color="red")
-            plt.pause(0.0001)
-            plt.clf()
-
+        x_old, fx_old = x0, fx
+        x0 = x0 - tau * gx
+        gx = f_grad(x0)
+        fx = f(x0) if need_f else None
+
+        if recorder is not None:
+            recorder.record(x0, fx)
+        if monitor.update(iteration, x0, fx, gx, x_old, fx_old, iteration + 1 if need_f else 0, iteration + 1):
+            break
+
+    if plot:
+        render_curve(recorder, f, (-10, 10), title="f(x) = x²")
     return x0
 
 
-def optimize_with_backtracking(x0: float, eps: float, beta: float, max_iterations: int, plot: bool) -> float:
+def optimize_with_backtracking(x0: float, eps: float, beta: float, max_iterations: int, plot: bool,
+                               recorder=None, stop=None, callback=None) -> float:
     """
     Performs gradient descent optimization with backtracking line search for the function f(x) = x².
 
@@ -78,47 +93,78 @@ def optimize_with_backtracking(x0: float, eps: float, beta: float, max_iteration
     x0 (float): Initial guess for the optimization.
     eps (float) Epsilon for armijo condition.
     beta (float): Backtracking parameter.
-    plot (bool): Plot flag
+    max_iterations (int): Number of maximal iterations.
+    plot (bool): Plot flag, renders the trajectory after the optimization.
+    recorder (Trajectory): Optional recorder, receives the start point and every iterate.
+    stop (Criterion): Stopping criterion, by default only an exactly zero gradient or step (see stopping.DEFAULT).
+    callback (callable): Called with the IterationState after every iteration.
 
     Returns:
     float: Optimal value of x that minimizes the function f(x) = x².
     """
-    # Data for plotting f(x)
-    x = np.linspace(-10, 10, 1000)
-    y = f(x)
-
-    if plot: 
-        # Plotting setup
-        current_pos = (x0, f(x0))
-        plt.figure(num="f(x) = x²")
-        plt.xlabel("x")
-        plt.ylabel("y")
+    if plot and recorder is None:
+        recorder = Trajectory.for_iterations(max_iterations, dim=1)
 
     # Start gradient descent
-    for _ in range(max_iterations):
-        tau = 1
+    # f and f' are evaluated once per trial point, the accepted point's values are reused.
+    objective = Objective(f, f_grad)
+    line_search = ArmijoLineSearch(eps, beta)
+    monitor = Monitor(stop, callback)
+    monitor.start()
+    fx, gx = objective.value(x0), objective.gradient(x0)
+    if recorder is not None:
+        recorder.record(x0, fx)
+    for iteration in range(1, max_iterations + 1):
+        # Backtracking algorithm to find the best tau, warm-started from the last accepted tau.
+        # Use Armijo condition: f(x0 - tau * f_grad(x0)) - f(x0) <= - eps * tau * f_grad(x0) ** 2
+        x_old, fx_old = x0, fx
+        _, x0, fx, gx = line_search.search(objective, x0, fx, gx, -gx)
+
+        if recorder is not None:
+            recorder.record(x0, fx)
+        if monitor.update(iteration, x0, fx, gx, x_old, fx_old, objective.n_f, objective.n_grad):
+            break
+
+    if plot:
+        render_curve(recorder, f, (-10, 10), title="f(x) = x²")
+    return x0
 
-        # Backtracking algorithm to find the best tau
-        # Use Armijo condition: f(x0 - tau * f_grad(x0)) - f(x0) <= - eps * f_grad(x0) ** 2
-        while f(x0 - tau * f_grad(x0)) - f(x0) > -eps * f_grad(x0) ** 2:
-            tau = beta * tau
 
-        # Update x using gradient descent: x_new = x_old - tau * f_grad(x_old)
-        x0 = x0 - tau * f_grad(x0)
-
-        # Update current position
-        current_pos = (x0, f(x0))
-        
-        if plot:
-            # Plotting
-            plt.plot(x, y)
-            plt.scatter(current_pos[0], current_pos[1], color="red")
-            plt.pause(0.0001)
-            plt.clf()
+def optimize_batch_without_backtracking(starts: np.ndarray, tau: float, max_iterations: int, tol: float = 1e-8) -> tuple:
+    """
+    Performs gradient descent without backtracking line search from many start points at once.
 
-    return x0
+    Parameters:
+    starts (np.ndarray): Start points with shape (N,) or (N, 1).
+    tau (float): Learning rate.
+    max_iterations (int): Number of maximal iterations.
+    tol (float): A start converged once |f'(x)| <= tol.
+
+    Returns:
+    tuple: (optima, iterations, grad_norms) with shapes (N, 1), (N,) and (N,).
+    """
+    return multi_start.optimize_without_backtracking(f_grad, starts, tau, max_iterations, tol)
+
+
+def optimize_batch_with_backtracking(starts: np.ndarray, eps: float, beta: float, max_iterations: int,
+                                     tol: float = 1e-8) -> tuple:
+    """
+    Performs gradient descent with backtracking line search from many start points at once.
+
+    Parameters:
+    starts (np.ndarray): Start points with shape (N,) or (N, 1).
+    eps (float) Epsilon for armijo condition.
+    beta (float): Backtracking parameter.
+    max_iterations (int): Number of maximal iterations.
+    tol (float): A start converged once |f'(x)| <= tol.
+
+    Returns:
+    tuple: (optima, iterations, grad_norms) with shapes (N, 1), (N,) and (N,).
+    """
+    return multi_start.optimize_with_backtracking(lambda x: f(x[:, 0]), f_grad, starts, eps, beta, max_iterations, tol)
 
 
 if __name__ == "__main__":
-    print("Found optimum (without line search) =", optimize_without_backtracking(8, 0.09, 100, True))
-    print("Found optimum (with line search) =", optimize_with_backtracking(8, 1e-4, 0.9, 100, True))
+    stop = GradientNorm(1e-8)
+    print("Found optimum (without line search) =", optimize_without_backtracking(8, 0.09, 100, True, stop=stop))
+    print("Found optimum (with line search) =", optimize_with_backtracking(8, 1e-4, 0.9, 100, True, stop=stop))
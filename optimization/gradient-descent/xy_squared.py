@@ -1,5 +1,16 @@
+import os
+import sys
+
+if __name__ == "__main__":
+    # Run as a script: the shared modules (stopping.py, trajectory.py) are in the parent directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import numpy as np
-from matplotlib import pyplot as plt
+
+import multi_start
+from line_search import ArmijoLineSearch, Objective
+from stopping import GradientNorm, Monitor
+from trajectory import Trajectory, render_surface
 
 
 def f(x: np.ndarray, y: np.ndarray) -> float:
@@ -45,97 +56,163 @@ def norm(x: float, y: float) -> float:
     return (x*x + y*y)**0.5
 
 
-def optimize_without_backtracking(x0: float, y0: float, tau: float, max_iterations: int, plot: bool) -> tuple:
+def optimize_without_backtracking(x0: float, y0: float, tau: float, max_iterations: int, plot: bool,
+                                  recorder=None, stop=None, callback=None) -> tuple:
     """
     Perform gradient descent optimization without backtracking line search.
 
     Parameters:
     - x0 (float): Initial x-coordinate.
     - y0 (float): Initial y-coordinate.
+    - tau (float): Learning rate.
+    - max_iterations (int): Number of maximal iterations.
+    - plot (bool): Plot flag, renders the trajectory after the optimization.
+    - recorder (Trajectory): Optional recorder, receives the start point and every iterate.
+    - stop (Criterion): Stopping criterion, by default only an exactly zero gradient or step (see stopping.DEFAULT).
+    - callback (callable): Called with the IterationState after every iteration.
 
     Returns:
     tuple: Optimized (x, y) coordinates.
     """
-    # Set up the meshgrid for plotting the function surface
-    x = np.linspace(-1, 1, 1000)    
-    y = np.linspace(-1, 1, 1000)    
-    X, Y = np.meshgrid(x, y)
-    Z = f(X, Y)
-   
-    if plot:
-        # Create a 3D plot 
-        plt.figure(num="f(x, y) = x² + y²")
-        ax = plt.subplot(projection="3d", computed_zorder=False)
-        ax.plot_surface(X, Y, Z, cmap="viridis")  
-        
+    if plot and recorder is None:
+        recorder = Trajectory.for_iterations(max_iterations, dim=2)
+
     # Start gradient descent
-    current_pos = (x0, y0, f(x0, y0))
-    for _ in range(max_iterations):
-        X_grad, Y_grad = f_grad(x0, y0) 
+    monitor = Monitor(stop, callback)
+    monitor.start()
+    need_f = recorder is not None or monitor.needs_f
+    fp = f(x0, y0) if need_f else None
+    if recorder is not None:
+        recorder.record((x0, y0), fp)
+    X_grad, Y_grad = f_grad(x0, y0)
+    for iteration in range(1, max_iterations + 1):
+        p_old, fp_old = (x0, y0), fp
         x0 = x0 - tau * X_grad
         y0 = y0 - tau * Y_grad
-        current_pos = (x0, y0, f(x0, y0))
-      
-        if plot:
-            # Plotting
-            ax.plot_surface(X, Y, Z, cmap="viridis", zorder=0)  
-            ax.scatter(current_pos[0], current_pos[1], current_pos[2], color="red", zorder=0)
-            plt.pause(0.01)
-            ax.clear()
-        
+        X_grad, Y_grad = f_grad(x0, y0)
+        fp = f(x0, y0) if need_f else None
+
+        if recorder is not None:
+            recorder.record((x0, y0), fp)
+        if monitor.update(iteration, (x0, y0), fp, (X_grad, Y_grad), p_old, fp_old,
+                          iteration + 1 if need_f else 0, iteration + 1):
+            break
+
+    if plot:
+        render_surface(recorder, f, (-1, 1), (-1, 1), title="f(x, y) = x² + y²")
     return x0, y0
 
 
-def optimize_with_backtracking(x0: float, y0: float, eps: float, beta: float, max_iterations: int, plot: bool) -> tuple:
+def optimize_with_backtracking(x0: float, y0: float, eps: float, beta: float, max_iterations: int, plot: bool,
+                               recorder=None, stop=None, callback=None) -> tuple:
     """
     Perform gradient descent optimization with backtracking line search.
 
     Parameters:
     - x0 (float): Initial x-coordinate.
     - y0 (float): Initial y-coordinate.
-    - eps (float):
-    - beta (float):
+    - eps (float): Epsilon for armijo condition.
+    - beta (float): Backtracking parameter.
+    - max_iterations (int): Number of maximal iterations.
+    - plot (bool): Plot flag, renders the trajectory after the optimization.
+    - recorder (Trajectory): Optional recorder, receives the start point and every iterate.
+    - stop (Criterion): Stopping criterion, by default only an exactly zero gradient or step (see stopping.DEFAULT).
+    - callback (callable): Called with the IterationState after every iteration.
 
     Returns:
     tuple: Optimized (x, y) coordinates.
     """ 
-    # Set up the meshgrid for plotting the function surface
-    x = np.linspace(-1, 1, 1000)    
-    y = np.linspace(-1, 1, 1000)    
-    X, Y = np.meshgrid(x, y)
-    Z = f(X, Y)
-   
-    if plot:
-        # Create 3D plot 
-        plt.figure(num="f(x, y) = x² + y²")
-        ax = plt.subplot(projection="3d", computed_zorder=False)
-        ax.plot_surface(X, Y, Z, cmap="viridis")  
-        
+    if plot and recorder is None:
+        recorder = Trajectory.for_iterations(max_iterations, dim=2)
+
     # Start gradient descent
-    current_pos = (x0, y0, f(x0, y0))
-    for _ in range(max_iterations):
-        tau = 1 
-        df = f_grad(x0, y0)
-        # Backtracking line search algorithm (goal -> find the best tau!), we use armijo condition here
-        while f(x0-tau*f_grad(x0,y0)[0], y0-tau*f_grad(x0,y0)[1]) - f(x0,y0) > -eps*norm(df[0], df[1])**2:
-            tau = beta*tau 
-        
-        # Gradient descent 
-        X_grad, Y_grad = f_grad(x0, y0) 
-        x0 = x0 - tau * X_grad
-        y0 = y0 - tau * Y_grad
-        current_pos = (x0, y0, f(x0, y0))
-       
-        if plot:
-            # Plotting 
-            ax.plot_surface(X, Y, Z, cmap="viridis", zorder=0)  
-            ax.scatter(current_pos[0], current_pos[1], current_pos[2], color="red", zorder=0)
-            plt.pause(0.01)
-            ax.clear()
+    # f and f_grad are evaluated once per trial point, the accepted point's values are reused.
+    objective = Objective(lambda p: f(p[0], p[1]), lambda p: f_grad(p[0], p[1]))
+    line_search = ArmijoLineSearch(eps, beta)
+    p = np.array([x0, y0], dtype=float)
+    monitor = Monitor(stop, callback)
+    monitor.start()
+    fp, df = objective.value(p), objective.gradient(p)
+    if recorder is not None:
+        recorder.record(p, fp)
+    for iteration in range(1, max_iterations + 1):
+        # Backtracking line search algorithm (goal -> find the best tau!), we use armijo condition here.
+        # The search is warm-started from the last accepted tau.
+        p_old, fp_old = p, fp
+        _, p, fp, df = line_search.search(objective, p, fp, df, -df)
+
+        if recorder is not None:
+            recorder.record(p, fp)
+        if monitor.update(iteration, p, fp, df, p_old, fp_old, objective.n_f, objective.n_grad):
+            break
 
+    if plot:
+        render_surface(recorder, f, (-1, 1), (-1, 1), title="f(x, y) = x² + y²")
+    x0, y0 = float(p[0]), float(p[1])
     return (x0, y0)
 
 
+def f_rows(points: np.ndarray) -> np.ndarray:
+    """
+    Compute f(x, y) = x² + y² for every row (x, y) of points.
+
+    Parameters:
+    - points (np.ndarray): Points with shape (N, 2).
+
+    Returns:
+    np.ndarray: Function values with shape (N,).
+    """
+    return f(points[:, 0], points[:, 1])
+
+
+def f_grad_rows(points: np.ndarray) -> np.ndarray:
+    """
+    Compute the gradient (2x, 2y) for every row (x, y) of points.
+
+    Parameters:
+    - points (np.ndarray): Points with shape (N, 2).
+
+    Returns:
+    np.ndarray: Gradients with shape (N, 2).
+    """
+    return np.column_stack(f_grad(points[:, 0], points[:, 1]))
+
+
+def optimize_batch_without_backtracking(starts: np.ndarray, tau: float, max_iterations: int, tol: float = 1e-8) -> tuple:
+    """
+    Perform gradient descent without backtracking line search from many start points at once.
+
+    Parameters:
+    - starts (np.ndarray): Start points with shape (N, 2).
+    - tau (float): Learning rate.
+    - max_iterations (int): Number of maximal iterations.
+    - tol (float): A start converged once its gradient norm is <= tol.
+
+    Returns:
+    tuple: (optima, iterations, grad_norms) with shapes (N, 2), (N,) and (N,).
+    """
+    return multi_start.optimize_without_backtracking(f_grad_rows, starts, tau, max_iterations, tol)
+
+
+def optimize_batch_with_backtracking(starts: np.ndarray, eps: float, beta: float, max_iterations: int,
+                                     tol: float = 1e-8) -> tuple:
+    """
+    Perform gradient descent with backtracking line search from many start points at once.
+
+    Parameters:
+    - starts (np.ndarray): Start points with shape (N, 2).
+    - eps (float): Epsilon for armijo condition.
+    - beta (float): Backtracking parameter.
+    - max_iterations (int): Number of maximal iterations.
+    - tol (float): A start converged once its gradient norm is <= tol.
+
+    Returns:
+    tuple: (optima, iterations, grad_norms) with shapes (N, 2), (N,) and (N,).
+    """
+    return multi_start.optimize_with_backtracking(f_rows, f_grad_rows, starts, eps, beta, max_iterations, tol)
+
+
 if __name__ == '__main__':
-    print("found optimum (without line search) = ", optimize_without_backtracking(1, 1, 0.1, 100, True))
-    print("found optimum (with line search) = ", optimize_with_backtracking(1, 1, 1e-4, 0.8, 100, True))
+    stop = GradientNorm(1e-8)
+    print("found optimum (without line search) = ", optimize_without_backtracking(1, 1, 0.1, 100, True, stop=stop))
+    print("found optimum (with line search) = ", optimize_with_backtracking(1, 1, 1e-4, 0.8, 100, True, stop=stop))
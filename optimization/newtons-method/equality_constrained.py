@@ -0,0 +1,161 @@
+"""
+Newton's method for equality-constrained optimization (SQP).
+
+Optimization problem:
+
+    min f(x)  s.t. c(x) = 0,  f: R^n -> R,  c: R^n -> R^m
+
+    Lagrangian: L(x, lam) = f(x) + lam^T c(x)
+
+Newton's method is applied to the KKT conditions
+
+    F(x, lam) = (grad_f(x) + J_c(x)^T lam, c(x)) = 0
+
+which gives the KKT system in every iteration
+
+    [ H    J_c^T ] [ dx   ]     [ grad_f(x) + J_c(x)^T lam ]
+    [ J_c  0     ] [ dlam ] = - [ c(x)                     ]
+
+H is the Hessian of the Lagrangian, either given by the user or approximated
+with damped BFGS updates (quasi_newton=True), so no second derivatives are needed.
+
+Many initial guesses are solved at once. All callables get x with a leading
+batch axis, shape (B, n), and have to return:
+- grad_f(x): (B, n)
+- c(x): (B, m)
+- jac_c(x): (B, m, n)
+- hess_L(x, lam): (B, n, n), lam has shape (B, m)
+
+Example (f(x, y) = x + y, c(x, y) = 2 - x² - y²):
+    grad_f = lambda z: np.ones_like(z)
+    c = lambda z: 2 - np.sum(z ** 2, axis=-1, keepdims=True)
+    jac_c = lambda z: -2 * z[:, None, :]
+    x, lam, iterations, converged = solve_kkt(grad_f, c, jac_c, np.array([0.5, -2.0]), quasi_newton=True)
+"""
+import numpy as np
+
+
+def kkt_residual(grad_f, c, jac_c, x: np.ndarray, lam: np.ndarray) -> tuple:
+    """
+    Evaluate the KKT residual F(x, lam) = (grad_f(x) + J_c(x)^T lam, c(x)).
+
+    Parameters:
+    - grad_f (callable): Gradient of f.
+    - c (callable): Constraints.
+    - jac_c (callable): Jacobian of the constraints.
+    - x (np.ndarray): Points (B, n).
+    - lam (np.ndarray): Lagrange multipliers (B, m).
+
+    Returns:
+    tuple: (grad_L, c(x), J_c(x)) with shapes (B, n), (B, m) and (B, m, n).
+    """
+    J = jac_c(x)
+    return grad_f(x) + np.einsum("bmn,bm->bn", J, lam), c(x), J
+
+
+def _solve(K: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    """
+    Solve a batch of KKT systems, singular systems get the least-squares solution.
+    """
+    try:
+        return np.linalg.solve(K, rhs[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum("bij,bj->bi", np.linalg.pinv(K), rhs)
+
+
+def bfgs_update(H: np.ndarray, s: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Damped BFGS update (Powell) of a batch of Hessian approximations.
+
+    The damping keeps H positive definite even if s^T y <= 0, which happens for
+    the Hessian of a Lagrangian.
+
+    Parameters:
+    - H (np.ndarray): Hessian approximations (B, n, n).
+    - s (np.ndarray): Steps x_new - x (B, n).
+    - y (np.ndarray): Changes of the gradient of the Lagrangian (B, n).
+
+    Returns:
+    np.ndarray: Updated approximations (B, n, n).
+    """
+    Hs = np.einsum("bij,bj->bi", H, s)
+    sHs = np.einsum("bi,bi->b", s, Hs)
+    sy = np.einsum("bi,bi->b", s, y)
+    theta = np.where(sy >= 0.2 * sHs, 1.0, 0.8 * sHs / np.where(sHs - sy == 0, 1.0, sHs - sy))
+    r = theta[:, None] * y + (1 - theta[:, None]) * Hs
+    sr = np.einsum("bi,bi->b", s, r)
+
+    # Skip the update where the step is (numerically) zero.
+    ok = (sHs > 1e-300) & (sr > 1e-300)
+    sHs, sr = np.where(ok, sHs, 1.0), np.where(ok, sr, 1.0)
+    update = np.einsum("bi,bj->bij", r, r) / sr[:, None, None] - np.einsum("bi,bj->bij", Hs, Hs) / sHs[:, None, None]
+    return H + update * ok[:, None, None]
+
+
+def solve_kkt(grad_f, c, jac_c, x0: np.ndarray, lam0: np.ndarray = None, hess_L=None, tol: float = 1e-10,
+              max_iterations: int = 100, quasi_newton: bool = False) -> tuple:
+    """
+    Solve min f(x) s.t. c(x) = 0 with Newton's method on the KKT conditions.
+
+    Every initial guess stops on its own once |F(x, lam)|_inf <= tol, only the
+    guesses that are still running are evaluated.
+
+    Parameters:
+    - grad_f (callable): Gradient of f.
+    - c (callable): Constraints.
+    - jac_c (callable): Jacobian of the constraints.
+    - x0 (np.ndarray): Initial guess (n,) or a batch of initial guesses (B, n).
+    - lam0 (np.ndarray): Initial multipliers (m,) or (B, m), zero by default.
+    - hess_L (callable): Hessian of the Lagrangian, needed unless quasi_newton is True.
+    - tol (float): Tolerance for the KKT residual.
+    - max_iterations (int): Maximum number of iterations.
+    - quasi_newton (bool): Approximate the Hessian of the Lagrangian with damped BFGS updates.
+
+    Returns:
+    tuple: (x, lam, iterations, converged), batched if x0 is batched.
+    """
+    if hess_L is None and not quasi_newton:
+        raise ValueError("hess_L is required unless quasi_newton=True")
+    single = np.ndim(x0) == 1
+    x = np.array(np.atleast_2d(x0), dtype=float)
+    B, n = x.shape
+    m = c(x[:1]).shape[-1]
+    lam = np.zeros((B, m)) if lam0 is None else np.array(np.broadcast_to(lam0, (B, m)), dtype=float)
+
+    iterations = np.zeros(B, dtype=int)
+    converged = np.zeros(B, dtype=bool)
+    H = np.tile(np.eye(n), (B, 1, 1)) if quasi_newton else None
+
+    active = np.arange(B)
+    grad_L, c_x, J = kkt_residual(grad_f, c, jac_c, x, lam)
+    for iteration in range(max_iterations + 1):
+        # Drop converged guesses from the working set.
+        residual = np.maximum(np.abs(grad_L).max(axis=1), np.abs(c_x).max(axis=1, initial=0.0))
+        done = residual <= tol
+        converged[active[done]] = True
+        keep = ~done
+        active, grad_L, c_x, J = active[keep], grad_L[keep], c_x[keep], J[keep]
+        if active.size == 0 or iteration == max_iterations:
+            break
+
+        x_a, lam_a = x[active], lam[active]
+        hessian = H[active] if quasi_newton else hess_L(x_a, lam_a)
+        K = np.zeros((active.size, n + m, n + m))
+        K[:, :n, :n] = hessian
+        K[:, :n, n:] = np.swapaxes(J, 1, 2)
+        K[:, n:, :n] = J
+        step = _solve(K, -np.concatenate([grad_L, c_x], axis=1))
+        x_new, lam_new = x_a + step[:, :n], lam_a + step[:, n:]
+
+        grad_L_new, c_x, J_new = kkt_residual(grad_f, c, jac_c, x_new, lam_new)
+        if quasi_newton:
+            # Gradient of the Lagrangian at the old point with the new multipliers.
+            grad_L_old = grad_L + np.einsum("bmn,bm->bn", J, step[:, n:])
+            H[active] = bfgs_update(H[active], step[:, :n], grad_L_new - grad_L_old)
+        x[active], lam[active] = x_new, lam_new
+        grad_L, J = grad_L_new, J_new
+        iterations[active] += 1
+
+    if single:
+        return x[0], lam[0], int(iterations[0]), bool(converged[0])
+    return x, lam, iterations, converged
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+import xy_add
+from equality_constrained import solve_kkt
+
+# f(x, y) = x + y, c(x, y) = 2 - x² - y², with lam = -a this is the problem of xy_add.py.
+grad_f = lambda z: np.ones_like(z)
+c = lambda z: 2 - np.sum(z ** 2, axis=-1, keepdims=True)
+jac_c = lambda z: -2 * z[:, None, :]
+hess_L = lambda z, lam: -2 * lam[:, :, None] * np.eye(z.shape[1])
+
+
+def test_matches_xy_add():
+    z = xy_add.optimize(np.array([0, -2, 1]), 20)
+    x, lam, iterations, converged = solve_kkt(grad_f, c, jac_c, np.array([0.0, -2.0]), np.array([-1.0]), hess_L)
+    assert converged
+    assert np.allclose(x, z[:2])
+    assert np.allclose(lam, -z[2])
+    assert iterations < 20
+
+
+def test_quasi_newton():
+    x, lam, _, converged = solve_kkt(grad_f, c, jac_c, np.array([0.5, -2.0]), tol=1e-9, quasi_newton=True)
+    assert converged
+    assert np.allclose(x, [-1, -1])
+
+
+def test_batch_of_initial_guesses():
+    rng = np.random.default_rng(0)
+    x0 = rng.uniform(-3, 0, size=(100, 2))
+    x, lam, iterations, converged = solve_kkt(grad_f, c, jac_c, x0, 1.0, hess_L)
+    assert converged.all()
+    assert np.allclose(np.sum(x ** 2, axis=1), 2)
+    for i in range(0, 100, 25):
+        single = solve_kkt(grad_f, c, jac_c, x0[i], 1.0, hess_L)
+        assert np.allclose(single[0], x[i])
+        assert single[2] == iterations[i]
+
+
+def test_quadratic_program_in_higher_dimension():
+    # min 1/2 x^T Q x s.t. A x = b converges in one Newton step.
+    rng = np.random.default_rng(1)
+    n, m = 10, 3
+    M = rng.normal(size=(n, n))
+    Q = M @ M.T + n * np.eye(n)
+    A = rng.normal(size=(m, n))
+    b = rng.normal(size=m)
+    x, lam, iterations, converged = solve_kkt(lambda z: z @ Q, lambda z: z @ A.T - b,
+                                              lambda z: np.broadcast_to(A, (len(z), m, n)), np.zeros(n),
+                                              hess_L=lambda z, lam: np.broadcast_to(Q, (len(z), n, n)))
+    assert converged
+    assert iterations == 1
+    assert np.allclose(A @ x, b)
@@ -0,0 +1,33 @@
+import os
+import runpy
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from stopping import GradientNorm
+from trajectory import Trajectory
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# Loaded by path, gradient-descent has a module with the same name.
+newton = runpy.run_path(os.path.join(DIRECTORY, "x_squared.py"))
+
+
+def test_one_newton_step():
+    optimum, iterations = newton["optimize"](10, 1, 100, False)
+    assert optimum == 0 and iterations == 1
+
+
+def test_damped_steps_and_recorder():
+    trajectory = Trajectory.for_iterations(100, dim=1)
+    optimum, iterations = newton["optimize"](10, 0.5, 100, False, recorder=trajectory, stop=GradientNorm(1e-8))
+    assert abs(optimum) <= 1e-8 / 2 and iterations < 40
+    assert len(trajectory) == iterations + 1
+    assert np.allclose(trajectory.points[:3, 0], [10, 5, 2.5])
+
+
+@pytest.mark.parametrize("script", ["x_squared.py", "xy_add_iterations.py"])
+def test_runs_as_script(script):
+    env = dict(os.environ, MPLBACKEND="Agg")
+    env.pop("PYTHONPATH", None)
+    subprocess.run([sys.executable, script], check=True, cwd=DIRECTORY, env=env, capture_output=True)
@@ -0,0 +1,18 @@
+import numpy as np
+from trajectory import Trajectory
+from xy_add_iterations import c, f, grad_L, optimize
+
+
+def test_kkt_point():
+    # Minimum of x + y on the circle x² + y² = 2 is (-1, -1) with multiplier 1/2.
+    z = optimize([0, -2, 1], 20, False)
+    assert np.allclose(z, [-1, -1, 0.5])
+    assert abs(c(z[0], z[1])) < 1e-12 and f(z[0], z[1]) == -2
+    assert np.linalg.norm(grad_L(*z), np.inf) <= 1e-12
+
+
+def test_recorder():
+    trajectory = Trajectory.for_iterations(20, dim=3)
+    z = optimize([0, -2, 1], 20, False, recorder=trajectory)
+    assert np.allclose(trajectory.points[0], [0, -2, 1])
+    assert np.allclose(trajectory.points[-1], z)
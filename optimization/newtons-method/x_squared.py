@@ -1,5 +1,14 @@
+import os
+import sys
+
+if __name__ == "__main__":
+    # Run as a script: the shared modules (stopping.py, trajectory.py) are in the parent directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import numpy as np
-from matplotlib import pyplot as plt
+
+from stopping import Monitor
+from trajectory import Trajectory, render_curve
 
 
 def f(x: np.ndarray) -> np.ndarray:
@@ -43,7 +52,7 @@ def hess_f(x: np.ndarray) -> np.ndarray:
     return 2
 
 
-def optimize(x0: float, tau: float, max_iterations: int, plot: bool):
+def optimize(x0: float, tau: float, max_iterations: int, plot: bool, recorder=None, stop=None, callback=None):
     """
     Simple implementation of newtons-method optimization algorithm.
 
@@ -51,39 +60,43 @@ def optimize(x0: float, tau: float, max_iterations: int, plot: bool):
 
     Gradient descent: d_k = -grad_f(x_k)
     Newton-Method: d_k = -hess_f(f(x_k))^(-1) * grad_f(x_k)   
+
+    The start point and every iterate are passed to the optional recorder,
+    with plot=True the trajectory is rendered after the optimization.
+
+    The iteration stops once the stop criterion (see stopping.py) is met, by
+    default only once the gradient or the step is exactly zero. callback is
+    called with the IterationState after every iteration.
     """ 
-    # Data for plotting. 
-    x = np.linspace(-10, 10, 1000)
-    y = f(x) 
-    
-    if plot:
-        # Plot setup.
-        plt.figure(num="f(x)=x²")
-        plt.xlabel("x")
-        plt.ylabel("y")
+    if plot and recorder is None:
+        recorder = Trajectory.for_iterations(max_iterations, dim=1)
 
     # Start newtons-method
-    current_pos = (x0, f(x0))
+    monitor = Monitor(stop, callback)
+    monitor.start()
+    need_f = recorder is not None or monitor.needs_f
+    fx = f(x0) if need_f else None
+    if recorder is not None:
+        recorder.record(x0, fx)
+    gx = grad_f(x0)
     iterations = 0
     for _ in range(max_iterations):
         iterations += 1 
         
         # Update x0 using: x_k + tau * (-hess_f(f(x_k))^(-1) * grad_f(x_k))
-        x0 = x0 + tau * (-hess_f(x0) ** (-1)) * grad_f(x0)
+        x_old, fx_old = x0, fx
+        x0 = x0 + tau * (-hess_f(x0) ** (-1)) * gx
+        gx = grad_f(x0)
+        fx = f(x0) if need_f else None
         
-        # Update current position. 
-        current_pos = (x0, f(x0)) 
+        if recorder is not None:
+            recorder.record(x0, fx)
         
-        if plot:
-            # Plotting.
-            plt.plot(x, y)
-            plt.scatter(current_pos[0], current_pos[1], color="red")
-            plt.pause(0.0001)
-            plt.clf() 
-        
-        if x0  == 0:
+        if monitor.update(iterations, x0, fx, gx, x_old, fx_old, iterations + 1 if need_f else 0, iterations + 1):
             break
  
+    if plot:
+        render_curve(recorder, f, (-10, 10), title="f(x)=x²")
     return x0, iterations
 
 if __name__ == '__main__':
@@ -19,7 +19,6 @@ Optimization problem:
 Now translate this in easy python code and start newtons-method with x = 0, y = -2, a = 1.
 """
 import numpy as np
-from matplotlib import pyplot as plt
 
 
 def f(x, y):
@@ -33,23 +32,27 @@ def c(x, y):
 
 
 def grad_L(x, y, a):
-    return np.array([[1 + 2*x*a], [1 + 2*y*a], [2 - x * x - y * y]])
+    return np.array([1 + 2*x*a, 1 + 2*y*a, 2 - x * x - y * y])
 
 
 def Jacobian_grad_L(x, y, a):
     return np.array([[2 * a, 0 , 2 * x], [0, 2 * a, 2 * y], [-2 * x, - 2 * y, 0]])
 
-def optimize(z_0, max_iterations: int):
+def optimize(z_0, max_iterations: int, tol: float = 1e-12):
+    z_0 = np.asarray(z_0, dtype=float)
     for _ in range(max_iterations): 
         F_k = grad_L(z_0[0], z_0[1], z_0[2])
+        # Stop once the KKT conditions hold.
+        if np.linalg.norm(F_k, np.inf) <= tol:
+            break
         J_k = Jacobian_grad_L(z_0[0], z_0[1], z_0[2])
-        solution = np.linalg.solve(J_k, -F_k)
-        z_0 = np.matrix(z_0).T + solution
-        z_0 = np.array(z_0).flatten()
+        z_0 = z_0 + np.linalg.solve(J_k, -F_k)
     return z_0
 
 
 if __name__ == '__main__':
+    from matplotlib import pyplot as plt
+
     z_0 = np.array([0, -2, 1]) # Initial guess.
     result = optimize(z_0, 10)
 
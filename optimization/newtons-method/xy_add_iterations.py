@@ -18,9 +18,16 @@ Optimization problem:
 
 Now translate this in easy python code and start newtons-method with x = 0, y = -2, a = 1.
 """
+import os
+import sys
+
+if __name__ == "__main__":
+    # Run as a script: the shared modules (stopping.py, trajectory.py) are in the parent directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import numpy as np
-from matplotlib import pyplot as plt
-import time
+
+from trajectory import Trajectory, render_contour
 
 def f(x, y):
     """
@@ -33,35 +40,30 @@ def c(x, y):
 
 
 def grad_L(x, y, a):
-    return np.array([[1 + 2*x*a], [1 + 2*y*a], [2 - x * x - y * y]])
+    return np.array([1 + 2*x*a, 1 + 2*y*a, 2 - x * x - y * y])
 
 
 def Jacobian_grad_L(x, y, a):
     return np.array([[2 * a, 0 , 2 * x], [0, 2 * a, 2 * y], [-2 * x, - 2 * y, 0]])
 
-def optimize(z_0, max_iterations: int, plot: bool):
-    if plot:
-        x = np.linspace(-3, 3, 400)
-        y = np.linspace(-3, 3, 400)
-        X, Y = np.meshgrid(x, y)
-        F = f(X, Y)
-        C = c(X, Y)
-        plt.contour(X, Y, F, levels=20, cmap='viridis', label='Zielfunktion')
-        plt.contour(X, Y, C, levels=[0], colors='red', label='Gleichheitsbeschränkung')
-        current_pos = (z_0[0], z_0[1])
+def optimize(z_0, max_iterations: int, plot: bool, tol: float = 1e-12, recorder=None):
+    if plot and recorder is None:
+        recorder = Trajectory.for_iterations(max_iterations, dim=3)
 
+    z_0 = np.asarray(z_0, dtype=float)
+    if recorder is not None:
+        recorder.record(z_0, f(z_0[0], z_0[1]))
     for iteration in range(max_iterations): 
         F_k = grad_L(z_0[0], z_0[1], z_0[2])
+        # Stop once the KKT conditions hold.
+        if np.linalg.norm(F_k, np.inf) <= tol:
+            break
         J_k = Jacobian_grad_L(z_0[0], z_0[1], z_0[2])
-        solution = np.linalg.solve(J_k, -F_k)
-        z_0 = np.matrix(z_0).T + solution
-        z_0 = np.array(z_0).flatten()
-        if plot: 
-            plt.scatter(z_0[0], z_0[1], color='green', marker='x', label=f'iteration {iteration}')
-            plt.text(z_0[0], z_0[1], str(iteration), color='black', fontsize=8, ha='right', va='bottom')
+        z_0 = z_0 + np.linalg.solve(J_k, -F_k)
+        if recorder is not None:
+            recorder.record(z_0, f(z_0[0], z_0[1]))
     if plot: 
-        plt.scatter(z_0[0], z_0[1], color='green', marker='x', label='optimum') 
-        plt.show() 
+        render_contour(recorder, f, (-3, 3), (-3, 3), constraint=c)
     return z_0
 
 
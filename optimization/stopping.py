@@ -0,0 +1,240 @@
+"""
+Stopping criteria and per-iteration hooks for the optimizers.
+
+After every iteration an optimizer passes the current IterationState to a
+Monitor, which asks the stopping criterion whether to stop and calls the
+optional callback (for example a Profiler).
+
+Criteria:
+- GradientNorm(tol): |grad f(x)| <= tol
+- StepSize(tol): |x_new - x_old| <= tol
+- RelativeFChange(tol): |f(x_old) - f(x_new)| <= tol * max(1, |f(x_new)|)
+- WallClock(seconds): the optimizer has run for at least `seconds`
+
+They are combined with AnyOf(...) or with |, e.g.
+GradientNorm(1e-8) | WallClock(0.5). The criterion that fired is available as
+monitor.reason.
+
+Without a criterion the optimizers use DEFAULT, which only stops once the
+gradient or the step is exactly zero: from then on every further iteration
+returns the same point, so the result is the same as running all iterations.
+DEFAULT only reproduces the behavior from before the criteria existed, on
+real floating-point problems it practically never ends a run before
+max_iterations. For early termination pass a criterion with a tolerance,
+e.g. GradientNorm(1e-8) | StepSize(1e-12).
+
+Example:
+    profiler = Profiler()
+    optimize_with_backtracking(8, 1e-4, 0.9, 10_000, False, stop=GradientNorm(1e-10), callback=profiler)
+    print(len(profiler), profiler.times.sum(), profiler.n_f[-1])
+"""
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+
+class IterationState(NamedTuple):
+    """
+    State of an optimizer after an iteration. fx and fx_old are None if the
+    optimizer does not evaluate f, gradient is None if it does not evaluate the
+    gradient at the new point.
+    """
+    iteration: int
+    x: np.ndarray
+    fx: float
+    gradient: np.ndarray
+    x_old: np.ndarray
+    fx_old: float
+    n_f: int
+    n_grad: int
+
+
+class Criterion:
+    """
+    Base class of the stopping criteria.
+    """
+    needs_f = False
+
+    def start(self) -> None:
+        """Called once before the first iteration."""
+
+    def __call__(self, state: IterationState) -> bool:
+        raise NotImplementedError
+
+    def __or__(self, other: "Criterion") -> "AnyOf":
+        return AnyOf(self, other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.tol!r})"
+
+
+class GradientNorm(Criterion):
+    """
+    Stop once the norm of the gradient is <= tol.
+    """
+
+    def __init__(self, tol: float) -> None:
+        self.tol = tol
+
+    def __call__(self, state: IterationState) -> bool:
+        return state.gradient is not None and np.linalg.norm(np.ravel(state.gradient)) <= self.tol
+
+
+class StepSize(Criterion):
+    """
+    Stop once the norm of the last step is <= tol.
+    """
+
+    def __init__(self, tol: float) -> None:
+        self.tol = tol
+
+    def __call__(self, state: IterationState) -> bool:
+        return np.linalg.norm(np.ravel(np.subtract(state.x, state.x_old))) <= self.tol
+
+
+class RelativeFChange(Criterion):
+    """
+    Stop once |f(x_old) - f(x_new)| <= tol * max(1, |f(x_new)|).
+    """
+    needs_f = True
+
+    def __init__(self, tol: float) -> None:
+        self.tol = tol
+
+    def __call__(self, state: IterationState) -> bool:
+        if state.fx is None or state.fx_old is None:
+            return False
+        return abs(state.fx_old - state.fx) <= self.tol * max(1.0, abs(state.fx))
+
+
+class WallClock(Criterion):
+    """
+    Stop once the optimizer has been running for at least `seconds`.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._start = None
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+
+    def __call__(self, state: IterationState) -> bool:
+        return time.perf_counter() - self._start >= self.seconds
+
+    def __repr__(self) -> str:
+        return f"WallClock({self.seconds!r})"
+
+
+class AnyOf(Criterion):
+    """
+    Stop as soon as one of the criteria is met, the first one that is met is stored in `fired`.
+    """
+
+    def __init__(self, *criteria: Criterion) -> None:
+        self.criteria = []
+        for criterion in criteria:
+            self.criteria.extend(criterion.criteria if isinstance(criterion, AnyOf) else [criterion])
+        self.fired = None
+
+    @property
+    def needs_f(self) -> bool:
+        return any(criterion.needs_f for criterion in self.criteria)
+
+    def start(self) -> None:
+        self.fired = None
+        for criterion in self.criteria:
+            criterion.start()
+
+    def __call__(self, state: IterationState) -> bool:
+        for criterion in self.criteria:
+            if criterion(state):
+                self.fired = criterion
+                return True
+        return False
+
+    def __repr__(self) -> str:
+        return " | ".join(map(repr, self.criteria))
+
+
+# Not an early termination: only stops where further iterations could not change the result.
+DEFAULT = AnyOf(GradientNorm(0.0), StepSize(0.0))
+
+
+class Profiler:
+    """
+    Callback that records the wall time of every iteration and the cumulative
+    number of function and gradient evaluations after it.
+    """
+
+    def __init__(self) -> None:
+        self._times = []
+        self._n_f = []
+        self._n_grad = []
+        self._last = None
+
+    def start(self) -> None:
+        self._times.clear()
+        self._n_f.clear()
+        self._n_grad.clear()
+        self._last = time.perf_counter()
+
+    def __call__(self, state: IterationState) -> None:
+        now = time.perf_counter()
+        self._times.append(now - self._last)
+        self._n_f.append(state.n_f)
+        self._n_grad.append(state.n_grad)
+        self._last = now
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def times(self) -> np.ndarray:
+        """Wall time of every iteration in seconds."""
+        return np.array(self._times)
+
+    @property
+    def n_f(self) -> np.ndarray:
+        """Cumulative function evaluations after every iteration."""
+        return np.array(self._n_f, dtype=int)
+
+    @property
+    def n_grad(self) -> np.ndarray:
+        """Cumulative gradient evaluations after every iteration."""
+        return np.array(self._n_grad, dtype=int)
+
+
+class Monitor:
+    """
+    Combines a stopping criterion and an optional callback for one optimizer run.
+    """
+
+    def __init__(self, stop: Criterion = None, callback=None) -> None:
+        self.stop = DEFAULT if stop is None else stop
+        self.callback = callback
+        self.reason = None
+
+    @property
+    def needs_f(self) -> bool:
+        """True if the criterion compares function values, so the optimizer has to evaluate f."""
+        return self.stop.needs_f
+
+    def start(self) -> None:
+        self.reason = None
+        self.stop.start()
+        if hasattr(self.callback, "start"):
+            self.callback.start()
+
+    def update(self, iteration: int, x, fx, gradient, x_old, fx_old, n_f: int, n_grad: int) -> bool:
+        """
+        Report an iteration, returns True if the optimizer should stop.
+        """
+        state = IterationState(iteration, x, fx, gradient, x_old, fx_old, n_f, n_grad)
+        if self.callback is not None:
+            self.callback(state)
+        if self.stop(state):
+            self.reason = self.stop.fired if isinstance(self.stop, AnyOf) else self.stop
+            return True
+        return False
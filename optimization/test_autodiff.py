@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from autodiff import gradient, hessian, jacobian, vector_gradient, vector_hessian, vector_hessian_vector_product
+import multi_start
+import non_linear_least_squares
+from equality_constrained import solve_kkt
+from normal_equations import gauss_newton_streaming
+
+
+def rosenbrock(x):
+    return (1 - x[..., 0]) ** 2 + 100 * (x[..., 1] - x[..., 0] ** 2) ** 2
+
+
+def rosenbrock_grad(x):
+    return np.stack([-2 * (1 - x[..., 0]) - 400 * x[..., 0] * (x[..., 1] - x[..., 0] ** 2),
+                     200 * (x[..., 1] - x[..., 0] ** 2)], axis=-1)
+
+
+def rosenbrock_hess(x):
+    return np.array([[2 - 400 * x[1] + 1200 * x[0] ** 2, -400 * x[0]], [-400 * x[0], 200]])
+
+
+def test_gradient_matches_hand_written():
+    x, y = np.linspace(-1, 1, 7), np.linspace(2, 3, 7)
+    f = lambda x, y: x ** 2 + y ** 2
+    assert np.allclose(gradient(f)(x, y), (2 * x, 2 * y))
+
+    a, b = 2.0, 1.0
+    x = np.array([1.0, 2.0, 3.0])
+    partials = gradient(non_linear_least_squares.f, argnums=(1, 2))(x, a, b)
+    assert np.allclose(partials, non_linear_least_squares.f_grad(x, a, b))
+    assert np.allclose(jacobian(non_linear_least_squares.f, argnums=(1, 2))(x, a, b),
+                       non_linear_least_squares.jacobian(x, a, b))
+
+
+def test_vector_gradient_and_hessian():
+    x = np.random.default_rng(0).normal(size=(5, 2))
+    assert np.allclose(vector_gradient(rosenbrock)(x), rosenbrock_grad(x))
+    H = vector_hessian(rosenbrock)(x)
+    assert H.shape == (5, 2, 2)
+    for i in range(5):
+        assert np.allclose(H[i], rosenbrock_hess(x[i]))
+    v = np.ones((5, 2))
+    assert np.allclose(vector_hessian_vector_product(rosenbrock)(x, v), np.einsum("bij,bj->bi", H, v))
+
+
+def test_ufuncs():
+    f = lambda x: np.sum(np.sin(x) * np.exp(x) + np.log(x) / np.sqrt(x), axis=-1)
+    x = np.array([[0.5, 1.5, 2.5]])
+    expected = np.cos(x) * np.exp(x) + np.sin(x) * np.exp(x) + (1 - 0.5 * np.log(x)) / x ** 1.5
+    assert np.allclose(vector_gradient(f)(x), expected)
+
+
+def test_scalar_hessian():
+    f = lambda x: x ** 3
+    assert np.allclose(hessian(f, argnums=0)(np.array([1.0, 2.0])), [6, 12])
+    H = hessian(lambda x, y: x * x * y)(2.0, 3.0)
+    assert np.allclose(H, [[6, 4], [4, 0]])
+
+
+def test_plugs_into_gradient_descent():
+    f = lambda x: np.sum((x - 3) ** 2, axis=-1)
+    optima, _, _ = multi_start.optimize_with_backtracking(f, vector_gradient(f), np.zeros((4, 3)), 1e-4, 0.5, 100)
+    assert np.allclose(optima, 3)
+
+
+def test_plugs_into_newton():
+    n = 3
+    f = lambda x: np.sum(np.exp(x) - 2 * x, axis=-1)
+    x, _, _, converged = solve_kkt(vector_gradient(f), lambda x: np.zeros((len(x), 0)),
+                                   lambda x: np.zeros((len(x), 0, n)), np.zeros(n),
+                                   hess_L=lambda x, lam: vector_hessian(f)(x))
+    assert converged
+    assert np.allclose(x, np.log(2))
+
+
+def test_plugs_into_gauss_newton():
+    x = np.linspace(0.1, 5, 100)
+    y = non_linear_least_squares.f(x, 2, 3)
+    params = gauss_newton_streaming(jacobian(non_linear_least_squares.f, argnums=(1, 2)),
+                                    non_linear_least_squares.f_loss, x, y, [2.5, 2.5], 1e-12, 50, chunk_size=32)
+    assert np.allclose(params, [2, 3])
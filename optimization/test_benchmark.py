@@ -0,0 +1,22 @@
+import json
+
+import pytest
+from benchmark import SOLVERS, compare, run_benchmarks
+
+
+def test_all_solvers_run():
+    results = run_benchmarks(dimensions=(5,), conditions=(10.0,), repeat=1)
+    assert [result["solver"] for result in results] == list(SOLVERS)
+    for result in results:
+        assert result["time"] >= 0
+        assert result["peak_memory"] > 0
+        assert result["iterations"] > 0
+    json.dumps(results)
+
+
+def test_compare_finds_regressions():
+    old = [{"solver": "cg", "dim": 5, "condition": 10.0, "time": 1.0, "iterations": 3, "f_evaluations": 0,
+            "grad_evaluations": 0, "matvecs": 3}]
+    new = [dict(old[0], time=2.0, matvecs=4)]
+    assert len(compare(old, new)) == 2
+    assert compare(old, old) == []
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from stopping import DEFAULT, AnyOf, GradientNorm, IterationState, Monitor, Profiler, RelativeFChange, StepSize, WallClock
+import x_squared
+import xy_squared
+from line_search import ArmijoLineSearch, Objective, minimize
+
+
+def state(x, fx, gradient, x_old, fx_old):
+    return IterationState(1, x, fx, gradient, x_old, fx_old, 0, 0)
+
+
+def test_criteria():
+    assert GradientNorm(1e-3)(state(1.0, 1.0, np.array([3e-4, 4e-4]), 0.0, 2.0))
+    assert not GradientNorm(1e-3)(state(1.0, 1.0, np.array([3e-3, 4e-3]), 0.0, 2.0))
+    assert not GradientNorm(1.0)(state(1.0, 1.0, None, 0.0, 2.0))
+    assert StepSize(0.1)(state(np.array([1.0, 1.05]), 1.0, None, np.array([1.0, 1.0]), 2.0))
+    assert not StepSize(0.0)(state(1.0, 1.0, None, 0.5, 2.0))
+    assert RelativeFChange(1e-3)(state(0.0, 1000.0, None, 0.0, 1000.5))
+    assert not RelativeFChange(1e-3)(state(0.0, 0.1, None, 0.0, 0.2))
+    assert not RelativeFChange(1.0)(state(0.0, None, None, 0.0, None))
+
+
+def test_any_of_reports_the_criterion_that_fired():
+    step = StepSize(1.0)
+    criterion = GradientNorm(0.0) | step | RelativeFChange(0.0)
+    assert isinstance(criterion, AnyOf) and len(criterion.criteria) == 3
+    assert criterion.needs_f and not DEFAULT.needs_f
+    monitor = Monitor(criterion)
+    monitor.start()
+    assert monitor.update(1, 1.0, 1.0, 1.0, 0.5, 2.0, 0, 0)
+    assert monitor.reason is step
+
+
+def test_default_only_stops_at_a_fixed_point():
+    # tau = 0.5 jumps to the minimum of x² in one step, afterwards the iterates do not change.
+    profiler = Profiler()
+    assert x_squared.optimize_without_backtracking(8, 0.5, 10_000, False, callback=profiler) == 0
+    assert len(profiler) == 1
+    assert x_squared.optimize_without_backtracking(8, 0.09, 100, False) < 1e-7
+    # On a run that only converges approximately DEFAULT never fires, a tolerance is needed to stop early.
+    profiler = Profiler()
+    x_squared.optimize_without_backtracking(8, 0.09, 1000, False, callback=profiler)
+    assert len(profiler) == 1000
+    profiler = Profiler()
+    x_squared.optimize_without_backtracking(8, 0.09, 1000, False, stop=GradientNorm(1e-8), callback=profiler)
+    assert len(profiler) < 150
+
+
+def test_gradient_norm_stops_early():
+    profiler = Profiler()
+    x = x_squared.optimize_with_backtracking(8, 1e-4, 0.9, 100_000, False, stop=GradientNorm(1e-10), callback=profiler)
+    assert abs(2 * x) <= 1e-10
+    assert len(profiler) < 1000
+    assert profiler.times.shape == (len(profiler),)
+    assert np.all(np.diff(profiler.n_f) >= 1)
+    assert profiler.n_grad[-1] == len(profiler) + 1
+
+
+def test_relative_f_change_and_wall_clock():
+    profiler = Profiler()
+    xy_squared.optimize_without_backtracking(1, 1, 0.1, 100_000, False, stop=RelativeFChange(1e-12), callback=profiler)
+    assert len(profiler) < 1000
+    assert profiler.n_f[-1] == len(profiler) + 1
+
+    profiler = Profiler()
+    xy_squared.optimize_without_backtracking(1, 1, 1e-12, 10 ** 9, False, stop=WallClock(0.05), callback=profiler)
+    assert 0.04 < profiler.times.sum() < 5
+
+
+def test_minimize_with_stop():
+    objective = Objective(lambda x: x @ x, lambda x: 2 * x)
+    x, _, _, iterations = minimize(objective, np.array([1.0, -2.0]), ArmijoLineSearch(beta=0.9), 10_000,
+                                   stop=StepSize(1e-6))
+    assert iterations < 10_000
+    assert np.linalg.norm(x) < 1e-4
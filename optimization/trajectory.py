@@ -0,0 +1,185 @@
+"""
+Recording and rendering of optimizer trajectories.
+
+The optimizers take an optional recorder and call recorder.record(x, fx) once
+for the start point and once per iteration. Without a recorder nothing is
+stored and nothing plotting related is allocated.
+
+Trajectory is an array-backed recorder. Its buffers are allocated once (they
+only grow if more iterates than expected arrive) and with every=k only every
+k-th iterate is kept.
+
+Rendering is separate and lazy: matplotlib is imported and the function is
+evaluated on a grid only when one of the render_* functions is called.
+
+Example:
+    trajectory = Trajectory.for_iterations(100, dim=2, every=5)
+    optimize_with_backtracking(1, 1, 1e-4, 0.8, 100, False, recorder=trajectory)
+    render_surface(trajectory, f, (-1, 1), (-1, 1))
+"""
+import numpy as np
+
+
+class Trajectory:
+    """
+    Preallocated buffer of iterates and function values with decimation.
+    """
+
+    def __init__(self, capacity: int, dim: int, every: int = 1) -> None:
+        if every < 1:
+            raise ValueError(f"every must be >= 1, got {every}")
+        self.every = every
+        self._points = np.empty((max(capacity, 1), dim))
+        self._values = np.empty(max(capacity, 1))
+        self._iterations = np.empty(max(capacity, 1), dtype=int)
+        self._size = 0
+        self._count = 0
+
+    @classmethod
+    def for_iterations(cls, max_iterations: int, dim: int, every: int = 1) -> "Trajectory":
+        """
+        Trajectory with room for the start point and max_iterations iterates.
+        """
+        return cls(max_iterations // every + 1, dim, every)
+
+    def record(self, x, fx) -> None:
+        """
+        Record the iterate x with function value fx, unless it is decimated away.
+        """
+        count = self._count
+        self._count += 1
+        if count % self.every:
+            return
+        if self._size == len(self._values):
+            self._grow()
+        self._points[self._size] = np.ravel(x)
+        self._values[self._size] = fx
+        self._iterations[self._size] = count
+        self._size += 1
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._values)
+        self._points = np.resize(self._points, (capacity, self._points.shape[1]))
+        self._values = np.resize(self._values, capacity)
+        self._iterations = np.resize(self._iterations, capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def points(self) -> np.ndarray:
+        """Recorded iterates, shape (len, dim)."""
+        return self._points[:self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Recorded function values, shape (len,)."""
+        return self._values[:self._size]
+
+    @property
+    def iterations(self) -> np.ndarray:
+        """Iteration number of every recorded iterate (0 is the start point)."""
+        return self._iterations[:self._size]
+
+
+def _animate(points: tuple, draw_point, pause: float) -> None:
+    """
+    Show the recorded points one after another by moving a single artist.
+    """
+    from matplotlib import pyplot as plt
+
+    artist = None
+    for point in zip(*points):
+        if artist is not None:
+            artist.remove()
+        artist = draw_point(*point)
+        plt.pause(pause)
+
+
+def render_curve(trajectory: Trajectory, f, xlim: tuple, title: str = None, animate: bool = True,
+                 pause: float = 0.0001, resolution: int = 1000) -> None:
+    """
+    Plot f: R -> R and the recorded iterates.
+
+    Parameters:
+    - trajectory (Trajectory): Recorded iterates.
+    - f (callable): The function.
+    - xlim (tuple): Plot range of x.
+    - title (str): Figure title.
+    - animate (bool): Show the iterates one by one instead of all at once.
+    - pause (float): Pause between two animation frames.
+    - resolution (int): Number of grid points.
+    """
+    from matplotlib import pyplot as plt
+
+    x = np.linspace(*xlim, resolution)
+    plt.figure(num=title)
+    plt.xlabel("x")
+    plt.ylabel("y")
+    plt.plot(x, f(x))
+    points = (trajectory.points[:, 0], trajectory.values)
+    if animate:
+        _animate(points, lambda px, py: plt.scatter(px, py, color="red"), pause)
+    else:
+        plt.scatter(*points, color="red")
+    plt.show()
+
+
+def render_surface(trajectory: Trajectory, f, xlim: tuple, ylim: tuple, title: str = None, animate: bool = True,
+                   pause: float = 0.01, resolution: int = 200) -> None:
+    """
+    Plot the surface of f: R² -> R and the recorded iterates.
+
+    Parameters:
+    - trajectory (Trajectory): Recorded iterates.
+    - f (callable): The function f(x, y).
+    - xlim (tuple): Plot range of x.
+    - ylim (tuple): Plot range of y.
+    - title (str): Figure title.
+    - animate (bool): Show the iterates one by one instead of all at once.
+    - pause (float): Pause between two animation frames.
+    - resolution (int): Number of grid points per axis.
+    """
+    from matplotlib import pyplot as plt
+
+    X, Y = np.meshgrid(np.linspace(*xlim, resolution), np.linspace(*ylim, resolution))
+    plt.figure(num=title)
+    ax = plt.subplot(projection="3d", computed_zorder=False)
+    ax.plot_surface(X, Y, f(X, Y), cmap="viridis", zorder=0)
+    points = (trajectory.points[:, 0], trajectory.points[:, 1], trajectory.values)
+    if animate:
+        _animate(points, lambda px, py, pz: ax.scatter(px, py, pz, color="red", zorder=1), pause)
+    else:
+        ax.scatter(*points, color="red", zorder=1)
+    plt.show()
+
+
+def render_contour(trajectory: Trajectory, f, xlim: tuple, ylim: tuple, constraint=None, title: str = None,
+                   resolution: int = 400) -> None:
+    """
+    Plot the contour lines of f: R² -> R, optionally the zero level of a constraint, and the recorded iterates.
+
+    Parameters:
+    - trajectory (Trajectory): Recorded iterates, the first two coordinates are plotted.
+    - f (callable): The function f(x, y).
+    - xlim (tuple): Plot range of x.
+    - ylim (tuple): Plot range of y.
+    - constraint (callable): Constraint c(x, y), its zero level is drawn in red.
+    - title (str): Figure title.
+    - resolution (int): Number of grid points per axis.
+    """
+    from matplotlib import pyplot as plt
+
+    X, Y = np.meshgrid(np.linspace(*xlim, resolution), np.linspace(*ylim, resolution))
+    plt.figure(num=title)
+    plt.contour(X, Y, f(X, Y), levels=20, cmap="viridis")
+    if constraint is not None:
+        plt.contour(X, Y, constraint(X, Y), levels=[0], colors="red")
+    points = trajectory.points
+    plt.scatter(points[:, 0], points[:, 1], color="green", marker="x")
+    for iteration, (px, py) in zip(trajectory.iterations, points[:, :2]):
+        plt.text(px, py, str(iteration), color="black", fontsize=8, ha="right", va="bottom")
+    plt.xlabel("x")
+    plt.ylabel("y")
+    plt.grid(True)
+    plt.show()
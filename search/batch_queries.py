@@ -0,0 +1,158 @@
+"""
+Parallel execution of many independent path queries on one static graph.
+
+The CSR arrays of the graph (and optionally a heuristic array) are copied once
+into multiprocessing.shared_memory. Every worker process attaches to the
+blocks when it starts and wraps them in a CSRGraph without copying or
+unpickling the graph, so only the queries and the resulting paths cross
+process boundaries.
+
+Queries and paths are sent as integer vertex ids, the labels stay in the
+parent process.
+
+Example:
+    for result in batch_queries(graph, [('S', 'G1'), ('S', 'G2'), ('A', 'G3')], algorithm="ucs"):
+        print(result.start, result.target, result.path, result.cost, result.seconds)
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from search_algorithms import (a_star, as_graph, bidirectional_search, breadth_first_search, path_cost,
+                               uniform_cost_search)
+
+ALGORITHMS = {
+    "bfs": lambda graph, h, start, target: breadth_first_search(graph, start, target),
+    "bidirectional": lambda graph, h, start, target: bidirectional_search(graph, start, target),
+    "ucs": lambda graph, h, start, target: uniform_cost_search(graph, start, target),
+    "astar": lambda graph, h, start, target: a_star(graph, h, start, target),
+}
+
+
+class QueryResult(NamedTuple):
+    index: int
+    start: Any
+    target: Any
+    path: list
+    cost: float
+    seconds: float
+
+
+class SharedGraph:
+    """
+    CSR arrays of a graph (and a heuristic array) in shared memory blocks.
+
+    Use as a context manager, the blocks are released when it exits.
+    """
+
+    def __init__(self, graph: CSRGraph, heuristic: np.ndarray = None) -> None:
+        arrays = {"indptr": graph.indptr, "indices": graph.indices, "weights": graph.weights}
+        if heuristic is not None:
+            arrays["heuristic"] = np.asarray(heuristic, dtype=float)
+        self._blocks = []
+        self.descriptor = {}
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.descriptor[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedGraph":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a block without tracking it, only its creator unlinks it.
+
+    Before Python 3.13 attaching always registers the block, but the workers
+    share the resource tracker of the parent, which already tracks it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+# State of a worker process, set by _initialize.
+_worker = {}
+
+
+def _initialize(descriptor: dict) -> None:
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in descriptor.items():
+        block = _attach(block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    size = len(arrays["indptr"]) - 1
+    _worker["blocks"] = blocks
+    _worker["graph"] = CSRGraph(range(size), arrays["indptr"], arrays["indices"], arrays["weights"])
+    _worker["heuristic"] = arrays.get("heuristic")
+
+
+def _run(algorithm: str, queries: list) -> list:
+    """
+    Run a chunk of (index, start, target) queries in a worker, returns (index, path, cost, seconds) per query.
+    """
+    graph, heuristic = _worker["graph"], _worker["heuristic"]
+    search = ALGORITHMS[algorithm]
+    results = []
+    for index, start, target in queries:
+        begin = time.perf_counter()
+        path = search(graph, heuristic, start, target)
+        cost = path_cost(graph, path) if path else float("inf")
+        results.append((index, path, cost, time.perf_counter() - begin))
+    return results
+
+
+def batch_queries(G, queries: Iterable, algorithm: str = "ucs", heuristic=None, processes: int = None,
+                  chunk_size: int = 64) -> Iterator[QueryResult]:
+    """
+    Run many (start, target) queries in a process pool on a shared-memory copy of the graph.
+
+    The results are yielded in completion order, result.index is the position
+    of the query in queries.
+
+    Parameters:
+    - G (CSRGraph | dict): The graph, a dict holds (neighbor, weight) lists for "ucs" and "astar".
+    - queries (Iterable): (start, target) label pairs.
+    - algorithm (str): One of ALGORITHMS: "bfs", "bidirectional", "ucs" or "astar".
+    - heuristic (dict | np.ndarray): Heuristic for "astar", one value per vertex (one target per batch).
+    - processes (int): Number of worker processes, os.cpu_count() by default.
+    - chunk_size (int): Number of queries sent to a worker at once.
+
+    Returns:
+    Iterator[QueryResult]: One result per query, cost is inf if the target is not reachable.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}")
+    if algorithm == "astar" and heuristic is None:
+        raise ValueError("algorithm 'astar' needs a heuristic")
+    graph = as_graph(G, weighted=algorithm in ("ucs", "astar"))
+    queries = [(i, graph.vertex(start), graph.vertex(target)) for i, (start, target) in enumerate(queries)]
+    h = graph.heuristic(heuristic) if heuristic is not None else None
+
+    with SharedGraph(graph, h) as shared, \
+            ProcessPoolExecutor(processes or os.cpu_count(), initializer=_initialize,
+                                initargs=(shared.descriptor,)) as executor:
+        futures = [executor.submit(_run, algorithm, queries[i:i + chunk_size])
+                   for i in range(0, len(queries), chunk_size)]
+        for future in as_completed(futures):
+            for index, path, cost, seconds in future.result():
+                _, start, target = queries[index]
+                yield QueryResult(index, graph.labels[start], graph.labels[target], graph.to_labels(path), cost,
+                                  seconds)
@@ -0,0 +1,244 @@
+"""
+Empirical scaling of the search algorithms.
+
+Runs BFS, DFS, greedy best first search, uniform cost search and A* on
+synthetic graph families of increasing size and reports per query (mean over
+the same random start/target pairs for every algorithm):
+
+- wall time
+- expanded vertices, generated vertices (scanned edges)
+- peak frontier size and heap operations
+
+Graph families (undirected, every vertex has coordinates, which give the
+Euclidean distance to the target as an admissible and consistent heuristic):
+- random: uniform random edges, average degree 2 * degree, weight = distance.
+- grid: side x side 4-neighbor grid, weight = 1 + uniform(0, 1).
+- scale_free: Barabasi-Albert preferential attachment with m edges per new
+  vertex, weight = distance.
+
+For every family and algorithm the slope of log(time) and log(expansions)
+over log(V) is fitted, so a slope near 1 means linear scaling. The results are
+saved as JSON and optionally plotted on log-log axes.
+
+Usage:
+    python benchmark.py --sizes 1000 10000 100000 --output results.json
+    python benchmark.py --families grid --algorithms ucs astar --plot scaling.png
+"""
+import argparse
+import json
+import math
+import platform
+import time
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from search_algorithms import a_star, best_first_search, breadth_first_search, depth_first_search, uniform_cost_search
+from search_stats import SearchStats
+
+SIZES = (1_000, 10_000, 100_000)
+QUERIES = 20
+
+ALGORITHMS = {
+    "bfs": lambda graph, h, start, target, stats: breadth_first_search(graph, start, target, stats=stats),
+    "dfs": lambda graph, h, start, target, stats: depth_first_search(graph, start, target, stats=stats),
+    "greedy": lambda graph, h, start, target, stats: best_first_search(graph, h, start, target, stats=stats),
+    "ucs": lambda graph, h, start, target, stats: uniform_cost_search(graph, start, target, stats=stats),
+    "astar": lambda graph, h, start, target, stats: a_star(graph, h, start, target, stats=stats),
+}
+
+
+def _undirected(size: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> CSRGraph:
+    keep = sources != targets
+    sources, targets, weights = sources[keep], targets[keep], weights[keep]
+    return CSRGraph.from_edges(np.concatenate([sources, targets]), np.concatenate([targets, sources]),
+                               np.concatenate([weights, weights]), labels=range(size))
+
+
+def _distances(coordinates: np.ndarray, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    return np.linalg.norm(coordinates[sources] - coordinates[targets], axis=1)
+
+
+def random_graph(size: int, degree: int = 2, seed: int = 0) -> tuple:
+    """
+    Random graph with size * degree undirected edges between points in a square of area size.
+
+    Returns:
+    tuple: (graph, coordinates)
+    """
+    rng = np.random.default_rng(seed)
+    coordinates = rng.uniform(0, math.sqrt(size), size=(size, 2))
+    sources, targets = rng.integers(size, size=(2, size * degree))
+    return _undirected(size, sources, targets, _distances(coordinates, sources, targets)), coordinates
+
+
+def grid_graph(size: int, seed: int = 0) -> tuple:
+    """
+    4-neighbor grid with about size vertices and weights in [1, 2).
+
+    Returns:
+    tuple: (graph, coordinates)
+    """
+    rng = np.random.default_rng(seed)
+    side = max(math.isqrt(size), 2)
+    vertices = np.arange(side * side).reshape(side, side)
+    sources = np.concatenate([vertices[:, :-1].ravel(), vertices[:-1, :].ravel()])
+    targets = np.concatenate([vertices[:, 1:].ravel(), vertices[1:, :].ravel()])
+    coordinates = np.stack([vertices.ravel() // side, vertices.ravel() % side], axis=1).astype(float)
+    return _undirected(side * side, sources, targets, 1 + rng.random(sources.size)), coordinates
+
+
+def scale_free_graph(size: int, m: int = 2, seed: int = 0) -> tuple:
+    """
+    Barabasi-Albert graph: every new vertex is connected to m existing vertices chosen proportional to their degree.
+
+    Returns:
+    tuple: (graph, coordinates)
+    """
+    rng = np.random.default_rng(seed)
+    coordinates = rng.uniform(0, math.sqrt(size), size=(size, 2))
+    # Every vertex appears in pool once per incident edge, so a uniform choice from pool is proportional to degree.
+    pool = list(range(m))
+    sources, targets = [], []
+    for v in range(m, size):
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(pool[int(rng.integers(len(pool)))])
+        for u in chosen:
+            sources.append(v)
+            targets.append(u)
+            pool.extend((u, v))
+    sources, targets = np.array(sources), np.array(targets)
+    return _undirected(size, sources, targets, _distances(coordinates, sources, targets)), coordinates
+
+
+FAMILIES = {"random": random_graph, "grid": grid_graph, "scale_free": scale_free_graph}
+
+
+def measure(algorithm: str, graph: CSRGraph, coordinates: np.ndarray, queries: list) -> dict:
+    """
+    Run the queries with one algorithm and return the mean counters per query.
+    """
+    search = ALGORITHMS[algorithm]
+    stats = SearchStats()
+    found = 0
+    for start, target in queries:
+        h = np.linalg.norm(coordinates - coordinates[target], axis=1)
+        found += bool(search(graph, h, start, target, stats))
+    result = {key: value / len(queries) for key, value in stats.as_dict().items() if key != "peak_frontier"}
+    del result["queries"]
+    result["time"] = result.pop("elapsed")
+    result["peak_frontier"] = stats.peak_frontier
+    result["found"] = found / len(queries)
+    return result
+
+
+def run_benchmarks(families: list = None, algorithms: list = None, sizes: tuple = SIZES, queries: int = QUERIES,
+                   seed: int = 0) -> list:
+    """
+    Run every algorithm on every graph family and size.
+
+    Parameters:
+    - families (list): Names of the graph families, all by default.
+    - algorithms (list): Names of the algorithms, all by default.
+    - sizes (tuple): Numbers of vertices.
+    - queries (int): Number of random start/target pairs per graph.
+    - seed (int): Seed of the graphs and queries.
+
+    Returns:
+    list: One result dict per (family, size, algorithm).
+    """
+    results = []
+    for family in families or FAMILIES:
+        for size in sizes:
+            graph, coordinates = FAMILIES[family](size, seed=seed)
+            rng = np.random.default_rng(seed)
+            pairs = rng.integers(len(graph), size=(queries, 2)).tolist()
+            for algorithm in algorithms or ALGORITHMS:
+                results.append({"family": family, "algorithm": algorithm, "vertices": len(graph),
+                                "edges": graph.num_edges, **measure(algorithm, graph, coordinates, pairs)})
+    return results
+
+
+def scaling(results: list) -> list:
+    """
+    Least squares slopes of log(time) and log(expansions) over log(vertices) per family and algorithm.
+
+    Returns:
+    list: One dict per (family, algorithm) with at least two sizes.
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault((result["family"], result["algorithm"]), []).append(result)
+    slopes = []
+    for (family, algorithm), runs in groups.items():
+        if len(runs) < 2:
+            continue
+        x = np.log([run["vertices"] for run in runs])
+        slope = lambda key: float(np.polyfit(x, np.log([max(run[key], 1e-12) for run in runs]), 1)[0])
+        slopes.append({"family": family, "algorithm": algorithm, "time_slope": slope("time"),
+                       "expansions_slope": slope("expansions")})
+    return slopes
+
+
+def plot(results: list, path: str) -> None:
+    import matplotlib.pyplot as plt
+
+    families = list(dict.fromkeys(result["family"] for result in results))
+    fig, axes = plt.subplots(2, len(families), figsize=(5 * len(families), 8), squeeze=False)
+    for column, family in enumerate(families):
+        for algorithm in dict.fromkeys(result["algorithm"] for result in results):
+            runs = [result for result in results if result["family"] == family and result["algorithm"] == algorithm]
+            vertices = [run["vertices"] for run in runs]
+            axes[0, column].loglog(vertices, [run["time"] for run in runs], "o-", label=algorithm)
+            axes[1, column].loglog(vertices, [run["expansions"] for run in runs], "o-", label=algorithm)
+        axes[0, column].set_title(family)
+        axes[0, column].set_ylabel("time per query [s]")
+        axes[1, column].set_ylabel("expansions per query")
+        axes[1, column].set_xlabel("vertices")
+        axes[0, column].legend()
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def print_table(results: list, slopes: list) -> None:
+    header = f"{'family':<11} {'algorithm':<7} {'V':>8} {'E':>9} {'time [ms]':>10} {'expanded':>10} " \
+             f"{'generated':>10} {'peak':>8} {'heap ops':>10} {'found':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['family']:<11} {r['algorithm']:<7} {r['vertices']:>8} {r['edges']:>9} {1e3 * r['time']:>10.3f} "
+              f"{r['expansions']:>10.0f} {r['generated']:>10.0f} {r['peak_frontier']:>8} "
+              f"{r['heap_pushes'] + r['heap_pops']:>10.0f} {r['found']:>6.2f}")
+    if slopes:
+        print()
+        print(f"{'family':<11} {'algorithm':<7} {'time ~ V^k':>11} {'expanded ~ V^k':>15}")
+        for s in slopes:
+            print(f"{s['family']:<11} {s['algorithm']:<7} {s['time_slope']:>11.2f} {s['expansions_slope']:>15.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how the search algorithms scale with the graph size.")
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), help="Graph families, all by default.")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), help="Algorithms, all by default.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="Numbers of vertices.")
+    parser.add_argument("--queries", type=int, default=QUERIES, help="Random queries per graph.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--plot", help="Save log-log scaling curves to this image file.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.families, args.algorithms, tuple(args.sizes), args.queries, args.seed)
+    slopes = scaling(results)
+    print_table(results, slopes)
+    if args.output:
+        metadata = {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                    "date": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        with open(args.output, "w") as file:
+            json.dump({"metadata": metadata, "results": results, "scaling": slopes}, file, indent=2)
+    if args.plot:
+        plot(results, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Compact graph representation for the search algorithms.
+
+Vertex labels (any hashable, e.g. 'A' or a node id) are interned to the
+integers 0..V-1. The adjacency is stored in CSR form:
+
+    indptr  (V+1,)  the out-edges of vertex u are indptr[u]:indptr[u+1]
+    indices (E,)    target vertex of every edge
+    weights (E,)    weight of every edge (1.0 for unweighted graphs)
+
+The out-edges of a vertex keep the order in which they were given, so the
+traversal order of BFS/DFS is the same as on the dict-of-lists graphs of the
+notebook. Parallel edges are merged into one edge with the minimum weight.
+
+The search algorithms keep their per-query state in a Workspace: visited
+marks, costs and parents are arrays of length V that are allocated once per
+graph and reused. Instead of clearing them, every query gets a new generation
+number and a vertex counts as visited only if its stamp equals the current
+generation, so starting a query is O(1) instead of O(V).
+
+Example:
+    graph = CSRGraph.from_adjacency({'A': ['B', 'C'], 'B': ['D'], 'C': [], 'D': []})
+    graph = CSRGraph.from_adjacency({'S': [('A', 5), ('B', 9)], 'A': [('B', 3)], 'B': []}, weighted=True)
+"""
+from collections.abc import Sequence
+from typing import Any, Hashable, Iterable
+
+import numpy as np
+
+
+def merge_parallel_edges(sources: np.ndarray, targets: np.ndarray, weights: np.ndarray, size: int) -> tuple:
+    """
+    Merge parallel edges into one edge with the minimum weight, at the position of the first one.
+
+    Returns:
+    tuple: (sources, targets, weights) without parallel edges, otherwise in the given order.
+    """
+    keys = sources * size + targets
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if len(keys) else keys
+    if len(starts) == len(keys):
+        return sources, targets, weights
+    minimum = np.minimum.reduceat(weights[order], starts)
+    first = order[starts]
+    restore = np.argsort(first)
+    return sources[first[restore]], targets[first[restore]], minimum[restore]
+
+
+class Workspace:
+    """
+    Reusable per-query buffers of a graph with V vertices.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.stamp = np.zeros(size, dtype=np.int64)
+        self.cost = np.empty(size)
+        self.parent = np.empty(size, dtype=np.int64)
+        # Expanded vertices (closed set) and memoized heuristic values, valid under the same generation.
+        self.closed = np.zeros(size, dtype=np.int64)
+        self.h_stamp = np.zeros(size, dtype=np.int64)
+        self.h_value = np.empty(size)
+        self.generation = 0
+
+    def begin(self) -> int:
+        """
+        Start a new query, all vertices become unvisited. Returns the new generation.
+        """
+        self.generation += 1
+        return self.generation
+
+    def visit(self, vertex: int, parent: int = -1, cost: float = 0.0) -> None:
+        self.stamp[vertex] = self.generation
+        self.parent[vertex] = parent
+        self.cost[vertex] = cost
+
+    def visited(self, vertex: int) -> bool:
+        return self.stamp[vertex] == self.generation
+
+    def path(self, start: int, target: int) -> list:
+        """
+        Follow the parents from target back to start. Returns [] if target was not reached.
+        """
+        if self.stamp[target] != self.generation:
+            return []
+        path = [target]
+        while path[-1] != start:
+            path.append(int(self.parent[path[-1]]))
+        path.reverse()
+        return path
+
+
+class IdentityIndex:
+    """
+    Label -> vertex lookup of a graph whose labels are its vertex ids 0..size-1.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+
+    def __getitem__(self, label: int) -> int:
+        if not 0 <= label < self.size:
+            raise KeyError(label)
+        return int(label)
+
+
+class CSRGraph:
+    """
+    Directed weighted graph with interned vertex labels and CSR adjacency arrays.
+    """
+
+    def __init__(self, labels: list, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 index: dict = None) -> None:
+        # Sequences (lists, ranges, label tables of graph files) are used as they are.
+        self.labels = labels if isinstance(labels, Sequence) else list(labels)
+        if index is None:
+            index = IdentityIndex(len(labels)) if isinstance(labels, range) and labels.start == 0 and \
+                labels.step == 1 else {label: i for i, label in enumerate(self.labels)}
+        self.index = index
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self._workspace = None
+        self._reverse = None
+
+    @classmethod
+    def from_edges(cls, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray = None,
+                   labels: list = None) -> "CSRGraph":
+        """
+        Build a graph from integer edge arrays.
+
+        Parameters:
+        - sources (np.ndarray): Source vertex of every edge.
+        - targets (np.ndarray): Target vertex of every edge.
+        - weights (np.ndarray): Edge weights, 1.0 by default.
+        - labels (list): Vertex labels, 0..V-1 by default.
+
+        Returns:
+        CSRGraph: The graph.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=float)
+        size = len(labels) if labels is not None else int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        if labels is None:
+            labels = range(size)
+
+        sources, targets, weights = merge_parallel_edges(sources, targets, weights, size)
+        # Stable sort by source keeps the given order of the out-edges of every vertex.
+        order = np.argsort(sources, kind="stable")
+        index_dtype = np.int32 if size < 2 ** 31 else np.int64
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+        return cls(labels, indptr, targets[order].astype(index_dtype), weights[order])
+
+    @classmethod
+    def from_adjacency(cls, adjacency: dict, weighted: bool = False) -> "CSRGraph":
+        """
+        Build a graph from a dict of lists, e.g. {'A': ['B', 'C'], ...}, with weighted=True from a dict of
+        (neighbor, weight) lists, e.g. {'S': [('A', 5), ...], ...}, or from a dict of dicts {'S': {'A': 5, ...}, ...}.
+
+        Without weighted=True every neighbor is a label (tuples too, e.g. grid coordinates) and every edge has
+        weight 1. A dict of neighbors is always weighted. Vertices that only appear as neighbors are added as well.
+        """
+        index = {}
+        for vertex in adjacency:
+            index.setdefault(vertex, len(index))
+        sources, targets, weights = [], [], []
+        for vertex, neighbors in adjacency.items():
+            if isinstance(neighbors, dict):
+                neighbors = neighbors.items()
+            elif not weighted:
+                neighbors = [(neighbor, 1.0) for neighbor in neighbors]
+            for label, weight in neighbors:
+                sources.append(index[vertex])
+                targets.append(index.setdefault(label, len(index)))
+                weights.append(weight)
+        return cls.from_edges(np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64),
+                              np.array(weights, dtype=float), list(index))
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def vertex(self, label: Hashable) -> int:
+        """Integer id of a vertex label."""
+        return self.index[label]
+
+    def label(self, vertex: int) -> Any:
+        """Label of an integer vertex id."""
+        return self.labels[vertex]
+
+    def to_labels(self, vertices: Iterable) -> list:
+        return [self.labels[v] for v in vertices]
+
+    def neighbors(self, vertex: int) -> np.ndarray:
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def edge_weights(self, vertex: int) -> np.ndarray:
+        return self.weights[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def gather(self, vertices: np.ndarray) -> tuple:
+        """
+        Out-edges of many vertices at once.
+
+        Returns:
+        tuple: (targets, owners, edges), owners[i] is the position in vertices of the source of edge i.
+        """
+        begin, end = self.indptr[vertices], self.indptr[vertices + 1]
+        counts = end - begin
+        owners = np.repeat(np.arange(len(vertices)), counts)
+        offsets = np.cumsum(counts) - counts
+        edges = begin[owners] + np.arange(owners.size) - offsets[owners]
+        return self.indices[edges], owners, edges
+
+    def heuristic(self, h) -> np.ndarray:
+        """
+        Heuristic as an array over the vertices, from a dict {label: value} or an array.
+        Callables are evaluated lazily by the search algorithms instead.
+        """
+        if isinstance(h, dict):
+            return np.array([h[label] for label in self.labels], dtype=float)
+        return np.asarray(h, dtype=float)
+
+    def reverse(self) -> "CSRGraph":
+        """
+        The graph with all edges reversed, built on first use. It shares the labels and has its own Workspace.
+        """
+        if self._reverse is None:
+            sources = np.repeat(np.arange(len(self), dtype=self.indices.dtype), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=len(self)), out=indptr[1:])
+            self._reverse = CSRGraph(self.labels, indptr, sources[order], self.weights[order], self.index)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def workspace(self) -> Workspace:
+        """
+        The reusable buffers of this graph, allocated on first use.
+        """
+        if self._workspace is None:
+            self._workspace = Workspace(len(self))
+        return self._workspace
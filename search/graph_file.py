@@ -0,0 +1,311 @@
+"""
+Binary on-disk graph format, opened with np.memmap.
+
+A graph file holds the CSR arrays of a CSRGraph and its labels:
+
+    header        magic b"CSRGRAF1", version, flags, V, E and the byte offset of every section
+    indptr        int64 (V+1,)
+    indices       int32 (E,), int64 if V >= 2^31
+    weights       float64 (E,)
+    label_offsets int64 (V+1,)   label i is label_bytes[label_offsets[i]:label_offsets[i+1]] (UTF-8)
+    label_bytes   uint8
+    label_order   int64 (V,)     vertex ids sorted by label, for binary search
+
+All integers are little endian and every section starts at a multiple of 64
+bytes. Graphs whose labels are 0..V-1 have no label sections. Any other labels
+are stored as str(label), so an opened graph has string labels: a graph with
+labels 1, 2, 3 or ('A', 1) is searched with '1' or "('A', 1)" after a round trip.
+
+open_graph maps the sections instead of reading them, so opening a graph
+takes milliseconds regardless of its size and the OS only loads the pages a
+search touches. Labels are decoded on access and looked up by binary search,
+so no Python object per vertex is created either.
+
+import_csv builds a graph file from an edge list "source,target[,weight]". It
+reads the CSV in chunks and sorts the edges on disk; apart from the chunk
+only the label dictionary and O(V) integer arrays are held in memory.
+
+Example:
+    import_csv("roads.csv", "roads.graph", directed=False)
+    graph = open_graph("roads.graph")
+    uniform_cost_search(graph, "Freiburg", "Basel")
+"""
+import csv
+import os
+import struct
+import tempfile
+from collections.abc import Sequence
+
+import numpy as np
+
+from csr_graph import CSRGraph, merge_parallel_edges
+
+MAGIC = b"CSRGRAF1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIqq6q")
+ALIGNMENT = 64
+SECTIONS = ("indptr", "indices", "weights", "label_offsets", "label_bytes", "label_order")
+
+# Flags
+LABELS = 1
+INT64_INDICES = 2
+
+
+class LabelTable(Sequence):
+    """
+    Read-only sequence of the labels stored in a graph file, decoded on access.
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray) -> None:
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+
+class LabelIndex:
+    """
+    Label -> vertex lookup by binary search over the vertices sorted by label.
+    """
+
+    def __init__(self, labels: LabelTable, order: np.ndarray) -> None:
+        self.labels = labels
+        self.order = order
+
+    def __getitem__(self, label: str) -> int:
+        # The stored labels are strings, other labels cannot match (and do not compare with them).
+        if not isinstance(label, str):
+            raise KeyError(label)
+        low, high = 0, len(self.order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.labels[int(self.order[middle])] < label:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.order) and self.labels[int(self.order[low])] == label:
+            return int(self.order[low])
+        raise KeyError(label)
+
+    def __contains__(self, label: str) -> bool:
+        try:
+            self[label]
+        except KeyError:
+            return False
+        return True
+
+
+class _Writer:
+    """
+    Appends aligned sections to a graph file, the header is written last.
+    """
+
+    def __init__(self, file) -> None:
+        self.file = file
+        self.offsets = dict.fromkeys(SECTIONS, 0)
+        file.write(bytes(HEADER.size))
+
+    def begin(self, section: str) -> None:
+        self.file.write(bytes(-self.file.tell() % ALIGNMENT))
+        self.offsets[section] = self.file.tell()
+
+    def write(self, array: np.ndarray) -> None:
+        self.file.write(np.ascontiguousarray(array).astype(array.dtype.newbyteorder("<"), copy=False).tobytes())
+
+    def section(self, section: str, array: np.ndarray) -> None:
+        self.begin(section)
+        self.write(array)
+
+    def labels(self, labels: list) -> None:
+        encoded = [str(label).encode() for label in labels]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(label) for label in encoded], out=offsets[1:])
+        self.section("label_offsets", offsets)
+        self.begin("label_bytes")
+        self.file.write(b"".join(encoded))
+        order = sorted(range(len(encoded)), key=encoded.__getitem__)
+        for i, j in zip(order, order[1:]):
+            if encoded[i] == encoded[j]:
+                raise ValueError(f"labels {labels[i]!r} and {labels[j]!r} are the same string")
+        self.section("label_order", np.array(order, dtype=np.int64))
+
+    def finish(self, flags: int, size: int, num_edges: int) -> None:
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, size, num_edges,
+                                    *(self.offsets[section] for section in SECTIONS)))
+
+
+def _index_dtype(size: int) -> np.dtype:
+    return np.dtype(np.int32 if size < 2 ** 31 else np.int64)
+
+
+def save_graph(graph: CSRGraph, path: str) -> None:
+    """
+    Write a graph to a graph file. Labels other than 0..V-1 are stored as strings, open_graph returns them as
+    str(label). Raises ValueError if two labels have the same string.
+    """
+    labels = graph.labels
+    has_labels = not (isinstance(labels, range) and labels == range(len(graph)))
+    flags = (LABELS if has_labels else 0) | (INT64_INDICES if len(graph) >= 2 ** 31 else 0)
+    with open(path, "wb") as file:
+        writer = _Writer(file)
+        writer.section("indptr", np.asarray(graph.indptr, dtype=np.int64))
+        writer.section("indices", np.asarray(graph.indices, dtype=_index_dtype(len(graph))))
+        writer.section("weights", np.asarray(graph.weights, dtype=np.float64))
+        if has_labels:
+            writer.labels(labels)
+        writer.finish(flags, len(graph), graph.num_edges)
+
+
+def _map(path: str, dtype, offset: int, count: int) -> np.ndarray:
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    # A plain ndarray view of the mapping, slicing np.memmap objects is much slower.
+    return np.asarray(np.memmap(path, dtype=np.dtype(dtype).newbyteorder("<"), mode="r", offset=offset,
+                                shape=(count,)))
+
+
+def open_graph(path: str) -> CSRGraph:
+    """
+    Open a graph file, the arrays are memory-mapped read-only.
+    """
+    with open(path, "rb") as file:
+        magic, version, flags, size, num_edges, *offsets = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a graph file")
+    if version != VERSION:
+        raise ValueError(f"unsupported graph file version {version}")
+    offsets = dict(zip(SECTIONS, offsets))
+    index_dtype = np.int64 if flags & INT64_INDICES else np.int32
+    indptr = _map(path, np.int64, offsets["indptr"], size + 1)
+    indices = _map(path, index_dtype, offsets["indices"], num_edges)
+    weights = _map(path, np.float64, offsets["weights"], num_edges)
+    if not flags & LABELS:
+        return CSRGraph(range(size), indptr, indices, weights)
+    label_offsets = _map(path, np.int64, offsets["label_offsets"], size + 1)
+    labels = LabelTable(label_offsets, _map(path, np.uint8, offsets["label_bytes"], int(label_offsets[-1])))
+    order = _map(path, np.int64, offsets["label_order"], size)
+    return CSRGraph(labels, indptr, indices, weights, LabelIndex(labels, order))
+
+
+def _read_chunks(csv_path: str, chunk_size: int, delimiter: str, header: bool):
+    with open(csv_path, newline="") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        if header:
+            next(reader, None)
+        chunk = []
+        for row in reader:
+            if row:
+                chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def import_csv(csv_path: str, graph_path: str, directed: bool = True, delimiter: str = ",", header: bool = False,
+               chunk_size: int = 1_000_000) -> None:
+    """
+    Build a graph file from an edge list CSV with rows "source,target[,weight]" in bounded memory.
+
+    1. The CSV is read in chunks of chunk_size rows, labels are interned and the
+       integer edges are appended to temporary files next to graph_path.
+    2. The edges are placed at their CSR position in a temporary memory-mapped
+       array, one chunk at a time (counting sort by source).
+    3. Parallel edges are merged (minimum weight) in blocks of about chunk_size
+       edges and the sections are written to graph_path.
+
+    Parameters:
+    - csv_path (str): The edge list.
+    - graph_path (str): The graph file to write.
+    - directed (bool): If False every row adds the edge in both directions.
+    - delimiter (str): CSV delimiter.
+    - header (bool): Skip the first row.
+    - chunk_size (int): Number of rows or edges processed at once.
+    """
+    index = {}
+    counts = np.zeros(0, dtype=np.int64)
+    num_edges = 0
+    directory = os.path.dirname(os.path.abspath(graph_path))
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        edges_path = os.path.join(tmp, "edges")
+        weights_path = os.path.join(tmp, "weights")
+
+        # 1. Intern the labels and spool the integer edges to disk.
+        with open(edges_path, "wb") as edges_file, open(weights_path, "wb") as weights_file:
+            for rows in _read_chunks(csv_path, chunk_size, delimiter, header):
+                sources = np.array([index.setdefault(row[0], len(index)) for row in rows], dtype=np.int64)
+                targets = np.array([index.setdefault(row[1], len(index)) for row in rows], dtype=np.int64)
+                weights = np.array([float(row[2]) if len(row) > 2 else 1.0 for row in rows])
+                if not directed:
+                    # Both directions of a row stay next to each other, so the edges keep the row order.
+                    sources, targets = np.stack([sources, targets], 1).ravel(), np.stack([targets, sources], 1).ravel()
+                    weights = np.repeat(weights, 2)
+                edges_file.write(np.stack([sources, targets], axis=1).tobytes())
+                weights_file.write(weights.tobytes())
+                if len(index) > len(counts):
+                    # Grow geometrically, padding to the exact size every chunk copies the counts each time.
+                    counts = np.pad(counts, (0, max(len(index), 2 * len(counts)) - len(counts)))
+                counts[:len(index)] += np.bincount(sources, minlength=len(index))
+                num_edges += len(sources)
+
+        size = len(index)
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(counts[:size], out=indptr[1:])
+
+        # 2. Counting sort of the edges by source into memory-mapped arrays.
+        sorted_targets = np.memmap(os.path.join(tmp, "targets"), dtype=np.int64, mode="w+", shape=(max(num_edges, 1),))
+        sorted_weights = np.memmap(os.path.join(tmp, "sorted_weights"), dtype=np.float64, mode="w+",
+                                   shape=(max(num_edges, 1),))
+        cursor = indptr[:-1].copy()
+        for begin in range(0, num_edges, chunk_size):
+            count = min(chunk_size, num_edges - begin)
+            edges = np.fromfile(edges_path, dtype=np.int64, count=2 * count, offset=16 * begin).reshape(-1, 2)
+            weights = np.fromfile(weights_path, dtype=np.float64, count=count, offset=8 * begin)
+            order = np.argsort(edges[:, 0], kind="stable")
+            sources = edges[order, 0]
+            rank = np.arange(count) - np.searchsorted(sources, sources, side="left")
+            positions = cursor[sources] + rank
+            sorted_targets[positions] = edges[order, 1]
+            sorted_weights[positions] = weights[order]
+            cursor += np.bincount(sources, minlength=size)
+
+        # 3. Merge parallel edges block by block and write the sections.
+        merged_weights_path = os.path.join(tmp, "merged_weights")
+        merged_indptr = np.zeros(size + 1, dtype=np.int64)
+        with open(graph_path, "wb") as file, open(merged_weights_path, "wb") as merged_weights:
+            writer = _Writer(file)
+            writer.begin("indices")
+            vertex = 0
+            while vertex < size:
+                end = max(int(np.searchsorted(indptr, indptr[vertex] + chunk_size, side="right")) - 1, vertex + 1)
+                end = min(end, size)
+                begin_edge, end_edge = indptr[vertex], indptr[end]
+                sources = np.repeat(np.arange(vertex, end), np.diff(indptr[vertex:end + 1]))
+                sources, targets, weights = merge_parallel_edges(sources, np.array(sorted_targets[begin_edge:end_edge]),
+                                                                 np.array(sorted_weights[begin_edge:end_edge]), size)
+                writer.write(targets.astype(_index_dtype(size)))
+                merged_weights.write(weights.tobytes())
+                merged_indptr[vertex + 1:end + 1] = np.cumsum(np.bincount(sources - vertex, minlength=end - vertex))
+                merged_indptr[vertex + 1:end + 1] += merged_indptr[vertex]
+                vertex = end
+            del sorted_targets, sorted_weights
+
+            merged_weights.flush()
+            writer.begin("weights")
+            total = int(merged_indptr[-1])
+            for begin in range(0, total, chunk_size):
+                writer.write(np.fromfile(merged_weights_path, dtype=np.float64,
+                                         count=min(chunk_size, total - begin), offset=8 * begin))
+            writer.section("indptr", merged_indptr)
+            writer.labels(list(index))
+            writer.finish(LABELS | (INT64_INDICES if size >= 2 ** 31 else 0), size, total)
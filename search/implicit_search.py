@@ -0,0 +1,276 @@
+"""
+Search on implicit state spaces.
+
+Instead of an adjacency dict the state space is given by a successor
+generator, so states are only created when the search reaches them:
+
+    successors(state) -> iterable of (next_state, cost)
+
+States can be anything hashable. Compact encodings (an int or a bytes object
+instead of nested lists) keep the visited sets small, see SlidingPuzzle which
+packs a puzzle into one int with 4 bits per tile.
+
+goal is either a goal state or a predicate goal(state) -> bool, heuristics
+are callables h(state). All functions return the path as a list of states, []
+if no goal is reachable (within the limits).
+
+breadth_first_search, uniform_cost_search and a_star store every generated
+state. iterative_deepening_search and ida_star only keep the current path, so
+their memory is linear in the solution depth, at the price of generating
+states again in every iteration.
+
+Example:
+    puzzle = SlidingPuzzle(3)
+    start = puzzle.encode([1, 2, 3, 4, 5, 6, 0, 7, 8])
+    path = ida_star(start, puzzle.goal, puzzle.successors, puzzle.manhattan)
+"""
+import heapq
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Hashable, Iterable
+
+Successors = Callable[[Hashable], Iterable]
+
+
+def _goal_test(goal) -> Callable[[Hashable], bool]:
+    return goal if callable(goal) else goal.__eq__
+
+
+def _backtrack(parents: dict, state: Hashable) -> list:
+    path = [state]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def breadth_first_search(start: Hashable, goal, successors: Successors) -> list:
+    """
+    Breadth first search, finds a path with the fewest steps (the costs of successors are ignored).
+
+    Parameters:
+    - start (Hashable): Start state.
+    - goal (Hashable | callable): Goal state or goal predicate.
+    - successors (callable): successors(state) -> iterable of (next_state, cost).
+
+    Returns:
+    list: States from start to a goal, [] if no goal is reachable.
+    """
+    is_goal = _goal_test(goal)
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if is_goal(state):
+            return _backtrack(parents, state)
+        for next_state, _ in successors(state):
+            if next_state not in parents:
+                parents[next_state] = state
+                queue.append(next_state)
+    return []
+
+
+def a_star(start: Hashable, goal, successors: Successors, h: Callable[[Hashable], float], weight: float = 1.0) -> list:
+    """
+    A* search with lazy deletion, ties in f broken toward larger g and h memoized per state.
+
+    Expanded states are closed, which assumes a consistent heuristic.
+    weight > 1 gives weighted A* (path cost at most weight times the optimum).
+
+    Parameters:
+    - start (Hashable): Start state.
+    - goal (Hashable | callable): Goal state or goal predicate.
+    - successors (callable): successors(state) -> iterable of (next_state, cost).
+    - h (callable): Admissible heuristic h(state).
+    - weight (float): Weight of the heuristic, >= 1.
+
+    Returns:
+    list: States of a cheapest path from start to a goal, [] if no goal is reachable.
+    """
+    if weight < 1:
+        raise ValueError(f"weight must be >= 1, got {weight}")
+    is_goal = _goal_test(goal)
+    costs = {start: 0}
+    parents = {start: None}
+    closed = set()
+    h_values = {}
+    # The counter keeps states that are not comparable out of the comparisons.
+    tie = count()
+    queue = [(weight * h(start), 0, next(tie), start)]
+    while queue:
+        _, g, _, state = heapq.heappop(queue)
+        g = -g
+        if state in closed or g > costs[state]:
+            continue
+        if is_goal(state):
+            return _backtrack(parents, state)
+        closed.add(state)
+        for next_state, cost in successors(state):
+            new_cost = g + cost
+            if next_state not in closed and new_cost < costs.get(next_state, float("inf")):
+                costs[next_state] = new_cost
+                parents[next_state] = state
+                h_value = h_values.get(next_state)
+                if h_value is None:
+                    h_value = h_values[next_state] = h(next_state)
+                heapq.heappush(queue, (new_cost + weight * h_value, -new_cost, next(tie), next_state))
+    return []
+
+
+def uniform_cost_search(start: Hashable, goal, successors: Successors) -> list:
+    """
+    Uniform cost search (Dijkstra), A* without heuristic.
+
+    Returns:
+    list: States of a cheapest path from start to a goal, [] if no goal is reachable.
+    """
+    return a_star(start, goal, successors, lambda state: 0)
+
+
+def iterative_deepening_search(start: Hashable, goal, successors: Successors, max_depth: int = 100) -> list:
+    """
+    Iterative deepening depth first search, finds a path with the fewest steps in O(depth) memory.
+
+    Depth-limited DFS is repeated with the limits 0, 1, ..., max_depth. States
+    on the current path are not revisited.
+
+    Parameters:
+    - start (Hashable): Start state.
+    - goal (Hashable | callable): Goal state or goal predicate.
+    - successors (callable): successors(state) -> iterable of (next_state, cost).
+    - max_depth (int): Largest depth limit.
+
+    Returns:
+    list: States from start to a goal, [] if no goal is reachable within max_depth steps.
+    """
+    is_goal = _goal_test(goal)
+    for limit in range(max_depth + 1):
+        path, cutoff = _depth_limited(start, is_goal, successors, lambda state, g, depth: depth > limit)
+        if path:
+            return path
+        if not cutoff:
+            # The whole state space was searched without hitting the limit.
+            return []
+    return []
+
+
+def _depth_limited(start: Hashable, is_goal, successors: Successors, prune) -> tuple:
+    """
+    DFS along a single path. States with prune(state, g, depth) are skipped before the goal test.
+
+    Returns:
+    tuple: (path or [], cutoff) where cutoff tells whether any state was pruned.
+    """
+    if prune(start, 0, 0):
+        return [], True
+    if is_goal(start):
+        return [start], False
+    path, on_path = [start], {start}
+    stack = [(0, iter(successors(start)))]
+    cutoff = False
+    while stack:
+        g, children = stack[-1]
+        for next_state, cost in children:
+            if next_state in on_path:
+                continue
+            if prune(next_state, g + cost, len(path)):
+                cutoff = True
+                continue
+            path.append(next_state)
+            if is_goal(next_state):
+                return path, cutoff
+            on_path.add(next_state)
+            stack.append((g + cost, iter(successors(next_state))))
+            break
+        else:
+            stack.pop()
+            on_path.discard(path.pop())
+    return [], cutoff
+
+
+def ida_star(start: Hashable, goal, successors: Successors, h: Callable[[Hashable], float],
+             max_iterations: int = 1000) -> list:
+    """
+    Iterative deepening A* (IDA*), memory linear in the solution depth.
+
+    Every iteration is a depth first search that prunes states with
+    f = g + h > threshold. The next threshold is the smallest f that was
+    pruned, so with an admissible heuristic the first path found is optimal.
+
+    Parameters:
+    - start (Hashable): Start state.
+    - goal (Hashable | callable): Goal state or goal predicate.
+    - successors (callable): successors(state) -> iterable of (next_state, cost).
+    - h (callable): Admissible heuristic h(state).
+    - max_iterations (int): Maximum number of thresholds.
+
+    Returns:
+    list: States of a cheapest path from start to a goal, [] if no goal is reachable.
+    """
+    is_goal = _goal_test(goal)
+    threshold = h(start)
+    for _ in range(max_iterations):
+        exceeded = []
+
+        def prune(state: Any, g: float, depth: int) -> bool:
+            f = g + h(state)
+            if f > threshold:
+                exceeded.append(f)
+                return True
+            return False
+
+        path, _ = _depth_limited(start, is_goal, successors, prune)
+        if path:
+            return path
+        if not exceeded:
+            return []
+        threshold = min(exceeded)
+    return []
+
+
+class SlidingPuzzle:
+    """
+    n x n sliding tile puzzle (8-puzzle for n = 3, 15-puzzle for n = 4) with states packed into one int.
+
+    Tile t at position i is stored in bits 4i..4i+3, 0 is the blank.
+    """
+
+    def __init__(self, n: int) -> None:
+        if not 2 <= n <= 4:
+            raise ValueError(f"n must be between 2 and 4, got {n}")
+        self.n = n
+        self.size = n * n
+        self.goal = self.encode(list(range(1, self.size)) + [0])
+        self._moves = [[j for j in (i - n, i + n, i - 1 if i % n else -1, i + 1 if (i + 1) % n else -1)
+                        if 0 <= j < self.size] for i in range(self.size)]
+
+    def encode(self, tiles: list) -> int:
+        state = 0
+        for i, tile in enumerate(tiles):
+            state |= tile << (4 * i)
+        return state
+
+    def decode(self, state: int) -> list:
+        return [(state >> (4 * i)) & 15 for i in range(self.size)]
+
+    def successors(self, state: int) -> list:
+        """
+        States after sliding a neighboring tile into the blank, every move costs 1.
+        """
+        blank = next(i for i in range(self.size) if not (state >> (4 * i)) & 15)
+        result = []
+        for i in self._moves[blank]:
+            tile = (state >> (4 * i)) & 15
+            result.append(((state & ~(15 << (4 * i))) | (tile << (4 * blank)), 1))
+        return result
+
+    def manhattan(self, state: int) -> int:
+        """
+        Sum of the Manhattan distances of the tiles to their goal positions (consistent).
+        """
+        n, distance = self.n, 0
+        for i in range(self.size):
+            tile = (state >> (4 * i)) & 15
+            if tile:
+                distance += abs(i // n - (tile - 1) // n) + abs(i % n - (tile - 1) % n)
+        return distance
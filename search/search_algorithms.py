@@ -0,0 +1,416 @@
+"""
+Search algorithms of search_algorithms.ipynb on the CSR graph backend.
+
+All functions take a CSRGraph (a dict-of-lists graph like in the notebook is
+converted on the fly, which costs O(V+E) per call, so convert large graphs
+once with CSRGraph.from_adjacency) and vertex labels, and return the path as a
+list of labels, [] if the target is not reachable.
+
+The visited/cost/parent state lives in the graph's Workspace and is reused by
+every query instead of allocating a dict over all vertices.
+
+Every search takes an optional stats=SearchStats() that counts expansions,
+generated vertices, the peak frontier size, heap operations and the elapsed
+time (see search_stats.py). Without it nothing is counted.
+
+Example:
+    graph = CSRGraph.from_adjacency({'A': ['B', 'C'], 'B': ['D', 'E'], 'C': ['F', 'G']})
+    breadth_first_search(graph, 'A', 'G')  # ['A', 'C', 'G']
+"""
+import heapq
+from typing import Any
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from search_stats import SearchStats, instrumented
+
+
+def as_graph(G, weighted: bool = False) -> CSRGraph:
+    """
+    CSRGraph of G, which is either a CSRGraph or a dict graph (see CSRGraph.from_adjacency, weighted says whether
+    its lists hold (neighbor, weight) pairs).
+    """
+    return G if isinstance(G, CSRGraph) else CSRGraph.from_adjacency(G, weighted)
+
+
+def path_cost(graph: CSRGraph, path: list) -> float:
+    """
+    Sum of the edge weights along a path of labels.
+    """
+    cost = 0.0
+    for u, v in zip(path, path[1:]):
+        u, v = graph.vertex(u), graph.vertex(v)
+        neighbors = graph.neighbors(u)
+        cost += float(graph.edge_weights(u)[np.flatnonzero(neighbors == v)[0]])
+    return cost
+
+
+def _expand_level(graph: CSRGraph, workspace, frontier: np.ndarray, depth: int,
+                  stats: SearchStats = None) -> np.ndarray:
+    """
+    Visit the unvisited out-neighbors of a BFS level and return them as the next level.
+
+    The out-edges of the whole level are gathered with one CSR lookup, the next
+    level is in the order a FIFO queue would visit the vertices. Every vertex
+    enters a level at most once, so a full traversal is O(V+E).
+    """
+    generation = workspace.generation
+    targets, owners, _ = graph.gather(frontier)
+    if stats is not None:
+        stats.expansions += frontier.size
+        stats.generated += targets.size
+        stats.frontier(frontier.size)
+    new = workspace.stamp[targets] != generation
+    targets, owners = targets[new], owners[new]
+    # A vertex reached from several vertices of the level belongs to the first one.
+    _, first = np.unique(targets, return_index=True)
+    first.sort()
+    level = targets[first].astype(np.int64)
+    workspace.stamp[level] = generation
+    workspace.parent[level] = frontier[owners[first]]
+    workspace.cost[level] = depth
+    return level
+
+
+@instrumented
+def breadth_first_search(G, v_start: Any, v_target: Any, traversal_order: bool = False,
+                         bidirectional: bool = False, stats: SearchStats = None) -> list:
+    """
+    Breadth first search from v_start to v_target.
+
+    The frontier is expanded one level at a time: the out-edges of all vertices
+    of a level are gathered with one CSR lookup and the unvisited targets form
+    the next level, in the same order a FIFO queue would visit them.
+
+    Parameters:
+    - G (CSRGraph | dict): The graph.
+    - v_start (Any): Start vertex.
+    - v_target (Any): Target vertex.
+    - traversal_order (bool): Print the vertices in the order they are expanded.
+    - bidirectional (bool): Use bidirectional_search (traversal_order is ignored).
+    - stats (SearchStats): Counters to update, the peak frontier is the largest level.
+
+    Returns:
+    list: Path from v_start to v_target, [] if v_target is not reachable.
+    """
+    if bidirectional:
+        return _bidirectional_search(G, v_start, v_target, stats)
+    graph = as_graph(G)
+    workspace = graph.workspace()
+    workspace.begin()
+    start, target = graph.vertex(v_start), graph.vertex(v_target)
+    workspace.visit(start, start)
+
+    levels = []
+    frontier = np.array([start])
+    while frontier.size and not workspace.visited(target):
+        levels.append(frontier)
+        frontier = _expand_level(graph, workspace, frontier, len(levels), stats)
+
+    if traversal_order:
+        order = np.concatenate(levels + [frontier]).tolist()
+        if target in order:
+            order = order[:order.index(target)]
+        print(graph.to_labels(order))
+    return graph.to_labels(workspace.path(start, target))
+
+
+@instrumented
+def bidirectional_search(G, v_start: Any, v_target: Any, stats: SearchStats = None) -> list:
+    """
+    Bidirectional breadth first search from v_start to v_target.
+
+    One BFS runs forward from v_start on the graph and one backward from
+    v_target on the reversed graph, always expanding the level of the side with
+    the smaller frontier. Once a level reaches vertices the other side has
+    visited, the meeting vertex with the shortest total distance gives a
+    shortest path. On graphs with branching factor b and distance d this visits
+    about 2 b^(d/2) instead of b^d vertices.
+
+    Parameters:
+    - G (CSRGraph | dict): The graph.
+    - v_start (Any): Start vertex.
+    - v_target (Any): Target vertex.
+    - stats (SearchStats): Counters to update.
+
+    Returns:
+    list: Shortest path (fewest edges) from v_start to v_target, [] if v_target is not reachable.
+    """
+    return _bidirectional_search(G, v_start, v_target, stats)
+
+
+def _bidirectional_search(G, v_start: Any, v_target: Any, stats: SearchStats) -> list:
+    graph = as_graph(G)
+    start, target = graph.vertex(v_start), graph.vertex(v_target)
+    if start == target:
+        return [v_start]
+    reverse = graph.reverse()
+    forward, backward = graph.workspace(), reverse.workspace()
+    forward.begin()
+    backward.begin()
+    forward.visit(start, start)
+    backward.visit(target, target)
+
+    frontiers = {True: np.array([start]), False: np.array([target])}
+    depths = {True: 0, False: 0}
+    while frontiers[True].size and frontiers[False].size:
+        side = frontiers[True].size <= frontiers[False].size
+        this, other = (forward, backward) if side else (backward, forward)
+        depths[side] += 1
+        frontiers[side] = _expand_level(graph if side else reverse, this, frontiers[side], depths[side], stats)
+        level = frontiers[side]
+        met = level[other.stamp[level] == other.generation]
+        if met.size:
+            # All vertices of the level have the same distance on this side, take the closest to the other side.
+            meeting = int(met[np.argmin(other.cost[met])])
+            head = forward.path(start, meeting)
+            tail = backward.path(target, meeting)[::-1]
+            return graph.to_labels(head + tail[1:])
+    return []
+
+
+@instrumented
+def depth_first_search(G, v_start: Any, v_target: Any, traversal_order: bool = False,
+                       stats: SearchStats = None) -> list:
+    """
+    Depth first search from v_start to v_target.
+
+    Parameters:
+    - G (CSRGraph | dict): The graph.
+    - v_start (Any): Start vertex.
+    - v_target (Any): Target vertex.
+    - traversal_order (bool): Print the vertices in the order they are expanded.
+    - stats (SearchStats): Counters to update, the frontier is the stack.
+
+    Returns:
+    list: Path from v_start to v_target, [] if v_target is not reachable.
+    """
+    graph = as_graph(G)
+    workspace = graph.workspace()
+    generation = workspace.begin()
+    start, target = graph.vertex(v_start), graph.vertex(v_target)
+    workspace.visit(start, start)
+    traversal = []
+
+    stack = [start]
+    while stack:
+        v_current = stack.pop()
+        if v_current == target:
+            break
+        # Push in reverse, so the first neighbor is expanded first.
+        neighbors = graph.neighbors(v_current)[::-1]
+        if stats is not None:
+            stats.expansions += 1
+            stats.generated += neighbors.size
+        neighbors = neighbors[workspace.stamp[neighbors] != generation]
+        workspace.stamp[neighbors] = generation
+        workspace.parent[neighbors] = v_current
+        stack.extend(neighbors.tolist())
+        if stats is not None:
+            stats.frontier(len(stack))
+        if traversal_order:
+            traversal.append(v_current)
+
+    if traversal_order:
+        print(graph.to_labels(traversal))
+    return graph.to_labels(workspace.path(start, target))
+
+
+@instrumented
+def uniform_cost_search(G, v_start: Any, v_target: Any, stats: SearchStats = None) -> list:
+    """
+    Uniform cost search (Dijkstra) from v_start to v_target.
+
+    Parameters:
+    - G (CSRGraph | dict): The weighted graph, a dict holds (neighbor, weight) lists or {neighbor: weight} dicts.
+    - v_start (Any): Start vertex.
+    - v_target (Any): Target vertex.
+    - stats (SearchStats): Counters to update, the frontier is the heap (including stale entries).
+
+    Returns:
+    list: Cheapest path from v_start to v_target, [] if v_target is not reachable.
+    """
+    graph = as_graph(G, weighted=True)
+    workspace = graph.workspace()
+    generation = workspace.begin()
+    start, target = graph.vertex(v_start), graph.vertex(v_target)
+    stamp, cost, parent = workspace.stamp, workspace.cost, workspace.parent
+    workspace.visit(start, start, 0.0)
+
+    queue = [(0.0, start)]
+    if stats is not None:
+        stats.heap_pushes += 1
+    while queue:
+        current_cost, v_current = heapq.heappop(queue)
+        if stats is not None:
+            stats.heap_pops += 1
+        if current_cost > cost[v_current]:
+            # Stale entry, the vertex was already expanded with a lower cost.
+            continue
+        if v_current == target:
+            return graph.to_labels(workspace.path(start, target))
+
+        begin, end = graph.indptr[v_current], graph.indptr[v_current + 1]
+        neighbors = graph.indices[begin:end]
+        new_cost = current_cost + graph.weights[begin:end]
+        better = (stamp[neighbors] != generation) | (new_cost < cost[neighbors])
+        if stats is not None:
+            _count_expansion(stats, neighbors.size, int(better.sum()), len(queue))
+        neighbors, new_cost = neighbors[better], new_cost[better]
+        stamp[neighbors] = generation
+        cost[neighbors] = new_cost
+        parent[neighbors] = v_current
+        for item in zip(new_cost.tolist(), neighbors.tolist()):
+            heapq.heappush(queue, item)
+    return []
+
+
+def _count_expansion(stats: SearchStats, generated: int, pushes: int, queue_size: int) -> None:
+    """
+    Count one expansion of a priority queue search that pushes `pushes` of `generated` successors.
+    """
+    stats.expansions += 1
+    stats.generated += generated
+    stats.heap_pushes += pushes
+    stats.frontier(queue_size + pushes)
+
+
+def _heuristic(graph: CSRGraph, h, workspace) -> callable:
+    """
+    Vectorized lookup vertices -> h(vertices) for one query.
+
+    A dict or array is converted to an array once. A callable h(label) is only
+    evaluated for vertices that are generated, and at most once per vertex and
+    query (memoized in the workspace), since heuristics like distances on a map
+    are often expensive.
+    """
+    if not callable(h):
+        return graph.heuristic(h).__getitem__
+
+    generation, h_stamp, h_value = workspace.generation, workspace.h_stamp, workspace.h_value
+
+    def lookup(vertices: np.ndarray) -> np.ndarray:
+        missing = vertices[h_stamp[vertices] != generation]
+        for v in missing.tolist():
+            h_value[v] = h(graph.labels[v])
+        h_stamp[missing] = generation
+        return h_value[vertices]
+
+    return lookup
+
+
+@instrumented
+def best_first_search(G, h, v_start: Any, v_target: Any, stats: SearchStats = None) -> list:
+    """
+    Greedy best first search, expands the vertex with the smallest heuristic first.
+
+    Parameters:
+    - G (CSRGraph | dict): The graph.
+    - h (dict | np.ndarray | callable): Heuristic per vertex, or h(label).
+    - v_start (Any): Start vertex.
+    - v_target (Any): Target vertex.
+    - stats (SearchStats): Counters to update, the frontier is the heap.
+
+    Returns:
+    list: Path from v_start to v_target (not necessarily the cheapest), [] if v_target is not reachable.
+    """
+    graph = as_graph(G)
+    workspace = graph.workspace()
+    generation = workspace.begin()
+    h = _heuristic(graph, h, workspace)
+    start, target = graph.vertex(v_start), graph.vertex(v_target)
+    workspace.visit(start, start)
+
+    # Queue: (heuristic, vertex)
+    queue = [(float(h(np.array([start]))[0]), start)]
+    if stats is not None:
+        stats.heap_pushes += 1
+    while queue:
+        _, v_current = heapq.heappop(queue)
+        if stats is not None:
+            stats.heap_pops += 1
+        if v_current == target:
+            break
+        neighbors = graph.neighbors(v_current)
+        new = workspace.stamp[neighbors] != generation
+        if stats is not None:
+            _count_expansion(stats, neighbors.size, int(new.sum()), len(queue))
+        neighbors = neighbors[new]
+        workspace.stamp[neighbors] = generation
+        workspace.parent[neighbors] = v_current
+        for item in zip(h(neighbors).tolist(), neighbors.tolist()):
+            heapq.heappush(queue, item)
+    return graph.to_labels(workspace.path(start, target))
+
+
+@instrumented
+def a_star(G, h, v_start: Any, v_target: Any, weight: float = 1.0, consistent: bool = True,
+           stats: SearchStats = None) -> list:
+    """
+    A* search, expands the vertex with the smallest f = g + weight * h first.
+
+    - Stale queue entries (a cheaper path to the vertex was found after they
+      were pushed) are skipped when popped (lazy deletion).
+    - With a consistent heuristic (h(u) <= w(u, v) + h(v)) the first expansion
+      of a vertex is already optimal, so expanded vertices are kept in a closed
+      set and never reopened. With consistent=False a cheaper path reopens a
+      vertex, which keeps the result optimal for heuristics that are only
+      admissible.
+    - Ties in f are broken toward larger g, i.e. toward vertices closer to the
+      target, which avoids expanding whole plateaus of equal f.
+    - A callable heuristic is evaluated at most once per vertex and query.
+    - weight > 1 gives weighted A*: fewer expansions, and the path costs at most
+      weight times the optimal cost.
+
+    Parameters:
+    - G (CSRGraph | dict): The weighted graph, a dict holds (neighbor, weight) lists or {neighbor: weight} dicts.
+    - h (dict | np.ndarray | callable): Admissible heuristic per vertex, or h(label).
+    - v_start (Any): Start vertex.
+    - v_target (Any): Target vertex.
+    - weight (float): Weight of the heuristic (epsilon of weighted A*), >= 1.
+    - consistent (bool): The heuristic is consistent, use a closed set.
+    - stats (SearchStats): Counters to update, the frontier is the heap (including stale entries).
+
+    Returns:
+    list: Cheapest path from v_start to v_target (up to the factor weight), [] if v_target is not reachable.
+    """
+    if weight < 1:
+        raise ValueError(f"weight must be >= 1, got {weight}")
+    graph = as_graph(G, weighted=True)
+    workspace = graph.workspace()
+    generation = workspace.begin()
+    h = _heuristic(graph, h, workspace)
+    start, target = graph.vertex(v_start), graph.vertex(v_target)
+    stamp, cost, parent, closed = workspace.stamp, workspace.cost, workspace.parent, workspace.closed
+    workspace.visit(start, start, 0.0)
+
+    # Queue: (f, -g, vertex)
+    queue = [(weight * float(h(np.array([start]))[0]), -0.0, start)]
+    if stats is not None:
+        stats.heap_pushes += 1
+    while queue:
+        _, g_current, v_current = heapq.heappop(queue)
+        if stats is not None:
+            stats.heap_pops += 1
+        g_current = -g_current
+        if g_current > cost[v_current] or closed[v_current] == generation:
+            continue
+        if v_current == target:
+            break
+        if consistent:
+            closed[v_current] = generation
+        begin, end = graph.indptr[v_current], graph.indptr[v_current + 1]
+        neighbors = graph.indices[begin:end]
+        # g is the real cost from v_start to the neighbors.
+        g = g_current + graph.weights[begin:end]
+        better = ((stamp[neighbors] != generation) | (g < cost[neighbors])) & (closed[neighbors] != generation)
+        if stats is not None:
+            _count_expansion(stats, neighbors.size, int(better.sum()), len(queue))
+        neighbors, g = neighbors[better], g[better]
+        stamp[neighbors] = generation
+        cost[neighbors] = g
+        parent[neighbors] = v_current
+        for item in zip((g + weight * h(neighbors)).tolist(), (-g).tolist(), neighbors.tolist()):
+            heapq.heappush(queue, item)
+    return graph.to_labels(workspace.path(start, target))
@@ -0,0 +1,67 @@
+"""
+Opt-in counters for the search algorithms.
+
+The functions in search_algorithms.py take stats=None. Without a SearchStats
+object nothing is counted or timed; with one, every call adds to its counters:
+
+- queries: number of searches
+- expansions: vertices whose out-edges were scanned
+- generated: edges scanned (successors generated)
+- peak_frontier: largest size of the queue, stack or BFS level
+- heap_pushes, heap_pops: priority queue operations
+- elapsed: wall time in seconds
+
+Example:
+    stats = SearchStats()
+    a_star(graph, h, 'S', 'G1', stats=stats)
+    print(stats.as_dict())
+"""
+import functools
+import time
+
+
+class SearchStats:
+    """
+    Counters of one or more searches.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.queries = 0
+        self.expansions = 0
+        self.generated = 0
+        self.peak_frontier = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.elapsed = 0.0
+
+    def frontier(self, size: int) -> None:
+        """Report the current frontier size."""
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        return "SearchStats(" + ", ".join(f"{key}={value!r}" for key, value in vars(self).items()) + ")"
+
+
+def instrumented(search):
+    """
+    Decorator for a search function with a stats keyword: counts the query and measures its wall time.
+    """
+    @functools.wraps(search)
+    def wrapper(*args, stats: SearchStats = None, **kwargs):
+        if stats is None:
+            return search(*args, **kwargs)
+        begin = time.perf_counter()
+        try:
+            return search(*args, stats=stats, **kwargs)
+        finally:
+            stats.queries += 1
+            stats.elapsed += time.perf_counter() - begin
+
+    return wrapper
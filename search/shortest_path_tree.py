@@ -0,0 +1,173 @@
+"""
+One-to-many Dijkstra and a cache of shortest-path trees.
+
+dijkstra(graph, source, targets) settles vertices in order of their distance
+from source until every target is settled (or everything reachable, if no
+targets are given) and returns the ShortestPathTree. The tree keeps its queue,
+so asking it for a target that is not settled yet resumes the search where it
+stopped instead of starting over.
+
+SPTCache keeps the trees of the most recently used sources (LRU). Repeated
+queries from a hot source are answered from its tree without searching again.
+
+Example:
+    cache = SPTCache(graph, capacity=8)
+    cache.paths('S', ['G1', 'G2', 'G3'])   # one search instead of three
+    cache.cost('S', 'G1')                  # answered from the cached tree
+"""
+import heapq
+from collections import OrderedDict
+from typing import Any, Iterable
+
+import numpy as np
+
+from search_algorithms import as_graph
+
+
+class ShortestPathTree:
+    """
+    Shortest-path tree of a source, grown lazily by Dijkstra's algorithm.
+    """
+
+    def __init__(self, graph, source: Any) -> None:
+        self.graph = graph
+        self.source = source
+        start = graph.vertex(source)
+        self.costs = np.full(len(graph), np.inf)
+        self.parents = np.full(len(graph), -1, dtype=np.int64)
+        self.settled = np.zeros(len(graph), dtype=bool)
+        self.costs[start] = 0.0
+        self.parents[start] = start
+        self._queue = [(0.0, start)]
+
+    @property
+    def complete(self) -> bool:
+        """True once every vertex reachable from the source is settled."""
+        return not self._queue
+
+    def settle(self, targets: Iterable = None) -> None:
+        """
+        Continue Dijkstra until all targets (labels) are settled, or all reachable vertices if targets is None.
+        """
+        graph, costs, parents, settled, queue = self.graph, self.costs, self.parents, self.settled, self._queue
+        if targets is None:
+            remaining = None
+        else:
+            remaining = {graph.vertex(target) for target in targets}
+            remaining = {v for v in remaining if not settled[v]}
+            if not remaining:
+                return
+
+        while queue:
+            current_cost, v_current = heapq.heappop(queue)
+            if settled[v_current]:
+                continue
+            settled[v_current] = True
+            begin, end = graph.indptr[v_current], graph.indptr[v_current + 1]
+            neighbors = graph.indices[begin:end]
+            new_cost = current_cost + graph.weights[begin:end]
+            better = new_cost < costs[neighbors]
+            neighbors, new_cost = neighbors[better], new_cost[better]
+            costs[neighbors] = new_cost
+            parents[neighbors] = v_current
+            for item in zip(new_cost.tolist(), neighbors.tolist()):
+                heapq.heappush(queue, item)
+            if remaining is not None:
+                remaining.discard(v_current)
+                if not remaining:
+                    return
+
+    def cost(self, target: Any) -> float:
+        """
+        Cost of the cheapest path from the source to target, inf if target is not reachable.
+        """
+        self.settle([target])
+        return float(self.costs[self.graph.vertex(target)])
+
+    def path(self, target: Any) -> list:
+        """
+        Cheapest path from the source to target as a list of labels, [] if target is not reachable.
+        """
+        self.settle([target])
+        v = self.graph.vertex(target)
+        if not self.settled[v]:
+            return []
+        path = [v]
+        while self.parents[path[-1]] != path[-1]:
+            path.append(int(self.parents[path[-1]]))
+        return self.graph.to_labels(reversed(path))
+
+
+def dijkstra(G, source: Any, targets: Iterable = None) -> ShortestPathTree:
+    """
+    One-to-many Dijkstra from source that stops once every target is settled.
+
+    Parameters:
+    - G (CSRGraph | dict): The weighted graph, a dict holds (neighbor, weight) lists or {neighbor: weight} dicts.
+    - source (Any): Source vertex.
+    - targets (Iterable): Target vertices, all vertices by default.
+
+    Returns:
+    ShortestPathTree: The (partial) shortest-path tree of source.
+    """
+    tree = ShortestPathTree(as_graph(G, weighted=True), source)
+    tree.settle(targets)
+    return tree
+
+
+class SPTCache:
+    """
+    LRU cache of shortest-path trees keyed by source.
+
+    Every cached tree holds three arrays of length V, so capacity bounds the
+    memory to about capacity * 17 * V bytes.
+    """
+
+    def __init__(self, G, capacity: int = 16) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        self.graph = as_graph(G, weighted=True)
+        self.capacity = capacity
+        self._trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def __contains__(self, source: Any) -> bool:
+        return source in self._trees
+
+    def tree(self, source: Any) -> ShortestPathTree:
+        """
+        The tree of source, from the cache or newly created (evicting the least recently used tree).
+        """
+        tree = self._trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source)
+            return tree
+        self.misses += 1
+        tree = ShortestPathTree(self.graph, source)
+        self._trees[source] = tree
+        if len(self._trees) > self.capacity:
+            self._trees.popitem(last=False)
+        return tree
+
+    def path(self, source: Any, target: Any) -> list:
+        return self.tree(source).path(target)
+
+    def cost(self, source: Any, target: Any) -> float:
+        return self.tree(source).cost(target)
+
+    def paths(self, source: Any, targets: Iterable) -> dict:
+        """
+        Cheapest paths from source to all targets with a single search, {target: path}.
+        """
+        targets = list(targets)
+        tree = self.tree(source)
+        tree.settle(targets)
+        return {target: tree.path(target) for target in targets}
+
+    def clear(self) -> None:
+        self._trees.clear()
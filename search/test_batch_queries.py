@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from batch_queries import SharedGraph, batch_queries
+from csr_graph import CSRGraph
+from search_algorithms import path_cost, uniform_cost_search
+from test_search_algorithms import WEIGHTED, H, random_graph
+
+
+def test_shared_graph():
+    graph = CSRGraph.from_adjacency(WEIGHTED, weighted=True)
+    with SharedGraph(graph) as shared:
+        assert set(shared.descriptor) == {"indptr", "indices", "weights"}
+
+
+def test_batch_matches_serial():
+    adjacency = random_graph(300, 1200, seed=7)
+    graph = CSRGraph.from_adjacency(adjacency, weighted=True)
+    queries = [tuple(q) for q in np.random.default_rng(0).integers(300, size=(50, 2)).tolist()]
+    results = list(batch_queries(graph, queries, "ucs", processes=2, chunk_size=8))
+    assert sorted(result.index for result in results) == list(range(50))
+    for result in results:
+        assert (result.start, result.target) == queries[result.index]
+        expected = uniform_cost_search(graph, result.start, result.target)
+        if expected:
+            assert result.cost == path_cost(graph, expected)
+            assert path_cost(graph, result.path) == result.cost
+        else:
+            assert result.path == [] and result.cost == np.inf
+        assert result.seconds >= 0
+
+
+def test_batch_with_labels_and_heuristic():
+    results = list(batch_queries(WEIGHTED, [('S', 'G1'), ('S', 'G1'), ('B', 'G1')], "astar", heuristic=H,
+                                 processes=1))
+    paths = {result.index: result.path for result in results}
+    assert paths == {0: ['S', 'A', 'G1'], 1: ['S', 'A', 'G1'], 2: ['B', 'A', 'G1']}
+    with pytest.raises(ValueError):
+        list(batch_queries(WEIGHTED, [('S', 'G1')], "astar"))
+    with pytest.raises(ValueError):
+        list(batch_queries(WEIGHTED, [('S', 'G1')], "dfs"))
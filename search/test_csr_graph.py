@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from csr_graph import CSRGraph
+from search_algorithms import breadth_first_search
+
+
+def test_from_adjacency():
+    graph = CSRGraph.from_adjacency({'A': ['B', 'C'], 'B': ['D'], 'C': ['D', 'X']})
+    assert graph.labels == ['A', 'B', 'C', 'D', 'X']
+    assert len(graph) == 5 and graph.num_edges == 5
+    assert graph.to_labels(graph.neighbors(graph.vertex('C'))) == ['D', 'X']
+    assert list(graph.edge_weights(0)) == [1.0, 1.0]
+    assert graph.indices.dtype == np.int32
+
+
+def test_tuple_labels_and_dict_of_dicts():
+    graph = CSRGraph.from_adjacency({(0, 0): [(0, 1)], (0, 1): [(1, 1)], (1, 1): []})
+    assert graph.labels == [(0, 0), (0, 1), (1, 1)]
+    assert list(graph.weights) == [1.0, 1.0]
+    assert breadth_first_search(graph, (0, 0), (1, 1)) == [(0, 0), (0, 1), (1, 1)]
+    graph = CSRGraph.from_adjacency({'S': {'A': 5, 'B': 9}, 'A': {'B': 3}, 'B': {}})
+    pairs = CSRGraph.from_adjacency({'S': [('A', 5), ('B', 9)], 'A': [('B', 3)], 'B': []}, weighted=True)
+    assert graph.labels == pairs.labels
+    assert list(graph.indices) == list(pairs.indices) and list(graph.weights) == list(pairs.weights) == [5.0, 9.0, 3.0]
+
+
+def test_weighted_and_parallel_edges():
+    graph = CSRGraph.from_edges([0, 1, 0, 0, 2], [1, 2, 3, 1, 0], [5.0, 1.0, 2.0, 4.0, 1.0])
+    assert list(graph.neighbors(0)) == [1, 3]
+    assert list(graph.edge_weights(0)) == [4.0, 2.0]
+    assert list(graph.indptr) == [0, 2, 3, 4, 4]
+
+
+def test_gather():
+    graph = CSRGraph.from_adjacency({0: [1, 2], 1: [3], 2: [], 3: [0, 1, 2]})
+    targets, owners, edges = graph.gather(np.array([3, 0]))
+    assert list(targets) == [0, 1, 2, 1, 2]
+    assert list(owners) == [0, 0, 0, 1, 1]
+    assert np.array_equal(graph.indices[edges], targets)
+
+
+def test_workspace_is_reused():
+    graph = CSRGraph.from_adjacency({'A': ['B'], 'B': []})
+    workspace = graph.workspace()
+    assert graph.workspace() is workspace
+    workspace.begin()
+    workspace.visit(0, 0)
+    workspace.visit(1, 0, 1.0)
+    assert workspace.path(0, 1) == [0, 1]
+    workspace.begin()
+    assert not workspace.visited(1)
+    assert workspace.path(0, 1) == []
+
+
+def test_reverse():
+    graph = CSRGraph.from_adjacency({'A': [('B', 2.0), ('C', 3.0)], 'B': [('C', 1.0)], 'C': []}, weighted=True)
+    reverse = graph.reverse()
+    assert reverse.to_labels(reverse.neighbors(graph.vertex('C'))) == ['A', 'B']
+    assert list(reverse.edge_weights(graph.vertex('C'))) == [3.0, 1.0]
+    assert reverse.reverse() is graph
+    assert reverse.workspace() is not graph.workspace()
+
+
+def test_heuristic():
+    graph = CSRGraph.from_adjacency({'A': ['B'], 'B': []})
+    assert list(graph.heuristic({'B': 0, 'A': 3})) == [3.0, 0.0]
+    with pytest.raises(KeyError):
+        graph.heuristic({'A': 3})
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from csr_graph import CSRGraph
+from graph_file import LabelIndex, LabelTable, import_csv, open_graph, save_graph
+from search_algorithms import a_star, breadth_first_search, uniform_cost_search
+from test_search_algorithms import H, WEIGHTED, random_graph
+
+
+def test_save_and_open(tmp_path):
+    graph = CSRGraph.from_adjacency(WEIGHTED, weighted=True)
+    save_graph(graph, tmp_path / "weighted.graph")
+    opened = open_graph(tmp_path / "weighted.graph")
+    assert isinstance(opened.indices.base, np.memmap) and not opened.indices.flags.writeable
+    assert np.array_equal(opened.indptr, graph.indptr)
+    assert np.array_equal(opened.indices, graph.indices)
+    assert np.array_equal(opened.weights, graph.weights)
+    assert isinstance(opened.labels, LabelTable) and isinstance(opened.index, LabelIndex)
+    assert list(opened.labels) == graph.labels
+    assert opened.vertex('G2') == graph.vertex('G2')
+    with pytest.raises(KeyError):
+        opened.vertex('X')
+    with pytest.raises(KeyError):
+        opened.vertex(0)
+    assert 'G2' in opened.index and 0 not in opened.index and None not in opened.index
+    assert a_star(opened, H, 'S', 'G3') == ['S', 'D', 'E', 'G3']
+
+
+def test_integer_labels(tmp_path):
+    graph = CSRGraph.from_edges([0, 1, 2], [1, 2, 3])
+    save_graph(graph, tmp_path / "chain.graph")
+    opened = open_graph(tmp_path / "chain.graph")
+    assert opened.labels == range(4)
+    assert breadth_first_search(opened, 0, 3) == [0, 1, 2, 3]
+
+
+def test_labels_come_back_as_strings(tmp_path):
+    graph = CSRGraph.from_adjacency({1: [2], 2: [3], 3: [], ('A', 1): [1]})
+    save_graph(graph, tmp_path / "labels.graph")
+    opened = open_graph(tmp_path / "labels.graph")
+    assert list(opened.labels) == ['1', '2', '3', "('A', 1)"]
+    assert breadth_first_search(opened, "('A', 1)", '3') == ["('A', 1)", '1', '2', '3']
+    with pytest.raises(KeyError):
+        opened.vertex(1)
+    with pytest.raises(ValueError):
+        save_graph(CSRGraph.from_adjacency({1: ['1']}), tmp_path / "same.graph")
+
+
+def test_not_a_graph_file(tmp_path):
+    (tmp_path / "file").write_bytes(bytes(200))
+    with pytest.raises(ValueError):
+        open_graph(tmp_path / "file")
+
+
+def test_import_csv(tmp_path):
+    adjacency = random_graph(200, 1000, seed=11)
+    rows = [(u, v, w) for u, edges in adjacency.items() for v, w in edges]
+    csv_path = tmp_path / "edges.csv"
+    csv_path.write_text("source,target,weight\n" + "".join(f"v{u},v{v},{w}\n" for u, v, w in rows))
+    import_csv(csv_path, tmp_path / "edges.graph", header=True, chunk_size=37)
+    opened = open_graph(tmp_path / "edges.graph")
+
+    expected = CSRGraph.from_edges([u for u, _, _ in rows], [v for _, v, _ in rows], [w for _, _, w in rows])
+    assert opened.num_edges == expected.num_edges
+    for u in range(0, 200, 3):
+        if f"v{u}" not in opened.index:
+            continue
+        vertex = opened.vertex(f"v{u}")
+        assert opened.to_labels(opened.neighbors(vertex)) == [f"v{v}" for v in expected.neighbors(u)]
+        assert list(opened.edge_weights(vertex)) == list(expected.edge_weights(u))
+    for target in range(0, 200, 17):
+        if f"v{target}" in opened.index and "v0" in opened.index:
+            path = uniform_cost_search(expected, 0, target)
+            assert uniform_cost_search(opened, "v0", f"v{target}") == [f"v{v}" for v in path]
+
+
+def test_import_undirected_csv(tmp_path):
+    csv_path = tmp_path / "roads.csv"
+    csv_path.write_text("A;B;2\nB;C;3\nA;B;1\n")
+    import_csv(csv_path, tmp_path / "roads.graph", directed=False, delimiter=";", chunk_size=2)
+    graph = open_graph(tmp_path / "roads.graph")
+    assert graph.num_edges == 4
+    assert uniform_cost_search(graph, 'C', 'A') == ['C', 'B', 'A']
+    assert list(graph.edge_weights(graph.vertex('B'))) == [1.0, 3.0]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from implicit_search import (SlidingPuzzle, a_star, breadth_first_search, ida_star, iterative_deepening_search,
+                             uniform_cost_search)
+from test_search_algorithms import WEIGHTED
+
+
+def successors(state):
+    return WEIGHTED[state]
+
+
+def scramble(puzzle: SlidingPuzzle, moves: int, seed: int) -> int:
+    rng = np.random.default_rng(seed)
+    state = puzzle.goal
+    for _ in range(moves):
+        options = puzzle.successors(state)
+        state = options[rng.integers(len(options))][0]
+    return state
+
+
+def test_sliding_puzzle():
+    puzzle = SlidingPuzzle(3)
+    tiles = [1, 2, 3, 4, 5, 6, 0, 7, 8]
+    assert puzzle.decode(puzzle.encode(tiles)) == tiles
+    assert puzzle.manhattan(puzzle.goal) == 0
+    assert puzzle.manhattan(puzzle.encode(tiles)) == 2
+    assert sorted(puzzle.decode(s) for s, _ in puzzle.successors(puzzle.encode(tiles))) == \
+        [[1, 2, 3, 0, 5, 6, 4, 7, 8], [1, 2, 3, 4, 5, 6, 7, 0, 8]]
+
+
+def test_all_searches_find_optimal_puzzle_solutions():
+    puzzle = SlidingPuzzle(3)
+    for seed in range(5):
+        start = scramble(puzzle, 30, seed)
+        optimal = len(breadth_first_search(start, puzzle.goal, puzzle.successors))
+        for path in (uniform_cost_search(start, puzzle.goal, puzzle.successors),
+                     a_star(start, puzzle.goal, puzzle.successors, puzzle.manhattan),
+                     ida_star(start, puzzle.goal, puzzle.successors, puzzle.manhattan)):
+            assert len(path) == optimal
+            assert path[0] == start and path[-1] == puzzle.goal
+            assert all(b in [s for s, _ in puzzle.successors(a)] for a, b in zip(path, path[1:]))
+        weighted = a_star(start, puzzle.goal, puzzle.successors, puzzle.manhattan, weight=2.0)
+        assert optimal <= len(weighted) <= 2 * optimal
+
+
+def test_iterative_deepening_search():
+    puzzle = SlidingPuzzle(3)
+    start = scramble(puzzle, 8, 0)
+    path = iterative_deepening_search(start, puzzle.goal, puzzle.successors)
+    assert len(path) == len(breadth_first_search(start, puzzle.goal, puzzle.successors))
+    assert iterative_deepening_search(start, puzzle.goal, puzzle.successors, max_depth=len(path) - 2) == []
+
+
+def test_weighted_graph_as_successor_function():
+    assert uniform_cost_search('S', 'G1', successors) == ['S', 'A', 'G1']
+    assert ida_star('S', 'G3', successors, lambda state: 0) == ['S', 'D', 'E', 'G3']
+    assert breadth_first_search('S', lambda state: state.startswith('G'), successors) == ['S', 'A', 'G1']
+    assert iterative_deepening_search('S', 'G2', successors) == ['S', 'C', 'G2']
+
+
+def test_unreachable_goal():
+    for search in (breadth_first_search, uniform_cost_search, iterative_deepening_search):
+        assert search('G1', 'S', successors) == []
+    assert a_star('E', 'S', successors, lambda state: 0) == []
+    assert ida_star('E', 'S', successors, lambda state: 0) == []
+    with pytest.raises(ValueError):
+        a_star('S', 'G1', successors, lambda state: 0, weight=0.5)
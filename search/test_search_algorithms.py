@@ -0,0 +1,165 @@
+import heapq
+
+import numpy as np
+import pytest
+from csr_graph import CSRGraph
+from search_algorithms import (a_star, best_first_search, bidirectional_search, breadth_first_search,
+                               depth_first_search, path_cost, uniform_cost_search)
+
+ADJ_LIST = {'A': ['B', 'C'], 'B': ['D', 'E'], 'C': ['F', 'G'], 'D': [], 'E': [], 'F': [], 'G': []}
+WEIGHTED = {'S': [('A', 5), ('B', 9), ('C', 6), ('D', 6)],
+            'A': [('B', 3), ('G1', 9)],
+            'B': [('A', 2), ('C', 1)],
+            'C': [('S', 6), ('G2', 5), ('F', 7)],
+            'D': [('S', 1), ('C', 2), ('E', 2)],
+            'E': [('G3', 7)],
+            'F': [('D', 2), ('G3', 8)],
+            'G1': [],
+            'G2': [],
+            'G3': []}
+H = {'S': 5, 'A': 7, 'B': 3, 'C': 4, 'D': 6, 'E': 5, 'F': 6, 'G1': 0, 'G2': 0, 'G3': 0}
+
+
+def dijkstra(adjacency: dict, start) -> dict:
+    costs = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        cost, v = heapq.heappop(queue)
+        if cost > costs[v]:
+            continue
+        for w, weight in adjacency[v]:
+            if cost + weight < costs.get(w, float("inf")):
+                costs[w] = cost + weight
+                heapq.heappush(queue, (cost + weight, w))
+    return costs
+
+
+def random_graph(n: int, m: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    adjacency = {v: [] for v in range(n)}
+    for u, v, weight in zip(rng.integers(n, size=m), rng.integers(n, size=m), rng.integers(1, 10, size=m)):
+        adjacency[int(u)].append((int(v), int(weight)))
+    return adjacency
+
+
+def test_breadth_first_search(capsys):
+    graph = CSRGraph.from_adjacency(ADJ_LIST)
+    assert breadth_first_search(graph, 'A', 'G') == ['A', 'C', 'G']
+    assert breadth_first_search(ADJ_LIST, 'A', 'A') == ['A']
+    breadth_first_search(graph, 'A', 'G', traversal_order=True)
+    assert capsys.readouterr().out.strip() == str(['A', 'B', 'C', 'D', 'E', 'F'])
+
+
+def test_bidirectional_search():
+    graph = CSRGraph.from_adjacency(ADJ_LIST)
+    assert bidirectional_search(graph, 'A', 'G') == ['A', 'C', 'G']
+    assert breadth_first_search(graph, 'A', 'E', bidirectional=True) == ['A', 'B', 'E']
+    assert bidirectional_search(graph, 'C', 'C') == ['C']
+    assert bidirectional_search(graph, 'G', 'A') == []
+
+
+def test_bidirectional_search_finds_shortest_paths():
+    adjacency = {v: [w for w, _ in edges] for v, edges in random_graph(500, 1500, seed=3).items()}
+    graph = CSRGraph.from_adjacency(adjacency)
+    for start, target in np.random.default_rng(1).integers(500, size=(100, 2)).tolist():
+        expected = breadth_first_search(graph, start, target)
+        path = bidirectional_search(graph, start, target)
+        assert len(path) == len(expected)
+        if path:
+            assert path[0] == start and path[-1] == target
+            assert all(w in adjacency[v] for v, w in zip(path, path[1:]))
+
+
+def test_depth_first_search(capsys):
+    graph = CSRGraph.from_adjacency(ADJ_LIST)
+    assert depth_first_search(graph, 'A', 'G') == ['A', 'C', 'G']
+    depth_first_search(graph, 'A', 'G', traversal_order=True)
+    assert capsys.readouterr().out.strip() == str(['A', 'B', 'D', 'E', 'C', 'F'])
+
+
+def test_unreachable_target():
+    graph = CSRGraph.from_adjacency(ADJ_LIST)
+    for search in (breadth_first_search, bidirectional_search, depth_first_search, uniform_cost_search):
+        assert search(graph, 'B', 'G') == []
+    assert a_star(graph, np.zeros(len(graph)), 'B', 'G') == []
+    assert best_first_search(graph, np.zeros(len(graph)), 'B', 'G') == []
+
+
+def test_uniform_cost_search_and_a_star():
+    graph = CSRGraph.from_adjacency(WEIGHTED, weighted=True)
+    assert uniform_cost_search(graph, 'S', 'G1') == ['S', 'A', 'G1']
+    assert a_star(graph, H, 'S', 'G1') == ['S', 'A', 'G1']
+    assert a_star(graph, H, 'S', 'G2') == ['S', 'C', 'G2']
+    assert a_star(graph, H, 'S', 'G3') == ['S', 'D', 'E', 'G3']
+    assert path_cost(graph, ['S', 'A', 'G1']) == 14
+
+
+def test_best_first_search():
+    G = {'S': ['A', 'B', 'C'], 'A': [], 'B': ['D', 'H'], 'C': [], 'D': [], 'H': ['F', 'G'], 'F': [], 'G': ['E'],
+         'E': []}
+    h = {'S': 10, 'A': 9, 'B': 1, 'C': 8, 'D': 8, 'H': 6, 'F': 6, 'G': 3, 'E': 0}
+    assert best_first_search(G, h, 'S', 'E') == ['S', 'B', 'H', 'G', 'E']
+
+
+def test_random_graph_matches_dijkstra():
+    adjacency = random_graph(300, 1200)
+    graph = CSRGraph.from_adjacency(adjacency, weighted=True)
+    costs = dijkstra(adjacency, 0)
+    for target in range(0, 300, 7):
+        ucs = uniform_cost_search(graph, 0, target)
+        astar = a_star(graph, np.zeros(len(graph)), 0, target)
+        if target in costs:
+            assert path_cost(graph, ucs) == costs[target]
+            assert path_cost(graph, astar) == costs[target]
+            assert len(breadth_first_search(graph, 0, target)) <= len(ucs)
+        else:
+            assert ucs == astar == breadth_first_search(graph, 0, target) == []
+
+
+def grid_graph(n: int, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    steps = ((0, 1), (1, 0), (0, -1), (-1, 0))
+    adjacency = {}
+    for i in range(n):
+        for j in range(n):
+            adjacency[(i, j)] = [((i + di, j + dj), int(rng.integers(1, 5))) for di, dj in steps
+                                 if 0 <= i + di < n and 0 <= j + dj < n]
+    return adjacency, CSRGraph.from_adjacency(adjacency, weighted=True)
+
+
+def test_a_star_with_callable_heuristic_is_memoized():
+    adjacency, graph = grid_graph(30)
+    target = (29, 25)
+    calls = []
+
+    def manhattan(v):
+        calls.append(v)
+        return abs(v[0] - target[0]) + abs(v[1] - target[1])
+
+    path = a_star(graph, manhattan, (0, 0), target)
+    assert path_cost(graph, path) == dijkstra(adjacency, (0, 0))[target]
+    assert len(calls) == len(set(calls))
+    # The memo is per query.
+    calls.clear()
+    a_star(graph, manhattan, (0, 0), target)
+    assert len(calls) == len(set(calls)) > 0
+
+
+def test_a_star_reopens_vertices_for_inconsistent_heuristics():
+    G = {'S': [('A', 1), ('B', 1)], 'A': [('C', 1)], 'B': [('C', 3)], 'C': [('T', 10)], 'T': []}
+    h = {'S': 0, 'A': 11, 'B': 0, 'C': 0, 'T': 0}
+    graph = CSRGraph.from_adjacency(G, weighted=True)
+    assert a_star(graph, h, 'S', 'T') == ['S', 'B', 'C', 'T']
+    assert a_star(graph, h, 'S', 'T', consistent=False) == ['S', 'A', 'C', 'T']
+
+
+def test_weighted_a_star():
+    adjacency, graph = grid_graph(40, seed=2)
+    target = (39, 39)
+    h = {v: abs(v[0] - target[0]) + abs(v[1] - target[1]) for v in adjacency}
+    optimal = dijkstra(adjacency, (0, 0))[target]
+    for weight in (1.0, 1.5, 3.0):
+        path = a_star(graph, h, (0, 0), target, weight=weight)
+        assert optimal <= path_cost(graph, path) <= weight * optimal
+    with pytest.raises(ValueError):
+        a_star(graph, h, (0, 0), target, weight=0.5)
@@ -0,0 +1,71 @@
+import numpy as np
+from benchmark import FAMILIES, run_benchmarks, scaling
+from csr_graph import CSRGraph
+from search_algorithms import (a_star, best_first_search, bidirectional_search, breadth_first_search,
+                               depth_first_search, uniform_cost_search)
+from search_stats import SearchStats
+from test_search_algorithms import ADJ_LIST, H, WEIGHTED, grid_graph
+
+
+def test_breadth_first_search_stats():
+    stats = SearchStats()
+    path = breadth_first_search(CSRGraph.from_adjacency(ADJ_LIST), 'A', 'G', stats=stats)
+    assert path == ['A', 'C', 'G']
+    # Levels [A] and [B, C] are expanded, G is found in the level [D, E, F, G].
+    assert (stats.queries, stats.expansions, stats.generated, stats.peak_frontier) == (1, 3, 6, 2)
+    assert stats.heap_pushes == stats.heap_pops == 0
+    assert stats.elapsed > 0
+
+
+def test_stats_accumulate_and_reset():
+    graph = CSRGraph.from_adjacency(WEIGHTED, weighted=True)
+    stats = SearchStats()
+    assert uniform_cost_search(graph, 'S', 'G2', stats=stats) == uniform_cost_search(graph, 'S', 'G2')
+    first = stats.as_dict()
+    uniform_cost_search(graph, 'S', 'G2', stats=stats)
+    assert stats.queries == 2
+    assert stats.expansions == 2 * first["expansions"]
+    assert stats.heap_pops <= stats.heap_pushes
+    stats.reset()
+    assert stats.as_dict() == SearchStats().as_dict()
+
+
+def test_stats_of_all_searches():
+    graph = CSRGraph.from_adjacency(WEIGHTED, weighted=True)
+    for search in (lambda stats: depth_first_search(graph, 'S', 'G3', stats=stats),
+                   lambda stats: bidirectional_search(graph, 'S', 'G3', stats=stats),
+                   lambda stats: best_first_search(graph, H, 'S', 'G3', stats=stats),
+                   lambda stats: a_star(graph, H, 'S', 'G3', stats=stats)):
+        stats = SearchStats()
+        assert search(stats) == search(None)
+        assert stats.queries == 1
+        assert 0 < stats.expansions <= stats.generated
+        assert stats.peak_frontier > 0
+
+
+def test_a_star_expands_less_than_uniform_cost_search():
+    _, graph = grid_graph(30)
+    target = (29, 25)
+    h = {v: abs(v[0] - target[0]) + abs(v[1] - target[1]) for v in graph.labels}
+    ucs, astar = SearchStats(), SearchStats()
+    uniform_cost_search(graph, (0, 0), target, stats=ucs)
+    a_star(graph, h, (0, 0), target, stats=astar)
+    assert astar.expansions < ucs.expansions
+
+
+def test_benchmark_graphs_are_symmetric():
+    for family, make_graph in FAMILIES.items():
+        graph, coordinates = make_graph(200)
+        assert coordinates.shape == (len(graph), 2)
+        sources = np.repeat(np.arange(len(graph)), np.diff(graph.indptr))
+        forward = set(zip(sources.tolist(), graph.indices.tolist()))
+        assert forward == {(v, u) for u, v in forward}, family
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(sizes=(100, 400), queries=3)
+    assert len(results) == 3 * 2 * 5
+    assert all(result["expansions"] > 0 and result["time"] > 0 for result in results)
+    slopes = scaling(results)
+    assert len(slopes) == 3 * 5
+    assert all(np.isfinite(slope["time_slope"]) for slope in slopes)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from csr_graph import CSRGraph
+from search_algorithms import path_cost
+from shortest_path_tree import SPTCache, dijkstra
+from test_search_algorithms import WEIGHTED, dijkstra as reference_dijkstra, random_graph
+
+
+def test_one_to_many_stops_when_targets_are_settled():
+    graph = CSRGraph.from_adjacency(WEIGHTED, weighted=True)
+    tree = dijkstra(graph, 'S', ['A', 'D'])
+    assert tree.settled[graph.vertex('A')] and tree.settled[graph.vertex('D')]
+    assert not tree.settled[graph.vertex('G3')]
+    assert not tree.complete
+    # Resumes the search for a target that is not settled yet.
+    assert tree.path('G3') == ['S', 'D', 'E', 'G3']
+    assert tree.cost('G1') == 14
+    assert tree.path('S') == ['S']
+
+
+def test_full_tree_matches_reference():
+    adjacency = random_graph(400, 1600, seed=5)
+    graph = CSRGraph.from_adjacency(adjacency, weighted=True)
+    tree = dijkstra(graph, 0)
+    assert tree.complete
+    expected = reference_dijkstra(adjacency, 0)
+    for v in range(400):
+        if v in expected:
+            assert tree.cost(v) == expected[v]
+            assert path_cost(graph, tree.path(v)) == expected[v]
+        else:
+            assert tree.cost(v) == np.inf
+            assert tree.path(v) == []
+
+
+def test_cache():
+    cache = SPTCache(WEIGHTED, capacity=2)
+    paths = cache.paths('S', ['G1', 'G2', 'G3'])
+    assert paths == {'G1': ['S', 'A', 'G1'], 'G2': ['S', 'C', 'G2'], 'G3': ['S', 'D', 'E', 'G3']}
+    assert cache.cost('S', 'G3') == 15
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.path('A', 'C')
+    cache.path('S', 'C')
+    cache.path('B', 'C')
+    assert 'S' in cache and 'B' in cache and 'A' not in cache
+    assert len(cache) == 2
+    with pytest.raises(ValueError):
+        SPTCache(WEIGHTED, capacity=0)